@@ -1,16 +1,17 @@
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.appsettings import settings
 from app import models, crud
 from app.schema import schemas
-from app.models.database import SessionLocal
+from app.models.database import SessionLocal, ReadSessionLocal
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -18,11 +19,34 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # OAuth2 scheme for obtaining the token
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Cookie marking a client that wrote recently and must read its own writes
+PRIMARY_STICKY_COOKIE = "db_primary_until"
+READ_ONLY_METHODS = ("GET", "HEAD", "OPTIONS")
+
 # Dependency to get the asynchronous database session
-async def get_db() -> AsyncSession:
+async def get_db(request: Request, response: Response) -> AsyncSession:
+    if request.method not in READ_ONLY_METHODS and settings.db_replica_sticky_seconds > 0:
+        sticky_until = time.time() + settings.db_replica_sticky_seconds
+        response.set_cookie(
+            PRIMARY_STICKY_COOKIE, str(sticky_until),
+            max_age=settings.db_replica_sticky_seconds, httponly=True,
+        )
     async with SessionLocal() as session:
         yield session
 
+def _reads_from_primary(request: Request) -> bool:
+    """Whether the client wrote recently enough that the replica may still lag behind."""
+    try:
+        return float(request.cookies.get(PRIMARY_STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+# Dependency for read-only endpoints; routed to the replica unless the client just wrote
+async def get_read_db(request: Request) -> AsyncSession:
+    session_factory = SessionLocal if _reads_from_primary(request) else ReadSessionLocal
+    async with session_factory() as session:
+        yield session
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain text password against a hashed password."""
     return pwd_context.verify(plain_password, hashed_password)
@@ -73,6 +97,13 @@ async def get_current_user(db: AsyncSession = Depends(get_db), token: str = Depe
 
 async def get_current_active_user(current_user: models.User = Depends(get_current_user)) -> models.User:
     """Ensure the user is active."""
-    if current_user.status != schemas.UserStatus.Active:
+    # The model and schema enums are distinct classes, so compare their values
+    if current_user.status is None or current_user.status.value != schemas.UserStatus.Active.value:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+async def get_current_admin_user(current_user: models.User = Depends(get_current_active_user)) -> models.User:
+    """Restrict an endpoint to administrators."""
+    if current_user.role is None or current_user.role.value != schemas.UserRole.Admin.value:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required")
+    return current_user
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -6,6 +7,7 @@ load_dotenv()
 
 class AppSettings(BaseSettings):
     database_url: str
+    database_replica_url: Optional[str] = None
     secret_key: str
     algorithm: str
     access_token_expire_minutes: int
@@ -18,5 +20,29 @@ class AppSettings(BaseSettings):
     twilio_auth_token: str
     whatsapp_number: str
 
+    # Connection pool tuning (per worker process)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30.0  # Seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # Seconds before a connection is replaced
+    db_pool_pre_ping: bool = True
+
+    # How long a client keeps reading from the primary after it writes
+    db_replica_sticky_seconds: int = 5
+
+    # SQL logging: log every statement, a random sample, or only slow ones
+    db_echo: bool = False
+    db_echo_sample_rate: float = 0.0
+    db_slow_query_ms: float = 500.0
+
+    # Outbound WhatsApp queue: "twilio" sends for real, "fake" only simulates delivery
+    whatsapp_transport: str = "twilio"
+    outbound_workers: int = 4  # 0 disables the in-process dispatcher
+    outbound_rate_per_sender: float = 1.0  # Messages per second per sender
+    outbound_burst_per_sender: int = 5
+    outbound_max_attempts: int = 5
+    outbound_backoff_seconds: float = 2.0  # Doubles on each failed attempt
+    outbound_poll_seconds: float = 1.0
+
 # Initialize AppSettings
 settings = AppSettings()
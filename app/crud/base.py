@@ -0,0 +1,132 @@
+from typing import Any, Dict, Generic, List, Sequence, Type, TypeVar
+
+from sqlalchemy import bindparam, insert, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from fastapi import HTTPException
+
+from app.models.database import Base
+
+ModelType = TypeVar("ModelType", bound=Base)
+
+
+class CRUDRepository(Generic[ModelType]):
+    """Async data access for a model with a single-column primary key.
+
+    Writes use INSERT/UPDATE/DELETE ... RETURNING so each operation is one
+    statement plus the commit, instead of select-then-modify-then-refresh.
+    """
+
+    def __init__(self, model: Type[ModelType], not_found_detail: str):
+        self.model = model
+        mapper = model.__mapper__
+        self.pk_name = mapper.get_property_by_column(mapper.primary_key[0]).key
+        self.pk = getattr(model, self.pk_name)
+        self.not_found_detail = not_found_detail
+
+    def _not_found(self) -> HTTPException:
+        return HTTPException(status_code=404, detail=self.not_found_detail)
+
+    async def get(self, db: AsyncSession, obj_id: Any) -> ModelType:
+        obj = await db.get(self.model, obj_id)
+        if obj is None:
+            raise self._not_found()
+        return obj
+
+    async def get_many(self, db: AsyncSession, ids: Sequence[Any]) -> List[ModelType]:
+        """Fetch several rows in one query, in the order of ``ids``; missing ids are skipped."""
+        if not ids:
+            return []
+        result = await db.execute(select(self.model).where(self.pk.in_(set(ids))))
+        by_id = {getattr(obj, self.pk_name): obj for obj in result.scalars().all()}
+        return [by_id[obj_id] for obj_id in ids if obj_id in by_id]
+
+    async def create(self, db: AsyncSession, obj_in: Dict[str, Any], commit: bool = True) -> ModelType:
+        result = await db.scalars(insert(self.model).returning(self.model), [obj_in])
+        obj = result.one()
+        if commit:
+            await db.commit()
+        return obj
+
+    async def bulk_create(self, db: AsyncSession, objs_in: Sequence[Dict[str, Any]], commit: bool = True) -> List[ModelType]:
+        """Insert many rows with multi-row INSERT ... RETURNING, preserving input order."""
+        if not objs_in:
+            return []
+        result = await db.scalars(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True), list(objs_in)
+        )
+        objs = result.all()
+        if commit:
+            await db.commit()
+        return objs
+
+    async def bulk_insert(self, db: AsyncSession, objs_in: Sequence[Dict[str, Any]], commit: bool = True) -> int:
+        """Insert many rows as batched multi-row INSERTs without loading them back."""
+        if not objs_in:
+            return 0
+        await db.execute(insert(self.model), list(objs_in))
+        if commit:
+            await db.commit()
+        return len(objs_in)
+
+    async def update(self, db: AsyncSession, obj_id: Any, obj_in: Dict[str, Any], commit: bool = True) -> ModelType:
+        if not obj_in:
+            return await self.get(db, obj_id)
+        stmt = (
+            update(self.model)
+            .where(self.pk == obj_id)
+            .values(**obj_in)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        obj = (await db.scalars(stmt)).first()
+        if obj is None:
+            raise self._not_found()
+        if commit:
+            await db.commit()
+        return obj
+
+    async def bulk_update(self, db: AsyncSession, objs_in: Sequence[Dict[str, Any]], commit: bool = True) -> int:
+        """Apply per-row changes; every dict must carry the primary key and the same fields.
+
+        Runs as one executemany UPDATE ... WHERE pk = ? statement and returns the
+        number of rows matched, skipping ids with no row. Drivers that cannot
+        count an executemany (asyncpg) report the number of dicts instead.
+        """
+        if not objs_in:
+            return 0
+        columns = self.model.__mapper__.columns
+        statement = update(self.model.__table__).where(columns[self.pk_name] == bindparam("_pk"))
+        rows = [
+            {"_pk": obj[self.pk_name], **{columns[key].key: value for key, value in obj.items() if key != self.pk_name}}
+            for obj in objs_in
+        ]
+        result = await db.execute(statement, rows)
+        if commit:
+            await db.commit()
+        if not db.get_bind().dialect.supports_sane_multi_rowcount:
+            return len(objs_in)
+        return result.rowcount
+
+    async def update_many(self, db: AsyncSession, ids: Sequence[Any], values: Dict[str, Any], commit: bool = True) -> int:
+        """Set the same values on all given rows with a single UPDATE; returns the row count."""
+        if not ids or not values:
+            return 0
+        result = await db.execute(
+            update(self.model)
+            .where(self.pk.in_(set(ids)))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if commit:
+            await db.commit()
+        return result.rowcount
+
+    async def delete(self, db: AsyncSession, obj_id: Any, commit: bool = True) -> ModelType:
+        stmt = delete(self.model).where(self.pk == obj_id).returning(self.model)
+        obj = (await db.scalars(stmt)).first()
+        if obj is None:
+            raise self._not_found()
+        if commit:
+            await db.commit()
+        return obj
@@ -0,0 +1,57 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.crud.base import CRUDRepository
+
+
+async def validate_and_insert(
+    db: AsyncSession,
+    repository: CRUDRepository,
+    schema: Type[BaseModel],
+    rows: Sequence[Tuple[int, Any]],
+    references: Optional[Dict[str, Any]] = None,
+    on_inserted: Optional[Callable[[AsyncSession, List[Any]], Awaitable[None]]] = None,
+) -> dict:
+    """Validate ``(index, raw)`` rows against ``schema`` and bulk insert the valid ones.
+
+    ``references`` maps a field name to the column it must point at (e.g.
+    ``{"cattle_id": Cattle.cattle_id}``); each is checked with one IN query so a
+    single dangling id is reported per row instead of aborting the insert.
+    ``on_inserted`` receives the new rows before the commit, for derived data.
+    """
+    valid: List[Tuple[int, BaseModel]] = []
+    errors = []
+    for index, raw in rows:
+        try:
+            valid.append((index, schema.model_validate(raw)))
+        except ValidationError as e:
+            errors.append({"index": index, "detail": e.errors(include_url=False, include_context=False)})
+
+    for field, column in (references or {}).items():
+        wanted = {getattr(item, field) for _, item in valid} - {None}
+        known = set()
+        if wanted:
+            result = await db.execute(select(column).where(column.in_(wanted)))
+            known = set(result.scalars().all())
+        still_valid = []
+        for index, item in valid:
+            value = getattr(item, field)
+            if value is not None and value not in known:
+                errors.append({"index": index, "detail": f"{field} {value} not found"})
+            else:
+                still_valid.append((index, item))
+        valid = still_valid
+
+    objs_in = [item.model_dump() for _, item in valid]
+    if on_inserted is None:
+        inserted = await repository.bulk_insert(db, objs_in)
+    else:
+        created = await repository.bulk_create(db, objs_in, commit=False)
+        await on_inserted(db, created)
+        await db.commit()
+        inserted = len(created)
+    errors.sort(key=lambda error: error["index"])
+    return {"received": len(rows), "inserted": inserted, "errors": errors}
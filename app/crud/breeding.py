@@ -0,0 +1,122 @@
+from datetime import date, timedelta
+from typing import Iterable, List, Optional
+
+from sqlalchemy import delete, func, or_, union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from fastapi import HTTPException
+
+from app.models import BreedingSchedule, Calving, Cattle, Insemination
+from app.utills.dialect import upsert_insert
+
+HEAT_CYCLE_DAYS = 21
+POSTPARTUM_HEAT_DAYS = 42
+PREGNANCY_CHECK_DAYS = 35
+GESTATION_DAYS = 283
+
+REFRESH_BATCH_SIZE = 1000
+
+SCHEDULE_EVENTS = {
+    "heat": BreedingSchedule.next_heat_date,
+    "pregnancy_check": BreedingSchedule.pregnancy_check_date,
+    "calving": BreedingSchedule.expected_calving_date,
+}
+
+
+def compute_schedule(last_insemination: Optional[date], last_calving: Optional[date]) -> dict:
+    """Next heat, pregnancy check and expected calving from a cow's latest events.
+
+    An insemination after the last calving is treated as a pending pregnancy:
+    check at +35 days, calving at +283, and a return to heat at +21 if it did
+    not hold. Otherwise the first heat is expected 42 days after calving.
+    """
+    schedule = {
+        "last_insemination_date": last_insemination,
+        "last_calving_date": last_calving,
+        "next_heat_date": None,
+        "pregnancy_check_date": None,
+        "expected_calving_date": None,
+    }
+    if last_insemination is not None and (last_calving is None or last_insemination > last_calving):
+        schedule["next_heat_date"] = last_insemination + timedelta(days=HEAT_CYCLE_DAYS)
+        schedule["pregnancy_check_date"] = last_insemination + timedelta(days=PREGNANCY_CHECK_DAYS)
+        schedule["expected_calving_date"] = last_insemination + timedelta(days=GESTATION_DAYS)
+    elif last_calving is not None:
+        schedule["next_heat_date"] = last_calving + timedelta(days=POSTPARTUM_HEAT_DAYS)
+    return schedule
+
+
+async def refresh_breeding_schedules(db: AsyncSession, cattle_ids: Iterable[Optional[int]]) -> None:
+    """Recompute the schedule rows of the given cows inside the caller's transaction."""
+    cattle_ids = list({cattle_id for cattle_id in cattle_ids if cattle_id is not None})
+    for offset in range(0, len(cattle_ids), REFRESH_BATCH_SIZE):
+        batch = cattle_ids[offset:offset + REFRESH_BATCH_SIZE]
+        inseminations = dict((await db.execute(
+            select(Insemination.cattle_id, func.max(Insemination.insemination_date))
+            .where(Insemination.cattle_id.in_(batch))
+            .group_by(Insemination.cattle_id)
+        )).all())
+        calvings = dict((await db.execute(
+            select(Calving.cattle_id, func.max(Calving.calving_date))
+            .where(Calving.cattle_id.in_(batch), Calving.calving_date.is_not(None))
+            .group_by(Calving.cattle_id)
+        )).all())
+
+        rows = [
+            {"cattle_id": cattle_id, **compute_schedule(inseminations.get(cattle_id), calvings.get(cattle_id))}
+            for cattle_id in batch
+            if cattle_id in inseminations or cattle_id in calvings
+        ]
+        if rows:
+            statement = upsert_insert(db, BreedingSchedule).values(rows)
+            statement = statement.on_conflict_do_update(
+                index_elements=["cattle_id"],
+                set_={column: getattr(statement.excluded, column) for column in rows[0] if column != "cattle_id"},
+            )
+            await db.execute(statement)
+        # Cows whose last event was deleted
+        stale = set(batch) - {row["cattle_id"] for row in rows}
+        if stale:
+            await db.execute(
+                delete(BreedingSchedule)
+                .where(BreedingSchedule.cattle_id.in_(stale))
+                .execution_options(synchronize_session=False)
+            )
+
+
+async def rebuild_breeding_schedules(db: AsyncSession) -> None:
+    """Recompute every schedule row, e.g. after events were loaded outside the API."""
+    await db.execute(delete(BreedingSchedule).execution_options(synchronize_session=False))
+    result = await db.execute(union(
+        select(Insemination.cattle_id),
+        select(Calving.cattle_id).where(Calving.calving_date.is_not(None)),
+    ))
+    await refresh_breeding_schedules(db, result.scalars().all())
+    await db.commit()
+
+
+async def get_breeding_schedule(db: AsyncSession, cattle_id: int) -> BreedingSchedule:
+    schedule = await db.get(BreedingSchedule, cattle_id)
+    if schedule is None:
+        raise HTTPException(status_code=404, detail="No breeding events recorded for this cattle")
+    return schedule
+
+
+async def get_due_events(db: AsyncSession, farmer_id: int, start: date, end: date) -> List[dict]:
+    """Heats, pregnancy checks and calvings falling in ``[start, end]`` for a farmer's herd, by date."""
+    result = await db.execute(
+        select(BreedingSchedule, Cattle.name)
+        .join(Cattle, Cattle.cattle_id == BreedingSchedule.cattle_id)
+        .where(
+            Cattle.user_id == farmer_id,
+            or_(*(column.between(start, end) for column in SCHEDULE_EVENTS.values())),
+        )
+    )
+    events = []
+    for schedule, name in result.all():
+        for event, column in SCHEDULE_EVENTS.items():
+            due_date = getattr(schedule, column.key)
+            if due_date is not None and start <= due_date <= end:
+                events.append({"cattle_id": schedule.cattle_id, "name": name, "event": event, "due_date": due_date})
+    events.sort(key=lambda event: (event["due_date"], event["cattle_id"]))
+    return events
@@ -1,48 +1,32 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from fastapi import HTTPException
+from app.crud.base import CRUDRepository
+from app.crud.breeding import refresh_breeding_schedules
+from app.crud.lactation import invalidate_cattle_lactation_curves
 from app.models.calving import Calving
-from app.models.cattle import Cattle
+
+calving_repository = CRUDRepository(Calving, "Calving not found")
 
 async def create_calving(db: AsyncSession, obj_in: dict) -> Calving:
-    new_obj = Calving(**obj_in)
-    async with db.begin():
-        db.add(new_obj)
+    obj = await calving_repository.create(db, obj_in, commit=False)
+    await refresh_breeding_schedules(db, [obj.cattle_id])
     await db.commit()
-    await db.refresh(new_obj)
-    return new_obj
+    await invalidate_cattle_lactation_curves(db, [obj.cattle_id])
+    return obj
 
 async def get_calving(db: AsyncSession, calving_id: int) -> Calving:
-    query = select(Calving).filter_by(calving_id=calving_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Calving not found")
-    return obj
+    return await calving_repository.get(db, calving_id)
 
 async def update_calving(db: AsyncSession, calving_id: int, obj_in: dict) -> Calving:
-    query = select(Calving).filter_by(calving_id=calving_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Calving not found")
-
-    for key, value in obj_in.items():
-        setattr(obj, key, value)
-
-    async with db.begin():
-        await db.commit()
-        await db.refresh(obj)
+    previous_cattle_id = (await calving_repository.get(db, calving_id)).cattle_id
+    obj = await calving_repository.update(db, calving_id, obj_in, commit=False)
+    await refresh_breeding_schedules(db, [previous_cattle_id, obj.cattle_id])
+    await db.commit()
+    await invalidate_cattle_lactation_curves(db, [previous_cattle_id, obj.cattle_id])
     return obj
 
 async def delete_calving(db: AsyncSession, calving_id: int) -> Calving:
-    query = select(Calving).filter_by(calving_id=calving_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Calving not found")
-
-    async with db.begin():
-        await db.delete(obj)
-        await db.commit()
+    obj = await calving_repository.delete(db, calving_id, commit=False)
+    await refresh_breeding_schedules(db, [obj.cattle_id])
+    await db.commit()
+    await invalidate_cattle_lactation_curves(db, [obj.cattle_id])
     return obj
@@ -1,14 +1,25 @@
+import calendar
+from datetime import date
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import NoResultFound
 from app.models import Cattle
+from app.models.cattle import CattleStatusEnum, GenderEnum
 from app.schema import schemas
 from app.utills.TransactionManager import TransactionManager
+from app.crud.base import CRUDRepository
+from app.crud.search import refresh_cattle_documents
+from app.utills.pagination import paginate
+
+cattle_repository = CRUDRepository(Cattle, "Cattle not found")
 
 async def create_cattle(db: AsyncSession, cattle_data: schemas.CattleCreate) -> schemas.CattleOut:
     async with TransactionManager(db) as session:
         db_cattle = Cattle(**cattle_data.model_dump())
         session.add(db_cattle)
+        await session.flush()
+        await refresh_cattle_documents(session, [db_cattle.cattle_id])
         await session.commit()
         await session.refresh(db_cattle)
         return db_cattle
@@ -21,10 +32,47 @@ async def get_cattle(db: AsyncSession, cattle_id: int) -> schemas.CattleOut:
             raise NoResultFound("Cattle not found")
         return db_cattle
 
-async def get_all_cattles(db: AsyncSession, skip: int = 0, limit: int = 10) -> list[schemas.CattleOut]:
+def _months_before(day: date, months: int) -> date:
+    """The same calendar day ``months`` earlier, clamped to the end of shorter months."""
+    year, month = divmod(day.year * 12 + day.month - 1 - months, 12)
+    month += 1
+    last_day = calendar.monthrange(year, month)[1]
+    return date(year, month, min(day.day, last_day))
+
+def filter_cattle(statement, filters: Optional[schemas.CattleFilter]):
+    """Apply marketplace filters; equality filters come first to match the composite indexes."""
+    if filters is None:
+        return statement
+    if filters.status is not None:
+        statement = statement.where(Cattle.status == CattleStatusEnum[filters.status.name])
+    if filters.breed is not None:
+        statement = statement.where(Cattle.breed == filters.breed)
+    if filters.gender is not None:
+        statement = statement.where(Cattle.gender == GenderEnum[filters.gender.name])
+    today = date.today()
+    if filters.min_age_months is not None:
+        statement = statement.where(Cattle.birth_date <= _months_before(today, filters.min_age_months))
+    if filters.max_age_months is not None:
+        statement = statement.where(Cattle.birth_date > _months_before(today, filters.max_age_months + 1))
+    if filters.min_quality_score is not None:
+        statement = statement.where(Cattle.quality_score >= filters.min_quality_score)
+    if filters.max_quality_score is not None:
+        statement = statement.where(Cattle.quality_score <= filters.max_quality_score)
+    return statement
+
+async def get_all_cattles(
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    limit: int = 10,
+    sort: schemas.CattleSortKey = schemas.CattleSortKey.cattle_id,
+    descending: bool = False,
+    filters: Optional[schemas.CattleFilter] = None,
+) -> dict:
     async with TransactionManager(db) as session:
-        result = await session.execute(select(Cattle).offset(skip).limit(limit))
-        return result.scalars().all()
+        return await paginate(
+            session, filter_cattle(select(Cattle), filters), getattr(Cattle, sort.value), Cattle.cattle_id,
+            cursor=cursor, limit=limit, descending=descending,
+        )
 
 async def update_cattle(db: AsyncSession, cattle_id: int, cattle_update: schemas.CattleUpdate) -> schemas.CattleOut:
     async with TransactionManager(db) as session:
@@ -35,6 +83,8 @@ async def update_cattle(db: AsyncSession, cattle_id: int, cattle_update: schemas
         for key, value in cattle_update.model_dump(exclude_unset=True).items():  # Use model_dump() instead of dict()
             setattr(db_cattle, key, value)
         session.add(db_cattle)
+        await session.flush()
+        await refresh_cattle_documents(session, [cattle_id])
         await session.commit()
         await session.refresh(db_cattle)
         return db_cattle
@@ -46,5 +96,7 @@ async def delete_cattle(db: AsyncSession, cattle_id: int) -> schemas.CattleOut:
         if db_cattle is None:
             raise NoResultFound("Cattle not found")
         await session.delete(db_cattle)
+        await session.flush()
+        await refresh_cattle_documents(session, [cattle_id])
         await session.commit()
         return db_cattle
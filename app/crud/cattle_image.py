@@ -1,15 +1,19 @@
-from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
 from fastapi import UploadFile, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from ..models import CattleImage
 from app.schema.schemas import CattleImageResponse
 from app.utills.image_utill import save_image_to_storage
+from app.utills.pagination import paginate
 
 
-def create_cattle_image(db: Session, cattle_id: int, file: UploadFile) -> CattleImageResponse:
+async def create_cattle_image(db: AsyncSession, cattle_id: int, file: UploadFile) -> CattleImageResponse:
     try:
-        # Save the image to a storage and get the URL
-        image_url = save_image_to_storage(file.file, file.filename)
+        # Save the image to a storage and get the URL (file I/O runs off the event loop)
+        image_url = await run_in_threadpool(save_image_to_storage, file.file, file.filename)
 
         # Create a new CattleImage instance
         new_image = CattleImage(
@@ -19,32 +23,36 @@ def create_cattle_image(db: Session, cattle_id: int, file: UploadFile) -> Cattle
 
         # Add the new image to the session and commit
         db.add(new_image)
-        db.commit()
-        db.refresh(new_image)
+        await db.commit()
+        await db.refresh(new_image)
 
         return CattleImageResponse.from_orm(new_image)
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail="Cattle ID does not exist or other integrity error")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def get_cattle_images(db: Session, cattle_id: int):
-    return db.query(CattleImage).filter(CattleImage.cattle_id == cattle_id).all()
+async def get_cattle_images(db: AsyncSession, cattle_id: int, cursor: Optional[str] = None, limit: int = 20) -> dict:
+    statement = select(CattleImage).filter(CattleImage.cattle_id == cattle_id)
+    return await paginate(db, statement, CattleImage.image_id, CattleImage.image_id, cursor=cursor, limit=limit)
 
 
-def get_cattle_image(db: Session, image_id: int) -> CattleImageResponse:
-    image = db.query(CattleImage).filter(CattleImage.image_id == image_id).first()
+async def get_cattle_image(db: AsyncSession, image_id: int) -> CattleImageResponse:
+    result = await db.execute(select(CattleImage).filter(CattleImage.image_id == image_id))
+    image = result.scalars().first()
     if not image:
         raise HTTPException(status_code=404, detail="Image not found")
     return CattleImageResponse.from_orm(image)
 
 
-def delete_cattle_image(db: Session, image_id: int):
-    image = db.query(CattleImage).filter(CattleImage.image_id == image_id).first()
+async def delete_cattle_image(db: AsyncSession, image_id: int) -> CattleImageResponse:
+    result = await db.execute(select(CattleImage).filter(CattleImage.image_id == image_id))
+    image = result.scalars().first()
     if not image:
         raise HTTPException(status_code=404, detail="Image not found")
-    db.delete(image)
-    db.commit()
+    await db.delete(image)
+    await db.commit()
+    return CattleImageResponse.from_orm(image)
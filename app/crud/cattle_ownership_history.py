@@ -1,47 +1,17 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from fastapi import HTTPException
+from app.crud.base import CRUDRepository
 from app.models.cattle_ownership_history import CattleOwnershipHistory
 
+cattle_ownership_history_repository = CRUDRepository(CattleOwnershipHistory, "CattleOwnershipHistory record not found")
+
 async def create_cattle_ownership_history(db: AsyncSession, obj_in: dict) -> CattleOwnershipHistory:
-    new_obj = CattleOwnershipHistory(**obj_in)
-    async with db.begin():
-        db.add(new_obj)
-    await db.commit()
-    await db.refresh(new_obj)
-    return new_obj
+    return await cattle_ownership_history_repository.create(db, obj_in)
 
 async def get_cattle_ownership_history(db: AsyncSession, ownership_id: int) -> CattleOwnershipHistory:
-    query = select(CattleOwnershipHistory).filter_by(ownership_id=ownership_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="CattleOwnershipHistory record not found")
-    return obj
+    return await cattle_ownership_history_repository.get(db, ownership_id)
 
 async def update_cattle_ownership_history(db: AsyncSession, ownership_id: int, obj_in: dict) -> CattleOwnershipHistory:
-    query = select(CattleOwnershipHistory).filter_by(ownership_id=ownership_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="CattleOwnershipHistory record not found")
-
-    for key, value in obj_in.items():
-        setattr(obj, key, value)
-
-    async with db.begin():
-        await db.commit()
-        await db.refresh(obj)
-    return obj
+    return await cattle_ownership_history_repository.update(db, ownership_id, obj_in)
 
 async def delete_cattle_ownership_history(db: AsyncSession, ownership_id: int) -> CattleOwnershipHistory:
-    query = select(CattleOwnershipHistory).filter_by(ownership_id=ownership_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="CattleOwnershipHistory record not found")
-
-    async with db.begin():
-        await db.delete(obj)
-        await db.commit()
-    return obj
+    return await cattle_ownership_history_repository.delete(db, ownership_id)
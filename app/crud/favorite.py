@@ -1,47 +1,93 @@
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+from sqlalchemy import func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from fastapi import HTTPException
+from app.crud.base import CRUDRepository
+from app.models.cattle import Cattle, CattleStatusEnum
 from app.models.favorite import Favorite
+from app.utills.cache import TTLCache
+
+favorite_repository = CRUDRepository(Favorite, "Favorite record not found")
+
+LEADERBOARD_DAYS = 7
+LEADERBOARD_SIZE = 50
+LEADERBOARD_CACHE_SECONDS = 300
+
+# Single entry: the current top-N cattle ids with their weekly counts
+_leaderboard = TTLCache(ttl_seconds=LEADERBOARD_CACHE_SECONDS, max_entries=1)
+
+async def _adjust_favorite_count(db: AsyncSession, cattle_ids: Iterable[Optional[int]], delta: int) -> None:
+    cattle_ids = [cattle_id for cattle_id in cattle_ids if cattle_id is not None]
+    if cattle_ids:
+        await db.execute(
+            update(Cattle)
+            .where(Cattle.cattle_id.in_(cattle_ids))
+            .values(favorite_count=Cattle.favorite_count + delta)
+            .execution_options(synchronize_session=False)
+        )
 
 async def create_favorite(db: AsyncSession, obj_in: dict) -> Favorite:
-    new_obj = Favorite(**obj_in)
-    async with db.begin():
-        db.add(new_obj)
+    obj = await favorite_repository.create(db, obj_in, commit=False)
+    await _adjust_favorite_count(db, [obj.cattle_id], 1)
     await db.commit()
-    await db.refresh(new_obj)
-    return new_obj
+    return obj
 
 async def get_favorite(db: AsyncSession, favorite_id: int) -> Favorite:
-    query = select(Favorite).filter_by(favorite_id=favorite_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Favorite record not found")
-    return obj
+    return await favorite_repository.get(db, favorite_id)
 
 async def update_favorite(db: AsyncSession, favorite_id: int, obj_in: dict) -> Favorite:
-    query = select(Favorite).filter_by(favorite_id=favorite_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Favorite record not found")
-
-    for key, value in obj_in.items():
-        setattr(obj, key, value)
-
-    async with db.begin():
-        await db.commit()
-        await db.refresh(obj)
+    previous_cattle_id = (await favorite_repository.get(db, favorite_id)).cattle_id
+    obj = await favorite_repository.update(db, favorite_id, obj_in, commit=False)
+    if obj.cattle_id != previous_cattle_id:
+        await _adjust_favorite_count(db, [previous_cattle_id], -1)
+        await _adjust_favorite_count(db, [obj.cattle_id], 1)
+    await db.commit()
     return obj
 
 async def delete_favorite(db: AsyncSession, favorite_id: int) -> Favorite:
-    query = select(Favorite).filter_by(favorite_id=favorite_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Favorite record not found")
-
-    async with db.begin():
-        await db.delete(obj)
-        await db.commit()
+    obj = await favorite_repository.delete(db, favorite_id, commit=False)
+    await _adjust_favorite_count(db, [obj.cattle_id], -1)
+    await db.commit()
     return obj
+
+async def recount_favorite_counts(db: AsyncSession) -> None:
+    """Recompute every cattle's favorite_count from the favorites table, e.g. for rows predating the column."""
+    favorites = (
+        select(func.count())
+        .select_from(Favorite)
+        .where(Favorite.cattle_id == Cattle.cattle_id)
+        .scalar_subquery()
+    )
+    await db.execute(update(Cattle).values(favorite_count=favorites).execution_options(synchronize_session=False))
+    await db.commit()
+    _leaderboard.clear()
+
+async def get_most_watched(db: AsyncSession, limit: int = 10) -> List[dict]:
+    """Available listings favorited most over the last week.
+
+    The ranking is recomputed at most every ``LEADERBOARD_CACHE_SECONDS``;
+    cattle rows are read fresh so status and totals stay current.
+    """
+    ranking = _leaderboard.get("week")
+    if ranking is None:
+        since = datetime.now() - timedelta(days=LEADERBOARD_DAYS)
+        weekly = func.count().label("weekly")
+        result = await db.execute(
+            select(Favorite.cattle_id, weekly)
+            .join(Cattle, Cattle.cattle_id == Favorite.cattle_id)
+            .where(Favorite.created_at >= since, Cattle.status == CattleStatusEnum.Available)
+            .group_by(Favorite.cattle_id)
+            .order_by(weekly.desc(), Favorite.cattle_id)
+            .limit(LEADERBOARD_SIZE)
+        )
+        ranking = result.all()
+        _leaderboard.set("week", ranking)
+
+    ranking = ranking[:limit]
+    result = await db.execute(select(Cattle).where(Cattle.cattle_id.in_([cattle_id for cattle_id, _ in ranking])))
+    cattle = {obj.cattle_id: obj for obj in result.scalars().all()}
+    return [
+        {"cattle": cattle[cattle_id], "favorites_this_week": count}
+        for cattle_id, count in ranking if cattle_id in cattle
+    ]
@@ -0,0 +1,78 @@
+from datetime import date, timedelta
+from typing import List
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models import Cattle, WeightRecord
+from app.utills.herd_stats import grouped_least_squares
+
+DEFAULT_MARKET_WEIGHT = 400.0
+
+
+def _float_or_none(value: float):
+    return None if np.isnan(value) else float(value)
+
+
+async def get_growth_analytics(db: AsyncSession, farmer_id: int, target_weight: float = DEFAULT_MARKET_WEIGHT) -> List[dict]:
+    """Linear growth fit for each of a farmer's animals from one query and one grouped solve.
+
+    ``average_daily_gain`` is the fitted slope in kg/day, ``deviation_kg`` how far
+    the latest weighing sits from the fitted line and ``residual_sd_kg`` the
+    scatter around it. The market-weight date extrapolates the line from the
+    latest weighing and is only given while the animal is gaining and still
+    below ``target_weight``.
+    """
+    result = await db.execute(
+        select(WeightRecord.cattle_id, WeightRecord.weight_date, WeightRecord.weight)
+        .join(Cattle, Cattle.cattle_id == WeightRecord.cattle_id)
+        .where(Cattle.user_id == farmer_id)
+        .order_by(WeightRecord.cattle_id, WeightRecord.weight_date)
+    )
+    rows = result.all()
+    if not rows:
+        return []
+
+    cattle_ids, weight_dates, weights = zip(*rows)
+    cattle_ids, first_row, groups = np.unique(np.array(cattle_ids), return_index=True, return_inverse=True)
+    n_groups = len(cattle_ids)
+    dates = np.array(weight_dates, dtype="datetime64[D]")
+    # Days from the herd's first weighing keeps the intercept column well conditioned
+    days = (dates - dates.min()).astype(float)
+    y = np.array(weights, dtype=float)
+
+    coef, fitted = grouped_least_squares(groups, np.column_stack([np.ones_like(days), days]), y, n_groups)
+    residuals = y - (coef[groups, 0] + coef[groups, 1] * days)
+    counts = np.bincount(groups, minlength=n_groups)
+    squared = np.bincount(groups, weights=np.nan_to_num(residuals) ** 2, minlength=n_groups)
+    residual_sd = np.where(fitted & (counts > 2), np.sqrt(squared / np.maximum(counts - 2, 1)), np.nan)
+
+    # Rows are ordered by animal then date, so each group's last row is its latest weighing
+    last_row = np.append(first_row[1:], len(y)) - 1
+    adg = coef[:, 1]
+    latest_fitted = coef[:, 0] + adg * days[last_row]
+    days_to_target = np.where(
+        fitted & (adg > 0) & (y[last_row] < target_weight),
+        (target_weight - latest_fitted) / np.where(adg > 0, adg, 1.0),
+        np.nan,
+    )
+
+    analytics = []
+    for i, cattle_id in enumerate(cattle_ids):
+        latest_date: date = dates[last_row[i]].item()
+        projected = None
+        if not np.isnan(days_to_target[i]):
+            projected = latest_date + timedelta(days=int(np.ceil(max(days_to_target[i], 0.0))))
+        analytics.append({
+            "cattle_id": int(cattle_id),
+            "record_count": int(counts[i]),
+            "first_weight_date": dates[first_row[i]].item(),
+            "latest_weight_date": latest_date,
+            "latest_weight": float(y[last_row[i]]),
+            "average_daily_gain": _float_or_none(adg[i]),
+            "deviation_kg": _float_or_none(residuals[last_row[i]]),
+            "residual_sd_kg": _float_or_none(residual_sd[i]),
+            "projected_market_date": projected,
+        })
+    return analytics
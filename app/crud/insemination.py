@@ -1,48 +1,28 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from fastapi import HTTPException
+from app.crud.base import CRUDRepository
+from app.crud.breeding import refresh_breeding_schedules
 from app.models.insemination import Insemination
-from app.models.cattle import Cattle
+
+insemination_repository = CRUDRepository(Insemination, "Insemination not found")
 
 async def create_insemination(db: AsyncSession, obj_in: dict) -> Insemination:
-    new_obj = Insemination(**obj_in)
-    async with db.begin():
-        db.add(new_obj)
+    obj = await insemination_repository.create(db, obj_in, commit=False)
+    await refresh_breeding_schedules(db, [obj.cattle_id])
     await db.commit()
-    await db.refresh(new_obj)
-    return new_obj
+    return obj
 
 async def get_insemination(db: AsyncSession, insemination_id: int) -> Insemination:
-    query = select(Insemination).filter_by(insemination_id=insemination_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Insemination not found")
-    return obj
+    return await insemination_repository.get(db, insemination_id)
 
 async def update_insemination(db: AsyncSession, insemination_id: int, obj_in: dict) -> Insemination:
-    query = select(Insemination).filter_by(insemination_id=insemination_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Insemination not found")
-
-    for key, value in obj_in.items():
-        setattr(obj, key, value)
-
-    async with db.begin():
-        await db.commit()
-        await db.refresh(obj)
+    previous_cattle_id = (await insemination_repository.get(db, insemination_id)).cattle_id
+    obj = await insemination_repository.update(db, insemination_id, obj_in, commit=False)
+    await refresh_breeding_schedules(db, [previous_cattle_id, obj.cattle_id])
+    await db.commit()
     return obj
 
 async def delete_insemination(db: AsyncSession, insemination_id: int) -> Insemination:
-    query = select(Insemination).filter_by(insemination_id=insemination_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Insemination not found")
-
-    async with db.begin():
-        await db.delete(obj)
-        await db.commit()
+    obj = await insemination_repository.delete(db, insemination_id, commit=False)
+    await refresh_breeding_schedules(db, [obj.cattle_id])
+    await db.commit()
     return obj
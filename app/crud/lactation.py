@@ -0,0 +1,129 @@
+from typing import Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models import Calving, Cattle, MilkDailyCattle
+from app.utills.cache import TTLCache
+from app.utills.herd_stats import grouped_least_squares
+
+LACTATION_CACHE_SECONDS = 600
+
+# farmer_id -> fitted curves for the herd; dropped when milk or calving rows change
+_curves = TTLCache(ttl_seconds=LACTATION_CACHE_SECONDS)
+
+
+def invalidate_lactation_curves(farmer_ids: Iterable[Optional[int]]) -> None:
+    _curves.invalidate({farmer_id for farmer_id in farmer_ids if farmer_id is not None})
+
+
+def clear_lactation_curves() -> None:
+    _curves.clear()
+
+
+async def invalidate_cattle_lactation_curves(db: AsyncSession, cattle_ids: Iterable[Optional[int]]) -> None:
+    """Drop the cached curves of the herds owning these cows."""
+    cattle_ids = {cattle_id for cattle_id in cattle_ids if cattle_id is not None}
+    if not cattle_ids:
+        return
+    result = await db.execute(select(Cattle.user_id).where(Cattle.cattle_id.in_(cattle_ids)))
+    invalidate_lactation_curves(result.scalars().all())
+
+
+def fit_wood_curves(groups: np.ndarray, days_in_milk: np.ndarray, yields: np.ndarray, n_groups: int) -> dict:
+    """Fit Wood's model ``y = a t^b e^(-ct)`` for every group at once.
+
+    The model is linear after taking logs, ``ln y = ln a + b ln t - c t``, so all
+    cows are fitted by one grouped least-squares solve. Peak, days to peak and
+    persistency are only defined for the usual rising-then-falling shape
+    (``b > 0`` and ``c > 0``) and are NaN otherwise.
+    """
+    X = np.column_stack([np.ones_like(days_in_milk), np.log(days_in_milk), -days_in_milk])
+    coef, fitted = grouped_least_squares(groups, X, np.log(yields), n_groups)
+    a, b, c = np.exp(coef[:, 0]), coef[:, 1], coef[:, 2]
+
+    shaped = fitted & (b > 0) & (c > 0)
+    safe_b = np.where(shaped, b, 1.0)
+    safe_c = np.where(shaped, c, 1.0)
+    peak_day = safe_b / safe_c
+    peak_yield = a * peak_day ** safe_b * np.exp(-safe_b)
+    persistency = -(safe_b + 1) * np.log(safe_c)
+    return {
+        "a": a,
+        "b": b,
+        "c": c,
+        "fitted": fitted,
+        "peak_day": np.where(shaped, peak_day, np.nan),
+        "peak_yield": np.where(shaped, peak_yield, np.nan),
+        "persistency": np.where(shaped, persistency, np.nan),
+    }
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+async def get_lactation_curves(db: AsyncSession, farmer_id: int) -> List[dict]:
+    """Wood's lactation curve for each of a farmer's cows, over the lactation since its last calving.
+
+    Reads daily totals from the milk rollup; cows with fewer than three usable
+    days, or whose records cannot identify a curve, come back without coefficients.
+    """
+    cached = _curves.get(farmer_id)
+    if cached is not None:
+        return cached
+
+    last_calving = (
+        select(Calving.cattle_id, func.max(Calving.calving_date).label("calving_date"))
+        .where(Calving.calving_date.is_not(None))
+        .group_by(Calving.cattle_id)
+        .subquery()
+    )
+    result = await db.execute(
+        select(
+            MilkDailyCattle.cattle_id, last_calving.c.calving_date,
+            MilkDailyCattle.production_date, MilkDailyCattle.total_volume,
+        )
+        .join(Cattle, Cattle.cattle_id == MilkDailyCattle.cattle_id)
+        .join(last_calving, last_calving.c.cattle_id == MilkDailyCattle.cattle_id)
+        .where(
+            Cattle.user_id == farmer_id,
+            MilkDailyCattle.production_date > last_calving.c.calving_date,
+            MilkDailyCattle.total_volume > 0,
+        )
+    )
+    rows = result.all()
+    if not rows:
+        _curves.set(farmer_id, [])
+        return []
+
+    cattle_ids, calving_dates, production_dates, volumes = zip(*rows)
+    cattle_ids, first_row, groups = np.unique(np.array(cattle_ids), return_index=True, return_inverse=True)
+    calving_dates = np.array(calving_dates, dtype="datetime64[D]")
+    days_in_milk = (np.array(production_dates, dtype="datetime64[D]") - calving_dates).astype(float)
+    yields = np.array(volumes, dtype=float)
+
+    curves = fit_wood_curves(groups, days_in_milk, yields, len(cattle_ids))
+    record_counts = np.bincount(groups, minlength=len(cattle_ids))
+    latest_day = np.zeros(len(cattle_ids))
+    np.maximum.at(latest_day, groups, days_in_milk)
+
+    lactations = []
+    for i, cattle_id in enumerate(cattle_ids):
+        fitted = bool(curves["fitted"][i])
+        lactations.append({
+            "cattle_id": int(cattle_id),
+            "calving_date": calving_dates[first_row[i]].item(),
+            "days_in_milk": int(latest_day[i]),
+            "record_count": int(record_counts[i]),
+            "wood_a": float(curves["a"][i]) if fitted else None,
+            "wood_b": float(curves["b"][i]) if fitted else None,
+            "wood_c": float(curves["c"][i]) if fitted else None,
+            "peak_day": _optional(curves["peak_day"][i]),
+            "peak_yield": _optional(curves["peak_yield"][i]),
+            "persistency": _optional(curves["persistency"][i]),
+        })
+    _curves.set(farmer_id, lactations)
+    return lactations
@@ -1,47 +1,100 @@
+from typing import List, Optional
+from sqlalchemy import and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from fastapi import HTTPException
+from app.crud.base import CRUDRepository
+from app.models.cattle import Cattle, CattleStatusEnum
 from app.models.location import Location
+from app.utills.geo import encode_geohash, haversine_km, bounding_box, covering_prefixes
+
+location_repository = CRUDRepository(Location, "Location not found")
+
+def _with_geohash(obj_in: dict) -> dict:
+    latitude, longitude = obj_in.get("latitude"), obj_in.get("longitude")
+    if latitude is None or longitude is None:
+        return {**obj_in, "geohash": None}
+    return {**obj_in, "geohash": encode_geohash(float(latitude), float(longitude))}
 
 async def create_location(db: AsyncSession, obj_in: dict) -> Location:
-    new_obj = Location(**obj_in)
-    async with db.begin():
-        db.add(new_obj)
-    await db.commit()
-    await db.refresh(new_obj)
-    return new_obj
+    return await location_repository.create(db, _with_geohash(obj_in))
 
 async def get_location(db: AsyncSession, location_id: int) -> Location:
-    query = select(Location).filter_by(location_id=location_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Location not found")
-    return obj
+    return await location_repository.get(db, location_id)
 
 async def update_location(db: AsyncSession, location_id: int, obj_in: dict) -> Location:
-    query = select(Location).filter_by(location_id=location_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Location not found")
+    if "latitude" in obj_in or "longitude" in obj_in:
+        current = await location_repository.get(db, location_id)
+        obj_in = _with_geohash({"latitude": current.latitude, "longitude": current.longitude, **obj_in})
+    return await location_repository.update(db, location_id, obj_in)
 
-    for key, value in obj_in.items():
-        setattr(obj, key, value)
+async def delete_location(db: AsyncSession, location_id: int) -> Location:
+    return await location_repository.delete(db, location_id)
 
-    async with db.begin():
-        await db.commit()
-        await db.refresh(obj)
-    return obj
+GEOHASH_BATCH_SIZE = 1000
 
-async def delete_location(db: AsyncSession, location_id: int) -> Location:
-    query = select(Location).filter_by(location_id=location_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Location not found")
-
-    async with db.begin():
-        await db.delete(obj)
-        await db.commit()
-    return obj
+async def rebuild_location_geohashes(db: AsyncSession) -> int:
+    """Recompute every location's geohash, e.g. for rows written before the column existed."""
+    result = await db.execute(select(Location.location_id, Location.latitude, Location.longitude))
+    rows = [
+        _with_geohash({"location_id": location_id, "latitude": latitude, "longitude": longitude})
+        for location_id, latitude, longitude in result.all()
+    ]
+    for offset in range(0, len(rows), GEOHASH_BATCH_SIZE):
+        batch = [
+            {"location_id": row["location_id"], "geohash": row["geohash"]}
+            for row in rows[offset:offset + GEOHASH_BATCH_SIZE]
+        ]
+        await location_repository.bulk_update(db, batch, commit=False)
+    await db.commit()
+    return len(rows)
+
+def _within_radius(statement, latitude: float, longitude: float, radius_km: float):
+    """Restrict to the geohash cells and bounding box around the point; exact distance is checked after."""
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    cells = [
+        and_(Location.geohash >= prefix, Location.geohash < prefix + "~")
+        for prefix in covering_prefixes(latitude, longitude, radius_km)
+    ]
+    return statement.where(
+        or_(*cells),
+        Location.latitude.between(min_lat, max_lat),
+        Location.longitude.between(min_lon, max_lon),
+    )
+
+def _distance(latitude: float, longitude: float, location: Location) -> float:
+    return haversine_km(latitude, longitude, float(location.latitude), float(location.longitude))
+
+async def get_locations_within(
+    db: AsyncSession, latitude: float, longitude: float, radius_km: float, limit: Optional[int] = None
+) -> List[dict]:
+    """Farmer locations within ``radius_km``, nearest first."""
+    result = await db.execute(_within_radius(select(Location), latitude, longitude, radius_km))
+    hits = [
+        {"location": location, "distance_km": distance}
+        for location in result.scalars().all()
+        if (distance := _distance(latitude, longitude, location)) <= radius_km
+    ]
+    hits.sort(key=lambda hit: hit["distance_km"])
+    return hits[:limit] if limit else hits
+
+async def get_available_cattle_within(
+    db: AsyncSession, latitude: float, longitude: float, radius_km: float, limit: int = 50
+) -> List[dict]:
+    """Available cattle whose seller is within ``radius_km``, nearest first.
+
+    A seller may have several locations in range; each animal is reported once,
+    at its seller's nearest one.
+    """
+    statement = (
+        select(Cattle, Location)
+        .join(Location, Location.farmer_id == Cattle.user_id)
+        .where(Cattle.status == CattleStatusEnum.Available)
+    )
+    result = await db.execute(_within_radius(statement, latitude, longitude, radius_km))
+    nearest = {}
+    for cattle, location in result.all():
+        distance = _distance(latitude, longitude, location)
+        if distance <= radius_km and (cattle.cattle_id not in nearest or distance < nearest[cattle.cattle_id]["distance_km"]):
+            nearest[cattle.cattle_id] = {"cattle": cattle, "distance_km": distance}
+    hits = sorted(nearest.values(), key=lambda hit: (hit["distance_km"], hit["cattle"].cattle_id))
+    return hits[:limit]
@@ -1,38 +1,95 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models import Message, User
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func, or_
+from fastapi import HTTPException
+from app.models import Message, User, OutboundMessage
 from app.schema.schemas import MessageCreate
-from app.utills.whatsapp.whatsapp import WhatsAppAPI
-from app.config.appsettings import AppSettings
+from app.utills.outbound import outbound_dispatcher
+from app.utills.pagination import paginate
 
-def get_user_phone_number(db: Session, receiver_id: int) -> str:
-    user = db.query(User).filter(User.user_id == receiver_id).first()
-    return user.phone if user else ""
+def conversation_participants(sender_id: Optional[int], receiver_id: Optional[int]) -> dict:
+    """The message's conversation key: both users ordered by id."""
+    if sender_id is None or receiver_id is None:
+        return {"participant_low": sender_id if receiver_id is None else receiver_id, "participant_high": None}
+    return {"participant_low": min(sender_id, receiver_id), "participant_high": max(sender_id, receiver_id)}
 
-async def create_message(db: Session, message: MessageCreate):
-    # Initialize the settings
-    settings = AppSettings()  # Use AppSettings here
-    whatsapp_client = WhatsAppAPI(api_url=settings.api_url, api_key=settings.api_key)
+async def get_user_phone_number(db: AsyncSession, receiver_id: int) -> str:
+    result = await db.execute(select(User.phone).filter(User.user_id == receiver_id))
+    phone = result.scalar_one_or_none()
+    return phone or ""
 
-    # Create the message in the database
+async def create_message(db: AsyncSession, message: MessageCreate):
+    # Store the message and queue its WhatsApp delivery in one transaction;
+    # the outbound dispatcher sends it in the background
     db_message = Message(
         sender_id=message.sender_id,
         receiver_id=message.receiver_id,
         message_content=message.message_content,
-        sent_at=func.now()
+        sent_at=func.now(),
+        **conversation_participants(message.sender_id, message.receiver_id)
     )
     db.add(db_message)
-    db.commit()
-    db.refresh(db_message)
-
-    # Send the message via WhatsApp API
-    receiver_phone_number = get_user_phone_number(db, message.receiver_id)
-    whatsapp_response = whatsapp_client.send_message(
-        to=receiver_phone_number,
-        message=message.message_content
+    await db.flush()
+
+    receiver_phone_number = await get_user_phone_number(db, message.receiver_id)
+    outbound = OutboundMessage(
+        message_id=db_message.message_id,
+        sender_id=message.sender_id,
+        to_phone=receiver_phone_number,
+        body=message.message_content,
     )
+    db.add(outbound)
+    await db.commit()
+    await db.refresh(db_message)
+    await db.refresh(outbound)
+    outbound_dispatcher.notify()
 
     return {
         "db_message": db_message,
-        "whatsapp_response": whatsapp_response
+        "whatsapp_response": {"outbound_id": outbound.outbound_id, "status": outbound.status.value}
     }
+
+async def get_outbound_message(db: AsyncSession, outbound_id: int) -> OutboundMessage:
+    outbound = await db.get(OutboundMessage, outbound_id)
+    if outbound is None:
+        raise HTTPException(status_code=404, detail="Outbound message not found")
+    return outbound
+
+async def get_conversations(db: AsyncSession, user_id: int, cursor: Optional[str] = None, limit: int = 20) -> dict:
+    """The user's conversations, each represented by its latest message, most recent first."""
+    in_conversation = or_(Message.participant_low == user_id, Message.participant_high == user_id)
+    position = func.row_number().over(
+        partition_by=(Message.participant_low, Message.participant_high),
+        order_by=(Message.sent_at.desc(), Message.message_id.desc()),
+    ).label("position")
+    latest = select(Message.message_id, position).where(in_conversation).subquery()
+    statement = (
+        select(Message)
+        .join(latest, latest.c.message_id == Message.message_id)
+        .where(latest.c.position == 1)
+    )
+    page = await paginate(db, statement, Message.sent_at, Message.message_id, cursor=cursor, limit=limit, descending=True)
+    page["items"] = [
+        {
+            "counterpart_id": message.participant_high if message.participant_low == user_id else message.participant_low,
+            "last_message": message,
+        }
+        for message in page["items"]
+    ]
+    return page
+
+async def get_thread(
+    db: AsyncSession,
+    user_id: int,
+    other_user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+) -> dict:
+    """Messages between two users, newest first, from one range of ix_messages_conversation."""
+    key = conversation_participants(user_id, other_user_id)
+    statement = select(Message).where(
+        Message.participant_low == key["participant_low"],
+        Message.participant_high == key["participant_high"],
+    )
+    return await paginate(db, statement, Message.sent_at, Message.message_id, cursor=cursor, limit=limit, descending=True)
@@ -1,47 +1,43 @@
+from typing import Any, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from fastapi import HTTPException
+from app.crud.base import CRUDRepository
+from app.crud.batch import validate_and_insert
+from app.crud.milk_rollup import apply_milk_deltas, milk_deltas
+from app.models.cattle import Cattle
 from app.models.milk_production import MilkProduction
+from app.schema.schemas import MilkProductionCreate
+
+milk_production_repository = CRUDRepository(MilkProduction, "MilkProduction record not found")
 
 async def create_milk_production(db: AsyncSession, obj_in: dict) -> MilkProduction:
-    new_obj = MilkProduction(**obj_in)
-    async with db.begin():
-        db.add(new_obj)
+    obj = await milk_production_repository.create(db, obj_in, commit=False)
+    await apply_milk_deltas(db, milk_deltas([obj]))
     await db.commit()
-    await db.refresh(new_obj)
-    return new_obj
+    return obj
 
 async def get_milk_production(db: AsyncSession, production_id: int) -> MilkProduction:
-    query = select(MilkProduction).filter_by(production_id=production_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="MilkProduction record not found")
-    return obj
+    return await milk_production_repository.get(db, production_id)
 
 async def update_milk_production(db: AsyncSession, production_id: int, obj_in: dict) -> MilkProduction:
-    query = select(MilkProduction).filter_by(production_id=production_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="MilkProduction record not found")
-
-    for key, value in obj_in.items():
-        setattr(obj, key, value)
-
-    async with db.begin():
-        await db.commit()
-        await db.refresh(obj)
+    current = await milk_production_repository.get(db, production_id)
+    removed = milk_deltas([current], sign=-1)
+    obj = await milk_production_repository.update(db, production_id, obj_in, commit=False)
+    await apply_milk_deltas(db, removed + milk_deltas([obj]))
+    await db.commit()
     return obj
 
 async def delete_milk_production(db: AsyncSession, production_id: int) -> MilkProduction:
-    query = select(MilkProduction).filter_by(production_id=production_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="MilkProduction record not found")
-
-    async with db.begin():
-        await db.delete(obj)
-        await db.commit()
+    obj = await milk_production_repository.delete(db, production_id, commit=False)
+    await apply_milk_deltas(db, milk_deltas([obj], sign=-1))
+    await db.commit()
     return obj
+
+async def after_milk_inserted(db: AsyncSession, created: List[MilkProduction]) -> None:
+    await apply_milk_deltas(db, milk_deltas(created))
+
+async def bulk_create_milk_productions(db: AsyncSession, rows: List[Any]) -> dict:
+    """Validate and insert a batch of milk records, reporting bad rows instead of failing the batch."""
+    return await validate_and_insert(
+        db, milk_production_repository, MilkProductionCreate, list(enumerate(rows)),
+        references={"cattle_id": Cattle.cattle_id}, on_inserted=after_milk_inserted,
+    )
@@ -0,0 +1,166 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.crud.lactation import clear_lactation_curves, invalidate_lactation_curves
+from app.models import Cattle, MilkProduction, MilkDailyCattle, MilkDailyFarmer
+from app.schema import schemas
+from app.utills.dialect import upsert_insert
+
+UPSERT_BATCH_SIZE = 1000
+
+# (cattle_id, production_date, volume_delta, record_count_delta)
+MilkDelta = Tuple[int, date, Decimal, int]
+
+
+def milk_deltas(records: Iterable, sign: int = 1) -> List[MilkDelta]:
+    """Deltas for milk rows being added (``sign=1``) or removed (``sign=-1``)."""
+    return [
+        (record.cattle_id, record.production_date, Decimal(str(record.volume)) * sign, sign)
+        for record in records
+    ]
+
+
+async def _upsert_totals(db: AsyncSession, model, key_column: str, totals: dict) -> None:
+    rows = [
+        {key_column: key, "production_date": day, "total_volume": volume, "record_count": count}
+        for (key, day), (volume, count) in totals.items()
+    ]
+    # Multi-row VALUES, batched to stay under the driver's bound-parameter limit
+    for offset in range(0, len(rows), UPSERT_BATCH_SIZE):
+        statement = upsert_insert(db, model).values(rows[offset:offset + UPSERT_BATCH_SIZE])
+        statement = statement.on_conflict_do_update(
+            index_elements=[key_column, "production_date"],
+            set_={
+                "total_volume": model.total_volume + statement.excluded.total_volume,
+                "record_count": model.record_count + statement.excluded.record_count,
+            },
+        )
+        await db.execute(statement)
+    # Days whose last record was removed
+    await db.execute(
+        delete(model)
+        .where(getattr(model, key_column).in_({key for key, _ in totals}), model.record_count <= 0)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def apply_milk_deltas(db: AsyncSession, deltas: List[MilkDelta]) -> None:
+    """Fold milk row changes into the daily rollups inside the caller's transaction."""
+    if not deltas:
+        return
+    per_cattle = defaultdict(lambda: [Decimal(0), 0])
+    for cattle_id, day, volume, count in deltas:
+        per_cattle[(cattle_id, day)][0] += volume
+        per_cattle[(cattle_id, day)][1] += count
+
+    result = await db.execute(
+        select(Cattle.cattle_id, Cattle.user_id).where(Cattle.cattle_id.in_({key[0] for key in per_cattle}))
+    )
+    owners = dict(result.all())
+    invalidate_lactation_curves(owners.values())
+    per_farmer = defaultdict(lambda: [Decimal(0), 0])
+    for (cattle_id, day), (volume, count) in per_cattle.items():
+        farmer_id = owners.get(cattle_id)
+        if farmer_id is not None:
+            per_farmer[(farmer_id, day)][0] += volume
+            per_farmer[(farmer_id, day)][1] += count
+
+    await _upsert_totals(db, MilkDailyCattle, "cattle_id", per_cattle)
+    if per_farmer:
+        await _upsert_totals(db, MilkDailyFarmer, "farmer_id", per_farmer)
+
+
+async def transfer_milk_history(
+    db: AsyncSession, cattle_id: int, from_farmer_id: Optional[int], to_farmer_id: Optional[int]
+) -> None:
+    """Move a cow's daily totals between farmer rollups inside the caller's transaction.
+
+    Farmer totals credit a cow's milk to its current owner, as
+    ``rebuild_milk_rollups`` does, so a change of owner carries the history along
+    and later edits to older records adjust the new owner's days.
+    """
+    if from_farmer_id == to_farmer_id:
+        return
+    result = await db.execute(
+        select(MilkDailyCattle.production_date, MilkDailyCattle.total_volume, MilkDailyCattle.record_count)
+        .where(MilkDailyCattle.cattle_id == cattle_id)
+    )
+    totals = {}
+    for day, volume, count in result.all():
+        if from_farmer_id is not None:
+            totals[(from_farmer_id, day)] = (-volume, -count)
+        if to_farmer_id is not None:
+            totals[(to_farmer_id, day)] = (volume, count)
+    if totals:
+        await _upsert_totals(db, MilkDailyFarmer, "farmer_id", totals)
+
+
+async def rebuild_milk_rollups(db: AsyncSession) -> None:
+    """Recompute both rollups from milk_production; farmer totals use each cow's current owner."""
+    await db.execute(delete(MilkDailyCattle).execution_options(synchronize_session=False))
+    await db.execute(delete(MilkDailyFarmer).execution_options(synchronize_session=False))
+    await db.execute(insert(MilkDailyCattle).from_select(
+        ["cattle_id", "production_date", "total_volume", "record_count"],
+        select(
+            MilkProduction.cattle_id, MilkProduction.production_date,
+            func.sum(MilkProduction.volume), func.count(),
+        ).group_by(MilkProduction.cattle_id, MilkProduction.production_date),
+    ))
+    await db.execute(insert(MilkDailyFarmer).from_select(
+        ["farmer_id", "production_date", "total_volume", "record_count"],
+        select(
+            Cattle.user_id, MilkDailyCattle.production_date,
+            func.sum(MilkDailyCattle.total_volume), func.sum(MilkDailyCattle.record_count),
+        )
+        .join(Cattle, Cattle.cattle_id == MilkDailyCattle.cattle_id)
+        .where(Cattle.user_id.is_not(None))
+        .group_by(Cattle.user_id, MilkDailyCattle.production_date),
+    ))
+    await db.commit()
+    clear_lactation_curves()
+
+
+def _period_start(day: date, granularity: schemas.MilkGranularity) -> date:
+    if granularity == schemas.MilkGranularity.week:
+        return day - timedelta(days=day.weekday())
+    if granularity == schemas.MilkGranularity.month:
+        return day.replace(day=1)
+    return day
+
+
+async def get_milk_aggregates(
+    db: AsyncSession,
+    model,
+    key_column: str,
+    key: int,
+    granularity: schemas.MilkGranularity = schemas.MilkGranularity.day,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> List[dict]:
+    """Totals per day, ISO week or month, read from the daily rollup (one row per day at most)."""
+    statement = (
+        select(model.production_date, model.total_volume, model.record_count)
+        .where(getattr(model, key_column) == key)
+        .order_by(model.production_date)
+    )
+    if start is not None:
+        statement = statement.where(model.production_date >= start)
+    if end is not None:
+        statement = statement.where(model.production_date <= end)
+    result = await db.execute(statement)
+
+    periods = {}
+    for day, volume, count in result.all():
+        period_start = _period_start(day, granularity)
+        period = periods.setdefault(
+            period_start, {"period_start": period_start, "total_volume": Decimal(0), "record_count": 0}
+        )
+        period["total_volume"] += volume
+        period["record_count"] += count
+    return list(periods.values())
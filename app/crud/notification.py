@@ -1,47 +1,111 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from fastapi import HTTPException
+from app.crud.base import CRUDRepository
+from app.models.database import SessionLocal
 from app.models.notification import Notification
+from app.utills.cache import TTLCache
+from app.utills.pagination import paginate
+from app.utills.pubsub import Broker
+
+notification_repository = CRUDRepository(Notification, "Notification record not found")
+
+UNREAD_CACHE_SECONDS = 300
+
+# user_id -> queues of connected notification streams
+notification_broker = Broker()
+# user_id -> unread count; adjusted on writes, recounted when missing or expired
+_unread_counts = TTLCache(ttl_seconds=UNREAD_CACHE_SECONDS)
+
+def notification_payload(obj: Notification) -> dict:
+    return {
+        "notification_id": obj.notification_id,
+        "user_id": obj.user_id,
+        "message": obj.message,
+        "created_at": obj.created_at.isoformat() if obj.created_at else None,
+        "read_at": obj.read_at.isoformat() if obj.read_at else None,
+    }
+
+def _adjust_unread(user_id: Optional[int], delta: int) -> None:
+    count = _unread_counts.get(user_id)
+    if count is not None:
+        _unread_counts.set(user_id, max(count + delta, 0))
+
+def invalidate_unread_counts(user_ids) -> None:
+    _unread_counts.invalidate(user_ids)
+
+async def get_unread_count(user_id: int) -> int:
+    """Cached unread count; a miss counts on the primary so replica lag is never cached."""
+    count = _unread_counts.get(user_id)
+    if count is None:
+        async with SessionLocal() as db:
+            count = await db.scalar(
+                select(func.count()).select_from(Notification)
+                .where(Notification.user_id == user_id, Notification.read_at.is_(None))
+            )
+        _unread_counts.set(user_id, count)
+    return count
 
 async def create_notification(db: AsyncSession, obj_in: dict) -> Notification:
-    new_obj = Notification(**obj_in)
-    async with db.begin():
-        db.add(new_obj)
-    await db.commit()
-    await db.refresh(new_obj)
-    return new_obj
+    if obj_in.get("created_at") is None:
+        obj_in = {key: value for key, value in obj_in.items() if key != "created_at"}
+    obj = await notification_repository.create(db, obj_in)
+    if obj.read_at is None:
+        _adjust_unread(obj.user_id, 1)
+    notification_broker.publish(obj.user_id, notification_payload(obj))
+    return obj
 
 async def get_notification(db: AsyncSession, notification_id: int) -> Notification:
-    query = select(Notification).filter_by(notification_id=notification_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Notification record not found")
-    return obj
+    return await notification_repository.get(db, notification_id)
 
 async def update_notification(db: AsyncSession, notification_id: int, obj_in: dict) -> Notification:
-    query = select(Notification).filter_by(notification_id=notification_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Notification record not found")
-
-    for key, value in obj_in.items():
-        setattr(obj, key, value)
-
-    async with db.begin():
-        await db.commit()
-        await db.refresh(obj)
+    current = await notification_repository.get(db, notification_id)
+    previous_user_id, was_unread = current.user_id, current.read_at is None
+    obj = await notification_repository.update(db, notification_id, obj_in)
+    if obj.user_id != previous_user_id:
+        invalidate_unread_counts([previous_user_id, obj.user_id])
+    elif was_unread != (obj.read_at is None):
+        _adjust_unread(obj.user_id, 1 if obj.read_at is None else -1)
     return obj
 
 async def delete_notification(db: AsyncSession, notification_id: int) -> Notification:
-    query = select(Notification).filter_by(notification_id=notification_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Notification record not found")
-
-    async with db.begin():
-        await db.delete(obj)
-        await db.commit()
+    obj = await notification_repository.delete(db, notification_id)
+    if obj.read_at is None:
+        _adjust_unread(obj.user_id, -1)
     return obj
+
+async def get_inbox(
+    db: AsyncSession,
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    unread_only: bool = False,
+) -> dict:
+    """A user's notifications, newest first, keyset-paginated on ``(created_at, notification_id)``."""
+    statement = select(Notification).where(Notification.user_id == user_id)
+    if unread_only:
+        statement = statement.where(Notification.read_at.is_(None))
+    return await paginate(
+        db, statement, Notification.created_at, Notification.notification_id,
+        cursor=cursor, limit=limit, descending=True,
+    )
+
+async def mark_notifications_read(db: AsyncSession, user_id: int, notification_ids: Optional[List[int]] = None) -> int:
+    """Mark the given notifications, or all of the user's, as read with one UPDATE; returns how many changed."""
+    statement = (
+        update(Notification)
+        .where(Notification.user_id == user_id, Notification.read_at.is_(None))
+        .values(read_at=datetime.now())
+        .execution_options(synchronize_session=False)
+    )
+    if notification_ids is not None:
+        statement = statement.where(Notification.notification_id.in_(set(notification_ids)))
+    result = await db.execute(statement)
+    await db.commit()
+    if notification_ids is None:
+        _unread_counts.set(user_id, 0)
+    else:
+        _adjust_unread(user_id, -result.rowcount)
+    return result.rowcount
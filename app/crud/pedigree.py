@@ -1,47 +1,181 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import literal, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from fastapi import HTTPException
+from sqlalchemy.orm import aliased
+from app.crud.base import CRUDRepository
+from app.crud.cattle import cattle_repository
+from app.models.cattle import Cattle
 from app.models.pedigree import Pedigree
+from app.utills.kinship import KinshipCalculator, PedigreeCycleError
+
+pedigree_repository = CRUDRepository(Pedigree, "Pedigree record not found")
+
+MAX_GENERATIONS = 10
+
+def _cycle_error(cattle_id: int) -> HTTPException:
+    return HTTPException(status_code=409, detail=f"Pedigree would make cattle {cattle_id} its own ancestor")
+
+async def _check_not_own_ancestor(db: AsyncSession, cattle_id: int, dam_id: Optional[int], sire_id: Optional[int]) -> None:
+    """Reject parents that are the animal itself or already descend from it."""
+    parent_ids = {dam_id, sire_id} - {None}
+    if cattle_id in parent_ids:
+        raise _cycle_error(cattle_id)
+    if not parent_ids:
+        return
+    lineage = await load_lineage(db, parent_ids)
+    ancestors = {parent_id for pair in lineage.values() for parent_id in pair if parent_id is not None}
+    if cattle_id in ancestors:
+        raise _cycle_error(cattle_id)
 
 async def create_pedigree(db: AsyncSession, obj_in: dict) -> Pedigree:
-    new_obj = Pedigree(**obj_in)
-    async with db.begin():
-        db.add(new_obj)
-    await db.commit()
-    await db.refresh(new_obj)
-    return new_obj
+    await _check_not_own_ancestor(db, obj_in["cattle_id"], obj_in.get("dam_id"), obj_in.get("sire_id"))
+    return await pedigree_repository.create(db, obj_in)
 
 async def get_pedigree(db: AsyncSession, pedigree_id: int) -> Pedigree:
-    query = select(Pedigree).filter_by(id=pedigree_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Pedigree record not found")
-    return obj
+    return await pedigree_repository.get(db, pedigree_id)
 
 async def update_pedigree(db: AsyncSession, pedigree_id: int, obj_in: dict) -> Pedigree:
-    query = select(Pedigree).filter_by(id=pedigree_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Pedigree record not found")
+    current = await pedigree_repository.get(db, pedigree_id)
+    await _check_not_own_ancestor(
+        db,
+        obj_in.get("cattle_id", current.cattle_id),
+        obj_in.get("dam_id", current.dam_id),
+        obj_in.get("sire_id", current.sire_id),
+    )
+    return await pedigree_repository.update(db, pedigree_id, obj_in)
 
-    for key, value in obj_in.items():
-        setattr(obj, key, value)
+async def delete_pedigree(db: AsyncSession, pedigree_id: int) -> Pedigree:
+    return await pedigree_repository.delete(db, pedigree_id)
 
-    async with db.begin():
-        await db.commit()
-        await db.refresh(obj)
-    return obj
+async def _cattle_summaries(db: AsyncSession, cattle_ids: Iterable[int]) -> Dict[int, dict]:
+    result = await db.execute(
+        select(Cattle.cattle_id, Cattle.name, Cattle.breed, Cattle.gender)
+        .where(Cattle.cattle_id.in_(set(cattle_ids)))
+    )
+    return {
+        cattle_id: {"cattle_id": cattle_id, "name": name, "breed": breed, "gender": gender.value if gender else None}
+        for cattle_id, name, breed, gender in result.all()
+    }
 
-async def delete_pedigree(db: AsyncSession, pedigree_id: int) -> Pedigree:
-    query = select(Pedigree).filter_by(id=pedigree_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Pedigree record not found")
-
-    async with db.begin():
-        await db.delete(obj)
-        await db.commit()
-    return obj
+async def get_ancestor_tree(db: AsyncSession, cattle_id: int, generations: int = 3) -> dict:
+    """Dam/sire tree ``generations`` deep, loaded with one recursive CTE."""
+    await cattle_repository.get(db, cattle_id)
+    ancestors = (
+        select(Pedigree.cattle_id, Pedigree.dam_id, Pedigree.sire_id, literal(1).label("depth"))
+        .where(Pedigree.cattle_id == cattle_id)
+        .cte("ancestors", recursive=True)
+    )
+    parent = aliased(Pedigree)
+    ancestors = ancestors.union_all(
+        select(parent.cattle_id, parent.dam_id, parent.sire_id, ancestors.c.depth + 1)
+        .join(ancestors, or_(parent.cattle_id == ancestors.c.dam_id, parent.cattle_id == ancestors.c.sire_id))
+        .where(ancestors.c.depth < generations)
+    )
+    result = await db.execute(select(ancestors.c.cattle_id, ancestors.c.dam_id, ancestors.c.sire_id).distinct())
+    parents: Dict[int, Tuple[Optional[int], Optional[int]]] = {}
+    for child_id, dam_id, sire_id in result.all():
+        parents.setdefault(child_id, (dam_id, sire_id))
+
+    ids = {cattle_id} | {parent_id for pair in parents.values() for parent_id in pair if parent_id is not None}
+    summaries = await _cattle_summaries(db, ids)
+
+    def build(node_id: Optional[int], depth: int) -> Optional[dict]:
+        if node_id is None:
+            return None
+        node = dict(summaries.get(node_id, {"cattle_id": node_id}))
+        if depth < generations and node_id in parents:
+            dam_id, sire_id = parents[node_id]
+            node["dam"] = build(dam_id, depth + 1)
+            node["sire"] = build(sire_id, depth + 1)
+        return node
+
+    return build(cattle_id, 0)
+
+async def get_descendant_tree(db: AsyncSession, cattle_id: int, generations: int = 3) -> dict:
+    """Offspring tree ``generations`` deep, loaded with one recursive CTE."""
+    await cattle_repository.get(db, cattle_id)
+    descendants = (
+        select(Pedigree.cattle_id, Pedigree.dam_id, Pedigree.sire_id, literal(1).label("depth"))
+        .where(or_(Pedigree.dam_id == cattle_id, Pedigree.sire_id == cattle_id))
+        .cte("descendants", recursive=True)
+    )
+    child = aliased(Pedigree)
+    descendants = descendants.union_all(
+        select(child.cattle_id, child.dam_id, child.sire_id, descendants.c.depth + 1)
+        .join(descendants, or_(child.dam_id == descendants.c.cattle_id, child.sire_id == descendants.c.cattle_id))
+        .where(descendants.c.depth < generations)
+    )
+    result = await db.execute(
+        select(descendants.c.cattle_id, descendants.c.dam_id, descendants.c.sire_id).distinct()
+    )
+    children: Dict[int, set] = {}
+    for child_id, dam_id, sire_id in result.all():
+        for parent_id in {dam_id, sire_id} - {None}:
+            children.setdefault(parent_id, set()).add(child_id)
+
+    ids = {cattle_id} | {child_id for kids in children.values() for child_id in kids}
+    summaries = await _cattle_summaries(db, ids)
+
+    def build(node_id: int, depth: int) -> dict:
+        node = dict(summaries.get(node_id, {"cattle_id": node_id}))
+        node["children"] = [
+            build(child_id, depth + 1) for child_id in sorted(children.get(node_id, ()))
+        ] if depth < generations else []
+        return node
+
+    return build(cattle_id, 0)
+
+async def load_lineage(db: AsyncSession, cattle_ids: Iterable[int]) -> Dict[int, Tuple[Optional[int], Optional[int]]]:
+    """``{cattle_id: (dam_id, sire_id)}`` for the given animals and all their recorded ancestors.
+
+    One recursive CTE; UNION rather than UNION ALL so a cyclic (bad) record
+    cannot make it loop.
+    """
+    lineage = (
+        select(Pedigree.cattle_id, Pedigree.dam_id, Pedigree.sire_id)
+        .where(Pedigree.cattle_id.in_(set(cattle_ids)))
+        .cte("lineage", recursive=True)
+    )
+    parent = aliased(Pedigree)
+    lineage = lineage.union(
+        select(parent.cattle_id, parent.dam_id, parent.sire_id)
+        .join(lineage, or_(parent.cattle_id == lineage.c.dam_id, parent.cattle_id == lineage.c.sire_id))
+    )
+    result = await db.execute(select(lineage.c.cattle_id, lineage.c.dam_id, lineage.c.sire_id))
+    parents = {}
+    for child_id, dam_id, sire_id in result.all():
+        parents.setdefault(child_id, (dam_id, sire_id))
+    return parents
+
+async def get_inbreeding(db: AsyncSession, cattle_id: int) -> dict:
+    await cattle_repository.get(db, cattle_id)
+    calculator = KinshipCalculator(await load_lineage(db, [cattle_id]))
+    try:
+        return {"cattle_id": cattle_id, "inbreeding": calculator.inbreeding(cattle_id)}
+    except PedigreeCycleError as exc:
+        raise _cycle_error(exc.animal) from exc
+
+async def score_candidate_sires(db: AsyncSession, cattle_id: int, candidate_ids: List[int]) -> dict:
+    """Kinship between a cow and each candidate bull, lowest first.
+
+    The kinship of a pair is the inbreeding coefficient their calf would have.
+    """
+    await cattle_repository.get(db, cattle_id)
+    candidate_ids = list(dict.fromkeys(candidate_ids))
+    calculator = KinshipCalculator(await load_lineage(db, [cattle_id, *candidate_ids]))
+    try:
+        scores = calculator.score(cattle_id, candidate_ids)
+        inbreeding = calculator.inbreeding(cattle_id)
+    except PedigreeCycleError as exc:
+        # Records written before cycles were rejected on write
+        raise _cycle_error(exc.animal) from exc
+    return {
+        "cattle_id": cattle_id,
+        "inbreeding": inbreeding,
+        "candidates": [
+            {"cattle_id": candidate_id, "kinship": kinship}
+            for candidate_id, kinship in sorted(scores.items(), key=lambda item: (item[1], item[0]))
+        ],
+    }
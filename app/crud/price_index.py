@@ -0,0 +1,160 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models import Cattle, Location, PriceIndex, Trade
+from app.utills.dialect import upsert_insert
+
+PRICE_WINDOWS = (30, 90, 365)
+UNKNOWN = "unknown"
+# (upper bound in months, label); the last band is open-ended
+AGE_BANDS = ((12, "0-12m"), (24, "12-24m"), (48, "24-48m"), (None, "48m+"))
+
+Bucket = Tuple[str, str, str]
+BUCKET_KEYS = ["breed", "age_band", "climate_zone", "window_days"]
+
+
+def _seller_climate_zone():
+    """Climate zone of the seller's most recently updated location."""
+    return (
+        select(Location.climate_zone)
+        .where(Location.farmer_id == Trade.seller_id)
+        .order_by(Location.updated_at.desc().nulls_last(), Location.location_id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def age_band_for(birth_date: Optional[date], on: date) -> str:
+    if birth_date is None:
+        return UNKNOWN
+    months = (on.year - birth_date.year) * 12 + on.month - birth_date.month - (on.day < birth_date.day)
+    for upper, label in AGE_BANDS:
+        if upper is None or months < upper:
+            return label
+    return UNKNOWN
+
+
+async def _observations(db: AsyncSession, since: datetime, breed: Optional[str] = None, climate_zone: Optional[str] = None):
+    """``(bucket, trade_date, price)`` for trades since ``since``, optionally narrowed to one breed and zone."""
+    zone = _seller_climate_zone()
+    statement = (
+        select(Cattle.breed, Cattle.birth_date, zone, Trade.trade_date, Trade.price)
+        .join(Cattle, Cattle.cattle_id == Trade.cattle_id)
+        .where(Trade.trade_date >= since)
+    )
+    if breed is not None:
+        statement = statement.where(Cattle.breed.is_(None) if breed == UNKNOWN else Cattle.breed == breed)
+    if climate_zone is not None:
+        statement = statement.where(zone.is_(None) if climate_zone == UNKNOWN else zone == climate_zone)
+    result = await db.execute(statement)
+    return [
+        ((breed or UNKNOWN, age_band_for(birth_date, traded.date()), zone or UNKNOWN), traded, float(price))
+        for breed, birth_date, zone, traded, price in result.all()
+    ]
+
+
+def _index_rows(observations, now: datetime) -> List[dict]:
+    """One row per bucket and window that saw at least one trade."""
+    prices: Dict[Tuple[Bucket, int], List[float]] = defaultdict(list)
+    for bucket, traded, price in observations:
+        for window in PRICE_WINDOWS:
+            if traded >= now - timedelta(days=window):
+                prices[(bucket, window)].append(price)
+    rows = []
+    for ((breed, band, zone), window), values in prices.items():
+        p25, median, p75 = np.percentile(values, [25, 50, 75])
+        rows.append({
+            "breed": breed, "age_band": band, "climate_zone": zone, "window_days": window,
+            "trade_count": len(values),
+            "p25_price": round(float(p25), 2),
+            "median_price": round(float(median), 2),
+            "p75_price": round(float(p75), 2),
+            "mean_price": round(float(np.mean(values)), 2),
+            "refreshed_at": now,
+        })
+    return rows
+
+
+async def price_bucket_of(db: AsyncSession, trade_id: int) -> Optional[Bucket]:
+    """The (breed, age band, climate zone) a stored trade counts towards, or None if it is gone."""
+    row = (await db.execute(
+        select(Cattle.breed, Cattle.birth_date, _seller_climate_zone(), Trade.trade_date)
+        .select_from(Trade)
+        .join(Cattle, Cattle.cattle_id == Trade.cattle_id)
+        .where(Trade.trade_id == trade_id)
+    )).first()
+    if row is None:
+        return None
+    breed, birth_date, zone, traded = row
+    traded = traded or datetime.now()
+    return breed or UNKNOWN, age_band_for(birth_date, traded.date()), zone or UNKNOWN
+
+
+async def refresh_price_buckets(db: AsyncSession, buckets: Iterable[Optional[Bucket]]) -> None:
+    """Recompute the index rows of the given buckets; runs in the caller's transaction."""
+    now = datetime.now()
+    for bucket in {bucket for bucket in buckets if bucket is not None}:
+        # Reload only the bucket's breed and zone, then keep its age band
+        observations = [
+            observation
+            for observation in await _observations(db, now - timedelta(days=max(PRICE_WINDOWS)), bucket[0], bucket[2])
+            if observation[0] == bucket
+        ]
+        rows = _index_rows(observations, now)
+        if rows:
+            statement = upsert_insert(db, PriceIndex).values(rows)
+            statement = statement.on_conflict_do_update(
+                index_elements=BUCKET_KEYS,
+                set_={column: getattr(statement.excluded, column) for column in rows[0] if column not in BUCKET_KEYS},
+            )
+            await db.execute(statement)
+        # Windows the bucket has no trades in any more
+        await db.execute(
+            delete(PriceIndex)
+            .where(
+                PriceIndex.breed == bucket[0], PriceIndex.age_band == bucket[1], PriceIndex.climate_zone == bucket[2],
+                PriceIndex.window_days.not_in({row["window_days"] for row in rows} or {0}),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def refresh_price_bucket(db: AsyncSession, trade: Trade) -> None:
+    """Recompute the index rows of the bucket a new trade falls into; runs in the caller's transaction."""
+    await refresh_price_buckets(db, [await price_bucket_of(db, trade.trade_id)])
+
+
+async def rebuild_price_index(db: AsyncSession) -> None:
+    """Recompute the whole index; run daily so windows roll forward on buckets without new sales."""
+    now = datetime.now()
+    rows = _index_rows(await _observations(db, now - timedelta(days=max(PRICE_WINDOWS))), now)
+    await db.execute(delete(PriceIndex).execution_options(synchronize_session=False))
+    if rows:
+        await db.execute(insert(PriceIndex), rows)
+    await db.commit()
+
+
+async def get_price_index(
+    db: AsyncSession,
+    breed: str,
+    climate_zone: Optional[str] = None,
+    age_band: Optional[str] = None,
+    window_days: Optional[int] = None,
+) -> List[PriceIndex]:
+    statement = select(PriceIndex).where(PriceIndex.breed == breed)
+    if climate_zone is not None:
+        statement = statement.where(PriceIndex.climate_zone == climate_zone)
+    if age_band is not None:
+        statement = statement.where(PriceIndex.age_band == age_band)
+    if window_days is not None:
+        statement = statement.where(PriceIndex.window_days == window_days)
+    result = await db.execute(
+        statement.order_by(PriceIndex.climate_zone, PriceIndex.age_band, PriceIndex.window_days)
+    )
+    return result.scalars().all()
@@ -0,0 +1,100 @@
+import re
+from typing import Iterable, List, Optional
+
+from sqlalchemy import Float, BigInteger, delete, insert, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models import Cattle, User, CattleSearchDocument
+from app.models.cattle import CattleStatusEnum
+from app.schema import schemas
+
+MAX_QUERY_TERMS = 8
+
+
+def _document_source():
+    """SELECT producing (cattle_id, document) for listings, joined to the seller."""
+    document = (
+        func.coalesce(Cattle.name, "") + " " + func.coalesce(Cattle.breed, "") + " "
+        + func.coalesce(User.username, "") + " " + func.coalesce(User.address, "")
+    )
+    return (
+        select(Cattle.cattle_id, document)
+        .select_from(Cattle)
+        .outerjoin(User, User.user_id == Cattle.user_id)
+    )
+
+
+async def refresh_cattle_documents(
+    db: AsyncSession,
+    cattle_ids: Optional[Iterable[int]] = None,
+    user_id: Optional[int] = None,
+) -> None:
+    """Rewrite the search documents of the given listings, or of every listing a seller owns.
+
+    Runs inside the caller's transaction; the caller commits.
+    """
+    source = _document_source()
+    if cattle_ids is not None:
+        cattle_ids = list(cattle_ids)
+        if not cattle_ids:
+            return
+        source = source.where(Cattle.cattle_id.in_(cattle_ids))
+        stale = CattleSearchDocument.cattle_id.in_(cattle_ids)
+    elif user_id is not None:
+        source = source.where(Cattle.user_id == user_id)
+        stale = CattleSearchDocument.cattle_id.in_(select(Cattle.cattle_id).where(Cattle.user_id == user_id))
+    else:
+        raise ValueError("cattle_ids or user_id is required")
+    await db.execute(delete(CattleSearchDocument).where(stale).execution_options(synchronize_session=False))
+    await db.execute(insert(CattleSearchDocument).from_select(["cattle_id", "document"], source))
+
+
+async def rebuild_cattle_documents(db: AsyncSession) -> None:
+    """Regenerate every search document, e.g. after a bulk load outside the API."""
+    await db.execute(delete(CattleSearchDocument).execution_options(synchronize_session=False))
+    await db.execute(insert(CattleSearchDocument).from_select(["cattle_id", "document"], _document_source()))
+    await db.commit()
+
+
+def _terms(query: str) -> List[str]:
+    return re.findall(r"\w+", query.lower())[:MAX_QUERY_TERMS]
+
+
+async def search_cattle(
+    db: AsyncSession,
+    query: str,
+    limit: int = 20,
+    status: Optional[schemas.CattleStatusEnum] = None,
+) -> List[dict]:
+    """Rank listings that match every search term, each treated as a prefix."""
+    terms = _terms(query)
+    if not terms:
+        return []
+
+    if db.get_bind().dialect.name == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        hits = (
+            text("SELECT rowid AS cattle_id, bm25(cattle_search_fts) AS score "
+                 "FROM cattle_search_fts WHERE cattle_search_fts MATCH :match")
+            .bindparams(match=match)
+            .columns(cattle_id=BigInteger, score=Float)
+            .subquery()
+        )
+        # bm25 is lower-is-better; negate so both backends rank descending
+        rank = (-hits.c.score).label("rank")
+        statement = select(Cattle, rank).join(hits, hits.c.cattle_id == Cattle.cattle_id)
+    else:
+        vector = func.to_tsvector("english", CattleSearchDocument.document)
+        ts_query = func.to_tsquery("english", " & ".join(f"{term}:*" for term in terms))
+        rank = func.ts_rank(vector, ts_query).label("rank")
+        statement = (
+            select(Cattle, rank)
+            .join(CattleSearchDocument, CattleSearchDocument.cattle_id == Cattle.cattle_id)
+            .where(vector.op("@@")(ts_query))
+        )
+
+    if status is not None:
+        statement = statement.where(Cattle.status == CattleStatusEnum[status.name])
+    result = await db.execute(statement.order_by(rank.desc(), Cattle.cattle_id).limit(limit))
+    return [{"cattle": cattle, "rank": float(score)} for cattle, score in result.all()]
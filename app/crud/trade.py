@@ -1,47 +1,98 @@
+from datetime import date
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from fastapi import HTTPException
+from app.crud.base import CRUDRepository
+from app.crud.cattle_ownership_history import cattle_ownership_history_repository
+from app.crud.lactation import invalidate_lactation_curves
+from app.crud.milk_rollup import transfer_milk_history
+from app.crud.price_index import price_bucket_of, refresh_price_bucket, refresh_price_buckets
+from app.crud.search import refresh_cattle_documents
+from app.models.cattle import Cattle, CattleStatusEnum
 from app.models.trade import Trade
+from app.models.user import User
+
+trade_repository = CRUDRepository(Trade, "Trade record not found")
+
+# Every trade write refreshes the price index buckets it leaves and enters
 
 async def create_trade(db: AsyncSession, obj_in: dict) -> Trade:
-    new_obj = Trade(**obj_in)
-    async with db.begin():
-        db.add(new_obj)
+    obj = await trade_repository.create(db, obj_in, commit=False)
+    await refresh_price_bucket(db, obj)
     await db.commit()
-    await db.refresh(new_obj)
-    return new_obj
+    return obj
 
 async def get_trade(db: AsyncSession, trade_id: int) -> Trade:
-    query = select(Trade).filter_by(trade_id=trade_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Trade record not found")
-    return obj
+    return await trade_repository.get(db, trade_id)
 
 async def update_trade(db: AsyncSession, trade_id: int, obj_in: dict) -> Trade:
-    query = select(Trade).filter_by(trade_id=trade_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Trade record not found")
-
-    for key, value in obj_in.items():
-        setattr(obj, key, value)
-
-    async with db.begin():
-        await db.commit()
-        await db.refresh(obj)
+    previous = await price_bucket_of(db, trade_id)
+    obj = await trade_repository.update(db, trade_id, obj_in, commit=False)
+    await refresh_price_buckets(db, [previous, await price_bucket_of(db, trade_id)])
+    await db.commit()
     return obj
 
 async def delete_trade(db: AsyncSession, trade_id: int) -> Trade:
-    query = select(Trade).filter_by(trade_id=trade_id)
-    result = await db.execute(query)
-    obj = result.scalars().first()
-    if obj is None:
-        raise HTTPException(status_code=404, detail="Trade record not found")
-
-    async with db.begin():
-        await db.delete(obj)
-        await db.commit()
+    previous = await price_bucket_of(db, trade_id)
+    obj = await trade_repository.delete(db, trade_id, commit=False)
+    await refresh_price_buckets(db, [previous])
+    await db.commit()
     return obj
+
+def _already_sold() -> HTTPException:
+    return HTTPException(status_code=409, detail="Cattle is no longer available for sale")
+
+async def sell_cattle(db: AsyncSession, cattle_id: int, buyer_id: int, price: float) -> dict:
+    """Sell an available animal: mark it sold to the buyer, record the trade and the ownership change,
+    and move the cow's milk history to the buyer's daily totals.
+
+    All writes share one transaction. The cattle row is locked with SELECT ...
+    FOR UPDATE, and the status change is conditional on the animal still being
+    Available, so of several concurrent buyers exactly one succeeds and the
+    rest get a 409.
+    """
+    result = await db.execute(
+        select(Cattle.user_id, Cattle.status).where(Cattle.cattle_id == cattle_id).with_for_update()
+    )
+    listing = result.first()
+    if listing is None:
+        raise HTTPException(status_code=404, detail="Cattle not found")
+    seller_id, status = listing
+    if status != CattleStatusEnum.Available or seller_id is None:
+        await db.rollback()
+        raise _already_sold()
+    if seller_id == buyer_id:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Buyer already owns this cattle")
+    if (await db.execute(select(User.user_id).where(User.user_id == buyer_id))).first() is None:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Buyer not found")
+
+    # Guards backends without row locks (SQLite): the losing writer matches no row
+    claimed = await db.execute(
+        update(Cattle)
+        .where(Cattle.cattle_id == cattle_id, Cattle.status == CattleStatusEnum.Available, Cattle.user_id == seller_id)
+        .values(status=CattleStatusEnum.Sold, user_id=buyer_id)
+        .execution_options(synchronize_session=False)
+    )
+    if claimed.rowcount != 1:
+        await db.rollback()
+        raise _already_sold()
+
+    trade = await trade_repository.create(
+        db, {"seller_id": seller_id, "buyer_id": buyer_id, "cattle_id": cattle_id, "price": price}, commit=False
+    )
+    ownership = await cattle_ownership_history_repository.create(db, {
+        "cattle_id": cattle_id,
+        "previous_owner_id": seller_id,
+        "new_owner_id": buyer_id,
+        "ownership_change_date": date.today(),
+    }, commit=False)
+    # The listing's search document carries the seller's name and address
+    await refresh_cattle_documents(db, [cattle_id])
+    await refresh_price_bucket(db, trade)
+    await transfer_milk_history(db, cattle_id, seller_id, buyer_id)
+    await db.commit()
+    invalidate_lactation_curves([seller_id, buyer_id])
+    return {"trade": trade, "ownership": ownership}
@@ -6,17 +6,19 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy import delete
+from sqlalchemy.orm import lazyload
 from app import models
 from app.models import User
 from app.models.database import get_db, Base
 from app.schema import schemas
 from passlib.context import CryptContext
-from typing import Optional, List
+from typing import Optional
 from fastapi import HTTPException, Depends, status
 from typing import Type, Dict, Any
 
 from app.schema.schemas import UserResponse
 from app.utills.TransactionManager import TransactionManager
+from app.utills.pagination import paginate
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -170,12 +172,16 @@ async def delete_user(db: AsyncSession, user_id: int) -> Optional[schemas.User]:
             raise HTTPException(status_code=500, detail="An error occurred while deleting the user.")
 
 
-async def get_all_users(db: AsyncSession) -> List[schemas.User]:
-    """Fetch all users."""
+async def get_all_users(db: AsyncSession, cursor: Optional[str] = None, limit: int = 50) -> dict:
+    """Fetch a page of users ordered by id."""
     try:
-        result = await db.execute(select(models.User))
-        users = result.scalars().all()
-        return [schemas.User.from_orm(user) for user in users]
+        # The trade collections are not part of the response, so skip their eager joins
+        statement = select(models.User).options(lazyload("*"))
+        page = await paginate(db, statement, models.User.user_id, models.User.user_id, cursor=cursor, limit=limit)
+        page["items"] = [schemas.User.from_orm(user) for user in page["items"]]
+        return page
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching all users: {e}")
         raise HTTPException(status_code=500, detail="An error occurred while fetching users.")
\ No newline at end of file
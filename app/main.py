@@ -3,9 +3,13 @@ from app.routers import (
     user, cattle, messaging, cattle_image,
     calving, cattle_ownership_history, favorite,
     insemination, milk_production, notification,
-    pedigree, chatbot
+    pedigree, chatbot, health, herd_import, export,
+    weight_record, breeding, trade
 )
 from app.models.database import Base, engine
+from app.config.appsettings import settings
+from app.utills.outbound import outbound_dispatcher
+from app.utills.inbound import inbound_writer
 from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
@@ -14,7 +18,12 @@ async def lifespan_manager(app: FastAPI) -> AsyncIterator[None]:
     """Handle the lifespan of the application, including database setup and teardown."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    await inbound_writer.start()
+    if settings.outbound_workers > 0:
+        await outbound_dispatcher.start()
     yield
+    await outbound_dispatcher.stop()
+    await inbound_writer.stop()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
 
@@ -24,6 +33,7 @@ app = FastAPI(lifespan=lifespan_manager)
 app.include_router(user.router, prefix="/users", tags=["users"])
 app.include_router(cattle.router, prefix="/cattle", tags=["cattle"])
 app.include_router(chatbot.router, prefix="/messaging", tags=["messaging"])
+app.include_router(messaging.router, prefix="/messaging", tags=["messaging"])
 app.include_router(cattle_image.router, prefix="/images", tags=["images"])
 app.include_router(calving.router, prefix="/calving", tags=["calving"])
 app.include_router(cattle_ownership_history.router, prefix="/cattle_ownership_histories", tags=["cattle_ownership_histories"])
@@ -31,4 +41,10 @@ app.include_router(favorite.router, prefix="/favorite", tags=["favorite"])
 app.include_router(insemination.router, prefix="/insemination", tags=["insemination"])
 app.include_router(notification.router, prefix="/notification", tags=["notification"])
 app.include_router(milk_production.router, prefix="/milk", tags=["milk"])
-app.include_router(pedigree.router, prefix="/pedigree", tags=["pedigree"])
\ No newline at end of file
+app.include_router(pedigree.router, prefix="/pedigree", tags=["pedigree"])
+app.include_router(health.router, prefix="/health", tags=["health"])
+app.include_router(herd_import.router, prefix="/import", tags=["import"])
+app.include_router(export.router, prefix="/export", tags=["export"])
+app.include_router(weight_record.router, prefix="/weight", tags=["weight"])
+app.include_router(breeding.router, prefix="/breeding", tags=["breeding"])
+app.include_router(trade.router, prefix="/trade", tags=["trade"])
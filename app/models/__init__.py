@@ -12,3 +12,9 @@ from .trade import Trade
 from .message import Message
 from .weight_record import WeightRecord
 from .user import UserRole
+from .cattle_search import CattleSearchDocument
+from .milk_rollup import MilkDailyCattle, MilkDailyFarmer
+from .breeding_schedule import BreedingSchedule
+from .price_index import PriceIndex
+from .outbound_message import OutboundMessage, OutboundStatus
+from .inbound_receipt import InboundReceipt
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, BigInteger, Date, ForeignKey, Index
+from .database import Base
+
+class BreedingSchedule(Base):
+    """Upcoming breeding dates per cow, recomputed from its latest insemination and calving."""
+    __tablename__ = 'breeding_schedule'
+
+    cattle_id = Column(BigInteger, ForeignKey('cattle.cattle_id', ondelete="CASCADE"), primary_key=True)
+    last_insemination_date = Column(Date, nullable=True)
+    last_calving_date = Column(Date, nullable=True)
+    next_heat_date = Column(Date, nullable=True)
+    pregnancy_check_date = Column(Date, nullable=True)
+    expected_calving_date = Column(Date, nullable=True)
+
+    __table_args__ = (
+        # "Due between" lookups, one range scan per event type
+        Index('ix_breeding_schedule_next_heat', 'next_heat_date'),
+        Index('ix_breeding_schedule_pregnancy_check', 'pregnancy_check_date'),
+        Index('ix_breeding_schedule_expected_calving', 'expected_calving_date'),
+    )
@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, BigInteger, String, Date, DECIMAL, Enum as SQLEnum, ForeignKey
+from sqlalchemy import Column, BigInteger, Integer, String, Date, DECIMAL, Enum as SQLEnum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -23,6 +23,17 @@ class Cattle(Base):
     gender = Column(SQLEnum(GenderEnum), nullable=True)
     quality_score = Column(DECIMAL(5, 2), nullable=True)
     status = Column(SQLEnum(CattleStatusEnum), nullable=True)
+    favorite_count = Column(Integer, nullable=False, default=0, server_default="0")  # Maintained by favorite writes
+
+    __table_args__ = (
+        # Marketplace listing: status + breed filter, ordered by quality then id for keyset paging
+        Index('ix_cattle_status_breed_quality', 'status', 'breed', 'quality_score', 'cattle_id'),
+        # Same listing without a breed filter
+        Index('ix_cattle_status_quality', 'status', 'quality_score', 'cattle_id'),
+        # Age range filters are birth_date ranges
+        Index('ix_cattle_status_birth_date', 'status', 'birth_date', 'cattle_id'),
+        Index('ix_cattle_user_id', 'user_id'),
+    )
 
     # Relationships
     farmer = relationship('User', back_populates='cattle')
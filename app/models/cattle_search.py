@@ -0,0 +1,35 @@
+from sqlalchemy import Column, BigInteger, Text, ForeignKey, DDL, event
+from .database import Base
+
+class CattleSearchDocument(Base):
+    """Denormalised search text per listing: cattle name and breed plus seller username and address."""
+    __tablename__ = 'cattle_search_documents'
+
+    cattle_id = Column(BigInteger, ForeignKey('cattle.cattle_id', ondelete="CASCADE"), primary_key=True)
+    document = Column(Text, nullable=False)
+
+
+# PostgreSQL: GIN index over the tsvector of the document
+event.listen(CattleSearchDocument.__table__, "after_create", DDL(
+    "CREATE INDEX IF NOT EXISTS ix_cattle_search_documents_tsv ON cattle_search_documents "
+    "USING GIN (to_tsvector('english', document))"
+).execute_if(dialect="postgresql"))
+
+# SQLite: external-content FTS5 table kept in step with the documents table by triggers
+_SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS cattle_search_fts USING fts5("
+    "document, content='cattle_search_documents', content_rowid='cattle_id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS cattle_search_documents_ai AFTER INSERT ON cattle_search_documents BEGIN "
+    "INSERT INTO cattle_search_fts(rowid, document) VALUES (new.cattle_id, new.document); END",
+    "CREATE TRIGGER IF NOT EXISTS cattle_search_documents_ad AFTER DELETE ON cattle_search_documents BEGIN "
+    "INSERT INTO cattle_search_fts(cattle_search_fts, rowid, document) VALUES ('delete', old.cattle_id, old.document); END",
+    "CREATE TRIGGER IF NOT EXISTS cattle_search_documents_au AFTER UPDATE ON cattle_search_documents BEGIN "
+    "INSERT INTO cattle_search_fts(cattle_search_fts, rowid, document) VALUES ('delete', old.cattle_id, old.document); "
+    "INSERT INTO cattle_search_fts(rowid, document) VALUES (new.cattle_id, new.document); END",
+]
+for _statement in _SQLITE_FTS_DDL:
+    event.listen(CattleSearchDocument.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(CattleSearchDocument.__table__, "before_drop", DDL(
+    "DROP TABLE IF EXISTS cattle_search_fts"
+).execute_if(dialect="sqlite"))
@@ -1,29 +1,141 @@
 import os
+import logging
+import random
+import time
 
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from dotenv import load_dotenv
 
+from app.config.appsettings import settings
+
 # Load environment variables from .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Get the database URL from environment variables
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 if DATABASE_URL is None:
     raise ValueError("DATABASE_URL environment variable not set")
 
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_count = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited_ms = (time.perf_counter() - start) * 1000
+            self.wait_count += 1
+            self.wait_total_ms += waited_ms
+            self.wait_max_ms = max(self.wait_max_ms, waited_ms)
+
+    def recreate(self):
+        # Carry the counters over when the engine disposes and rebuilds the pool
+        new_pool = super().recreate()
+        new_pool.wait_count = self.wait_count
+        new_pool.wait_total_ms = self.wait_total_ms
+        new_pool.wait_max_ms = self.wait_max_ms
+        new_pool.timeouts = self.timeouts
+        return new_pool
+
+
+def _engine_options(url: str) -> dict:
+    """Build pool options for the given URL from the application settings."""
+    options = {
+        "echo": settings.db_echo,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    parsed = make_url(url)
+    # In-memory SQLite needs its single shared connection, so keep the default pool
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return options
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
+    return options
+
+
+def _install_query_logging(async_engine) -> None:
+    """Log slow statements always and a random sample of the rest."""
+    sample_rate = settings.db_echo_sample_rate
+    slow_query_ms = settings.db_slow_query_ms
+
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+        if slow_query_ms and elapsed_ms >= slow_query_ms:
+            logger.warning("Slow query (%.1f ms): %s", elapsed_ms, statement)
+        elif sample_rate and random.random() < sample_rate:
+            logger.info("Sampled query (%.1f ms): %s", elapsed_ms, statement)
+
+
+def get_pool_stats(async_engine=None) -> dict:
+    """Return a snapshot of the connection pool for the given engine."""
+    pool = (async_engine or engine).pool
+    stats = {"pool_class": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update(
+            pool_size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(
+            wait_count=pool.wait_count,
+            wait_avg_ms=round(pool.wait_total_ms / pool.wait_count, 3) if pool.wait_count else 0.0,
+            wait_max_ms=round(pool.wait_max_ms, 3),
+            timeouts=pool.timeouts,
+        )
+    return stats
+
+
 # Create a database connection
-engine = create_async_engine(DATABASE_URL, echo=True)  # Set echo=True for SQL logs
+engine = create_async_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
+_install_query_logging(engine)
 SessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
+# Read-only traffic goes to the replica when one is configured, otherwise to the primary
+if settings.database_replica_url:
+    replica_engine = create_async_engine(
+        settings.database_replica_url, **_engine_options(settings.database_replica_url)
+    )
+    _install_query_logging(replica_engine)
+else:
+    replica_engine = engine
+ReadSessionLocal = sessionmaker(bind=replica_engine, class_=AsyncSession, expire_on_commit=False)
+
 # Base model for SQLAlchemy
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+async def get_db():
+    async with SessionLocal() as session:
+        yield session
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, ForeignKey, DateTime, func
+from sqlalchemy import Column, BigInteger, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -10,6 +10,11 @@ class Favorite(Base):
     cattle_id = Column(BigInteger, ForeignKey('cattle.cattle_id', ondelete="CASCADE"), nullable=True)
     created_at = Column(DateTime, server_default=func.now())
 
+    __table_args__ = (
+        # Leaderboard counts favorites added in a trailing window, per cattle
+        Index('ix_favorites_created_at_cattle_id', 'created_at', 'cattle_id'),
+    )
+
     # Define relationships
     user = relationship('User', back_populates='favorites', foreign_keys=[client_id])
     cattle = relationship('Cattle', back_populates='favorites')
@@ -0,0 +1,9 @@
+from sqlalchemy import Column, String, DateTime, func
+from .database import Base
+
+class InboundReceipt(Base):
+    """Provider message ids already ingested by the webhook, so retried deliveries are dropped."""
+    __tablename__ = 'inbound_receipts'
+
+    provider_message_id = Column(String(64), primary_key=True)
+    received_at = Column(DateTime, server_default=func.now(), index=True)  # For pruning old receipts
@@ -11,6 +11,7 @@ class Location(Base):
     latitude = Column(DECIMAL(9, 6), nullable=True)
     longitude = Column(DECIMAL(9, 6), nullable=True)
     climate_zone = Column(String(100), nullable=True)
+    geohash = Column(String(12), nullable=True, index=True)  # Derived from latitude/longitude for radius search
     updated_at = Column(Date, nullable=True)
 
     # Relationships
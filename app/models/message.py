@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, ForeignKey, String, DateTime, func
+from sqlalchemy import Column, BigInteger, ForeignKey, String, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from .database import Base
 from .user import User
@@ -10,7 +10,17 @@ class Message(Base):
     sender_id = Column(BigInteger, ForeignKey('users.user_id', ondelete="SET NULL"), nullable=True)
     receiver_id = Column(BigInteger, ForeignKey('users.user_id', ondelete="SET NULL"), nullable=True)
     message_content = Column(String(1000), nullable=False)
-    sent_at = Column(DateTime, server_default=func.now())
+    sent_at = Column(DateTime, nullable=False, server_default=func.now())
+    # The two users ordered (lower id, higher id), so both directions share one conversation key
+    participant_low = Column(BigInteger, nullable=True)
+    participant_high = Column(BigInteger, nullable=True)
+
+    __table_args__ = (
+        # Thread between two users, newest first: one range scan
+        Index('ix_messages_conversation', 'participant_low', 'participant_high', 'sent_at', 'message_id'),
+        # Conversation list looks a user up on either side of the key
+        Index('ix_messages_participant_high', 'participant_high', 'sent_at'),
+    )
 
     # Relationships
     sender = relationship('User', foreign_keys=[sender_id], back_populates='messages_sent')
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, BigInteger, Integer, Date, DECIMAL, ForeignKey
+from .database import Base
+
+class MilkDailyCattle(Base):
+    """Daily milk total per cow, maintained alongside milk_production writes."""
+    __tablename__ = 'milk_daily_cattle'
+
+    cattle_id = Column(BigInteger, ForeignKey('cattle.cattle_id', ondelete="CASCADE"), primary_key=True)
+    production_date = Column(Date, primary_key=True)
+    total_volume = Column(DECIMAL(12, 2), nullable=False, default=0)  # Volume in liters
+    record_count = Column(Integer, nullable=False, default=0)
+
+class MilkDailyFarmer(Base):
+    """Daily milk total per farmer, attributed to each cow's current owner; a sale moves the cow's days to the buyer."""
+    __tablename__ = 'milk_daily_farmer'
+
+    farmer_id = Column(BigInteger, ForeignKey('users.user_id', ondelete="CASCADE"), primary_key=True)
+    production_date = Column(Date, primary_key=True)
+    total_volume = Column(DECIMAL(14, 2), nullable=False, default=0)  # Volume in liters
+    record_count = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, String, DateTime, ForeignKey, func
+from sqlalchemy import Column, BigInteger, String, DateTime, ForeignKey, Index, func, text
 from sqlalchemy.orm import relationship
 from .database import Base
 from .user import User
@@ -9,8 +9,19 @@ class Notification(Base):
     notification_id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
     user_id = Column(BigInteger, ForeignKey('users.user_id', ondelete="CASCADE"), nullable=False)
     message = Column(String(255), nullable=False)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
     read_at = Column(DateTime, nullable=True)
 
+    __table_args__ = (
+        # Inbox: one user's notifications newest first, keyset-paginated on (created_at, notification_id)
+        Index('ix_notifications_user_created', 'user_id', 'created_at', 'notification_id'),
+        # Unread badge and unread-only inbox touch just the unread rows
+        Index(
+            'ix_notifications_unread', 'user_id', 'created_at', 'notification_id',
+            postgresql_where=text('read_at IS NULL'),
+            sqlite_where=text('read_at IS NULL'),
+        ),
+    )
+
     # Relationships
     user = relationship('User', back_populates='notifications')
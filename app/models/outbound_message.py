@@ -0,0 +1,35 @@
+import enum
+from datetime import datetime
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, ForeignKey, Index, Enum as SQLEnum, func
+from .database import Base
+
+class OutboundStatus(enum.Enum):
+    Queued = "Queued"
+    Sending = "Sending"
+    Sent = "Sent"
+    Failed = "Failed"
+
+class OutboundMessage(Base):
+    """WhatsApp message waiting for, or done with, delivery by the outbound dispatcher."""
+    __tablename__ = 'outbound_messages'
+
+    outbound_id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
+    message_id = Column(BigInteger, ForeignKey('messages.message_id', ondelete="SET NULL"), nullable=True)
+    sender_id = Column(BigInteger, nullable=True)  # Rate-limit key
+    to_phone = Column(String(32), nullable=False)
+    body = Column(String(1000), nullable=False)
+    status = Column(SQLEnum(OutboundStatus), nullable=False, default=OutboundStatus.Queued)
+    attempts = Column(Integer, nullable=False, default=0)
+    # Compared against the dispatcher's clock, so set by the application rather than the database
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.now)
+    locked_until = Column(DateTime, nullable=True)  # Lease held by the dispatcher while sending
+    provider_sid = Column(String(64), nullable=True)
+    provider_status = Column(String(32), nullable=True)
+    last_error = Column(String(500), nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Dispatcher claims due rows in next_attempt_at order
+        Index('ix_outbound_messages_status_next_attempt', 'status', 'next_attempt_at'),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, ForeignKey
+from sqlalchemy import Column, BigInteger, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -10,6 +10,13 @@ class Pedigree(Base):
     dam_id = Column(BigInteger, ForeignKey("cattle.cattle_id"), nullable=True)
     sire_id = Column(BigInteger, ForeignKey("cattle.cattle_id"), nullable=True)
 
+    __table_args__ = (
+        # Each step of the ancestor/descendant CTEs is a lookup on one of these
+        Index('ix_pedigree_cattle_id', 'cattle_id'),
+        Index('ix_pedigree_dam_id', 'dam_id'),
+        Index('ix_pedigree_sire_id', 'sire_id'),
+    )
+
     # Relationships
     cattle = relationship("Cattle", foreign_keys=[cattle_id], back_populates='pedigrees')
     dam = relationship("Cattle", foreign_keys=[dam_id], back_populates='offspring_dam')
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime, DECIMAL
+from .database import Base
+
+class PriceIndex(Base):
+    """Sale price distribution per breed, age band and seller climate zone over a trailing window."""
+    __tablename__ = 'price_index'
+
+    breed = Column(String(100), primary_key=True)
+    age_band = Column(String(20), primary_key=True)
+    climate_zone = Column(String(100), primary_key=True)
+    window_days = Column(Integer, primary_key=True)
+    trade_count = Column(Integer, nullable=False)
+    p25_price = Column(DECIMAL(10, 2), nullable=False)
+    median_price = Column(DECIMAL(10, 2), nullable=False)
+    p75_price = Column(DECIMAL(10, 2), nullable=False)
+    mean_price = Column(DECIMAL(10, 2), nullable=False)
+    refreshed_at = Column(DateTime, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, ForeignKey, DateTime, DECIMAL, func
+from sqlalchemy import Column, BigInteger, ForeignKey, DateTime, DECIMAL, Index, func
 from sqlalchemy.orm import relationship
 from .database import Base
 from .cattle import Cattle
@@ -14,6 +14,11 @@ class Trade(Base):
     trade_date = Column(DateTime, server_default=func.now())
     price = Column(DECIMAL(10, 2), nullable=False)  # Price in currency
 
+    __table_args__ = (
+        # Price index windows are trailing trade_date ranges
+        Index('ix_trades_trade_date', 'trade_date'),
+    )
+
     # Relationships
     cattle = relationship('Cattle', back_populates='trades')
     seller = relationship('User', foreign_keys=[seller_id], back_populates='trades_as_seller')
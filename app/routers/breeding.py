@@ -0,0 +1,27 @@
+from datetime import date, timedelta
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import breeding
+from app.schema.schemas import BreedingScheduleOut, BreedingEventOut
+from app.auth.auth import get_db, get_read_db, get_current_admin_user
+
+router = APIRouter()
+
+@router.get("/schedule/{cattle_id}", response_model=BreedingScheduleOut)
+async def read_breeding_schedule(cattle_id: int, db: AsyncSession = Depends(get_read_db)):
+    return await breeding.get_breeding_schedule(db, cattle_id)
+
+@router.get("/due/farmer/{farmer_id}", response_model=List[BreedingEventOut])
+async def read_due_breeding_events(
+    farmer_id: int,
+    start: Optional[date] = None,
+    days: int = Query(7, ge=1, le=366),
+    db: AsyncSession = Depends(get_read_db)
+):
+    start = start or date.today()
+    return await breeding.get_due_events(db, farmer_id, start, start + timedelta(days=days - 1))
+
+@router.post("/schedule/rebuild", status_code=204, dependencies=[Depends(get_current_admin_user)])
+async def rebuild_breeding_schedules(db: AsyncSession = Depends(get_db)):
+    await breeding.rebuild_breeding_schedules(db)
@@ -1,9 +1,9 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schema import schemas
-from app.crud import cattle
-from app.auth.auth import get_db
+from app.crud import cattle, search, location
+from app.auth.auth import get_db, get_read_db, get_current_admin_user
 from sqlalchemy.exc import NoResultFound
 
 router = APIRouter()
@@ -17,7 +17,7 @@ async def create_cattle(cattle_new: schemas.CattleCreate, db: AsyncSession = Dep
         raise HTTPException(status_code=400, detail=f"Error creating cattle: {e}")
 
 @router.get("/cattles/{cattle_id}", response_model=schemas.CattleOut)
-async def read_cattle(cattle_id: int, db: AsyncSession = Depends(get_db)):
+async def read_cattle(cattle_id: int, db: AsyncSession = Depends(get_read_db)):
     try:
         db_cattle = await cattle.get_cattle(db, cattle_id=cattle_id)
         return db_cattle
@@ -26,13 +26,61 @@ async def read_cattle(cattle_id: int, db: AsyncSession = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error retrieving cattle: {e}")
 
-@router.get("/cattles/", response_model=List[schemas.CattleOut])
-async def read_all_cattles(skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_db)):
+@router.get("/cattles/", response_model=schemas.Page[schemas.CattleOut])
+async def read_all_cattles(
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    sort: schemas.CattleSortKey = schemas.CattleSortKey.cattle_id,
+    descending: bool = False,
+    filters: schemas.CattleFilter = Depends(),
+    db: AsyncSession = Depends(get_read_db)
+):
     try:
-        return await cattle.get_all_cattles(db=db, skip=skip, limit=limit)
+        return await cattle.get_all_cattles(
+            db=db, cursor=cursor, limit=limit, sort=sort, descending=descending, filters=filters
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error retrieving cattles: {e}")
 
+@router.get("/search/", response_model=List[schemas.CattleSearchResult])
+async def search_cattles(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=50),
+    status: Optional[schemas.CattleStatusEnum] = schemas.CattleStatusEnum.Available,
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await search.search_cattle(db, q, limit=limit, status=status)
+
+@router.post("/search/reindex", status_code=204, dependencies=[Depends(get_current_admin_user)])
+async def reindex_cattle_search(db: AsyncSession = Depends(get_db)):
+    await search.rebuild_cattle_documents(db)
+
+@router.get("/nearby/", response_model=List[schemas.NearbyCattleOut])
+async def read_nearby_cattles(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(50, gt=0, le=500),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await location.get_available_cattle_within(db, latitude, longitude, radius_km, limit=limit)
+
+@router.post("/nearby/reindex", status_code=204, dependencies=[Depends(get_current_admin_user)])
+async def reindex_locations(db: AsyncSession = Depends(get_db)):
+    await location.rebuild_location_geohashes(db)
+
+@router.get("/sellers/nearby/", response_model=List[schemas.NearbyLocationOut])
+async def read_nearby_sellers(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(50, gt=0, le=500),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await location.get_locations_within(db, latitude, longitude, radius_km, limit=limit)
+
 @router.put("/cattles/{cattle_id}", response_model=schemas.CattleOut)
 async def update_cattle(cattle_id: int, cattle_update: schemas.CattleUpdate, db: AsyncSession = Depends(get_db)):
     try:
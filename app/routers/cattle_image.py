@@ -1,10 +1,9 @@
-from typing import List
-from fastapi import APIRouter, Depends, UploadFile, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, UploadFile, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session
-from app.schema.schemas import CattleImageCreate, CattleImageResponse
+from app.schema.schemas import CattleImageCreate, CattleImageResponse, Page
 from app.crud.cattle_image import create_cattle_image, get_cattle_images, get_cattle_image, delete_cattle_image
-from app.auth.auth import get_db
+from app.auth.auth import get_db, get_read_db
 
 router = APIRouter()
 
@@ -16,18 +15,19 @@ async def upload_cattle_image(
 ):
     return await create_cattle_image(db, cattle_id, file)
 
-@router.get("/cattle/{cattle_id}/images/", response_model=List[CattleImageResponse])
+@router.get("/cattle/{cattle_id}/images/", response_model=Page[CattleImageResponse])
 async def list_cattle_images(
     cattle_id: int,
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    images = await get_cattle_images(db, cattle_id)
-    return images
+    return await get_cattle_images(db, cattle_id, cursor=cursor, limit=limit)
 
 @router.get("/cattle/images/{image_id}", response_model=CattleImageResponse)
 async def read_cattle_image(
     image_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     return await get_cattle_image(db, image_id)
 
@@ -36,5 +36,4 @@ async def remove_cattle_image(
     image_id: int,
     db: AsyncSession = Depends(get_db)
 ):
-    await delete_cattle_image(db, image_id)
-    return {"detail": "Image deleted successfully"}
+    return await delete_cattle_image(db, image_id)
@@ -1,43 +1,23 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from typing import List
-from app.models.cattle_ownership_history import CattleOwnershipHistory
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import cattle_ownership_history
 from app.schema.schemas import CattleOwnershipHistoryCreate, CattleOwnershipHistoryOut
-from app.models.database import get_db
+from app.auth.auth import get_db, get_read_db
 
 router = APIRouter()
 
 @router.post("/cattle_ownership_histories/", response_model=CattleOwnershipHistoryOut)
-def create_cattle_ownership_history(cattle_ownership_history: CattleOwnershipHistoryCreate, db: Session = Depends(get_db)):
-    db_cattle_ownership_history = CattleOwnershipHistory(**cattle_ownership_history.dict())
-    db.add(db_cattle_ownership_history)
-    db.commit()
-    db.refresh(db_cattle_ownership_history)
-    return db_cattle_ownership_history
+async def create_cattle_ownership_history(cattle_ownership_history_new: CattleOwnershipHistoryCreate, db: AsyncSession = Depends(get_db)):
+    return await cattle_ownership_history.create_cattle_ownership_history(db, cattle_ownership_history_new.model_dump(exclude_unset=True))
 
 @router.get("/cattle_ownership_histories/{ownership_id}", response_model=CattleOwnershipHistoryOut)
-def read_cattle_ownership_history(ownership_id: int, db: Session = Depends(get_db)):
-    db_cattle_ownership_history = db.query(CattleOwnershipHistory).filter(CattleOwnershipHistory.ownership_id == ownership_id).first()
-    if db_cattle_ownership_history is None:
-        raise HTTPException(status_code=404, detail="Cattle Ownership History not found")
-    return db_cattle_ownership_history
+async def read_cattle_ownership_history(ownership_id: int, db: AsyncSession = Depends(get_read_db)):
+    return await cattle_ownership_history.get_cattle_ownership_history(db, ownership_id=ownership_id)
 
 @router.put("/cattle_ownership_histories/{ownership_id}", response_model=CattleOwnershipHistoryOut)
-def update_cattle_ownership_history(ownership_id: int, cattle_ownership_history: CattleOwnershipHistoryCreate, db: Session = Depends(get_db)):
-    db_cattle_ownership_history = db.query(CattleOwnershipHistory).filter(CattleOwnershipHistory.ownership_id == ownership_id).first()
-    if db_cattle_ownership_history is None:
-        raise HTTPException(status_code=404, detail="Cattle Ownership History not found")
-    for key, value in cattle_ownership_history.dict().items():
-        setattr(db_cattle_ownership_history, key, value)
-    db.commit()
-    db.refresh(db_cattle_ownership_history)
-    return db_cattle_ownership_history
+async def update_cattle_ownership_history(ownership_id: int, cattle_ownership_history_update: CattleOwnershipHistoryCreate, db: AsyncSession = Depends(get_db)):
+    return await cattle_ownership_history.update_cattle_ownership_history(db, ownership_id=ownership_id, obj_in=cattle_ownership_history_update.model_dump(exclude_unset=True))
 
 @router.delete("/cattle_ownership_histories/{ownership_id}", response_model=CattleOwnershipHistoryOut)
-def delete_cattle_ownership_history(ownership_id: int, db: Session = Depends(get_db)):
-    db_cattle_ownership_history = db.query(CattleOwnershipHistory).filter(CattleOwnershipHistory.ownership_id == ownership_id).first()
-    if db_cattle_ownership_history is None:
-        raise HTTPException(status_code=404, detail="Cattle Ownership History not found")
-    db.delete(db_cattle_ownership_history)
-    db.commit()
-    return db_cattle_ownership_history
\ No newline at end of file
+async def delete_cattle_ownership_history(ownership_id: int, db: AsyncSession = Depends(get_db)):
+    return await cattle_ownership_history.delete_cattle_ownership_history(db, ownership_id=ownership_id)
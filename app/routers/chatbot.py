@@ -2,42 +2,30 @@ from fastapi import  HTTPException
 
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app import crud
 from app.auth.auth import get_db
-from app.models import User, Message
+from app.models import User
 from app.schema.schemas import MessageCreate
-from app.utills.whatsapp.whatsapp import WhatsAppAPI
 
 router = APIRouter()
 
 @router.post("/messages/send")
-async def send_whatsapp_message(message: MessageCreate, db: Session = Depends(get_db)):
+async def send_whatsapp_message(message: MessageCreate, db: AsyncSession = Depends(get_db)):
     # Get sender and receiver users
-    sender = db.query(User).filter(User.user_id == message.sender_id).first()
-    receiver = db.query(User).filter(User.user_id == message.receiver_id).first()
+    result = await db.execute(
+        select(User.user_id).filter(User.user_id.in_([message.sender_id, message.receiver_id]))
+    )
+    found_ids = set(result.scalars().all())
 
-    if not sender or not receiver:
+    if message.sender_id not in found_ids or message.receiver_id not in found_ids:
         raise HTTPException(status_code=400, detail="Sender or receiver not found")
 
-    # Send WhatsApp message
-    whatsapp_api = WhatsAppAPI()
-    whatsapp_response = whatsapp_api.send_message(
-        to=receiver.phone,
-        message=message.message_content
-    )
-
-    # Save message to the database
-    db_message = Message(
-        sender_id=message.sender_id,
-        receiver_id=message.receiver_id,
-        message_content=message.message_content
-    )
-    db.add(db_message)
-    db.commit()
-    db.refresh(db_message)
+    # Save message to the database and send it over WhatsApp
+    result = await crud.create_message(db, message)
 
     return {
-        "message": db_message,
-        "whatsapp_response": whatsapp_response
+        "message": result["db_message"],
+        "whatsapp_response": result["whatsapp_response"]
     }
-
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from app import models
+from app.auth.auth import get_current_active_user, get_current_admin_user
+from app.schema import schemas
+from app.utills.export import stream_export
+
+router = APIRouter()
+
+MEDIA_TYPES = {
+    schemas.RecordFormat.csv: "text/csv",
+    schemas.RecordFormat.ndjson: "application/x-ndjson",
+}
+
+@router.get("/{entity}")
+async def export_records(
+    entity: schemas.ExportEntity,
+    format: schemas.RecordFormat = schemas.RecordFormat.ndjson,
+    current_user: models.User = Depends(get_current_active_user),
+):
+    # The users table carries contact details; only administrators may dump it
+    if entity == schemas.ExportEntity.users:
+        await get_current_admin_user(current_user)
+    filename = f"{entity.value}.{format.value}"
+    return StreamingResponse(
+        stream_export(entity, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
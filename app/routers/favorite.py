@@ -1,43 +1,35 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
 from typing import List
-from app.models.favorite import Favorite
-from app.schema.schemas import FavoriteCreate, FavoriteOut
-from app.models.database import get_db
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import favorite
+from app.schema.schemas import FavoriteCreate, FavoriteOut, LeaderboardEntry
+from app.auth.auth import get_db, get_read_db, get_current_admin_user
 
 router = APIRouter()
 
 @router.post("/favorites/", response_model=FavoriteOut)
-def create_favorite(favorite: FavoriteCreate, db: Session = Depends(get_db)):
-    db_favorite = Favorite(**favorite.dict())
-    db.add(db_favorite)
-    db.commit()
-    db.refresh(db_favorite)
-    return db_favorite
+async def create_favorite(favorite_new: FavoriteCreate, db: AsyncSession = Depends(get_db)):
+    return await favorite.create_favorite(db, favorite_new.model_dump(exclude_unset=True))
+
+@router.get("/leaderboard/", response_model=List[LeaderboardEntry])
+async def read_most_watched(
+    limit: int = Query(10, ge=1, le=favorite.LEADERBOARD_SIZE),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await favorite.get_most_watched(db, limit=limit)
+
+@router.post("/counts/rebuild", status_code=204, dependencies=[Depends(get_current_admin_user)])
+async def rebuild_favorite_counts(db: AsyncSession = Depends(get_db)):
+    await favorite.recount_favorite_counts(db)
 
 @router.get("/favorites/{favorite_id}", response_model=FavoriteOut)
-def read_favorite(favorite_id: int, db: Session = Depends(get_db)):
-    db_favorite = db.query(Favorite).filter(Favorite.favorite_id == favorite_id).first()
-    if db_favorite is None:
-        raise HTTPException(status_code=404, detail="Favorite not found")
-    return db_favorite
+async def read_favorite(favorite_id: int, db: AsyncSession = Depends(get_read_db)):
+    return await favorite.get_favorite(db, favorite_id=favorite_id)
 
 @router.put("/favorites/{favorite_id}", response_model=FavoriteOut)
-def update_favorite(favorite_id: int, favorite: FavoriteCreate, db: Session = Depends(get_db)):
-    db_favorite = db.query(Favorite).filter(Favorite.favorite_id == favorite_id).first()
-    if db_favorite is None:
-        raise HTTPException(status_code=404, detail="Favorite not found")
-    for key, value in favorite.dict().items():
-        setattr(db_favorite, key, value)
-    db.commit()
-    db.refresh(db_favorite)
-    return db_favorite
+async def update_favorite(favorite_id: int, favorite_update: FavoriteCreate, db: AsyncSession = Depends(get_db)):
+    return await favorite.update_favorite(db, favorite_id=favorite_id, obj_in=favorite_update.model_dump(exclude_unset=True))
 
 @router.delete("/favorites/{favorite_id}", response_model=FavoriteOut)
-def delete_favorite(favorite_id: int, db: Session = Depends(get_db)):
-    db_favorite = db.query(Favorite).filter(Favorite.favorite_id == favorite_id).first()
-    if db_favorite is None:
-        raise HTTPException(status_code=404, detail="Favorite not found")
-    db.delete(db_favorite)
-    db.commit()
-    return db_favorite
+async def delete_favorite(favorite_id: int, db: AsyncSession = Depends(get_db)):
+    return await favorite.delete_favorite(db, favorite_id=favorite_id)
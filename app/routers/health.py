@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Depends
+from app.auth.auth import get_current_admin_user
+from app.models.database import get_pool_stats, engine, replica_engine
+
+router = APIRouter()
+
+@router.get("/pool", dependencies=[Depends(get_current_admin_user)])
+async def read_pool_stats():
+    """Live connection pool statistics for this worker process."""
+    stats = {"primary": get_pool_stats(engine)}
+    if replica_engine is not engine:
+        stats["replica"] = get_pool_stats(replica_engine)
+    return stats
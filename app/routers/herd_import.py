@@ -0,0 +1,31 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schema import schemas
+from app.utills.herd_import import run_import, get_import_progress
+from app.auth.auth import get_db
+
+router = APIRouter()
+
+@router.post("/{entity}", response_model=schemas.ImportProgressOut)
+async def import_records(
+    entity: schemas.ImportEntity,
+    request: Request,
+    format: schemas.RecordFormat = schemas.RecordFormat.csv,
+    import_id: Optional[str] = None,
+    chunk_size: int = Query(1000, ge=1, le=10000),
+    db: AsyncSession = Depends(get_db)
+):
+    """Import a raw CSV or NDJSON request body, committing every ``chunk_size`` records.
+
+    The body is read as it arrives, so memory stays flat regardless of file size.
+    Pass an ``import_id`` to follow progress from another request while this one runs.
+    """
+    return await run_import(db, entity, format, request.stream(), import_id=import_id, chunk_size=chunk_size)
+
+@router.get("/progress/{import_id}", response_model=schemas.ImportProgressOut)
+async def read_import_progress(import_id: str):
+    progress = get_import_progress(import_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return progress
@@ -1,42 +1,23 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from app.models.insemination import Insemination
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import insemination
 from app.schema.schemas import InseminationCreate, InseminationOut
-from app.models.database import get_db
+from app.auth.auth import get_db, get_read_db
 
 router = APIRouter()
 
 @router.post("/inseminations/", response_model=InseminationOut)
-def create_insemination(insemination: InseminationCreate, db: Session = Depends(get_db)):
-    db_insemination = Insemination(**insemination.dict())
-    db.add(db_insemination)
-    db.commit()
-    db.refresh(db_insemination)
-    return db_insemination
+async def create_insemination(insemination_new: InseminationCreate, db: AsyncSession = Depends(get_db)):
+    return await insemination.create_insemination(db, insemination_new.model_dump(exclude_unset=True))
 
 @router.get("/inseminations/{insemination_id}", response_model=InseminationOut)
-def read_insemination(insemination_id: int, db: Session = Depends(get_db)):
-    db_insemination = db.query(Insemination).filter(Insemination.insemination_id == insemination_id).first()
-    if db_insemination is None:
-        raise HTTPException(status_code=404, detail="Insemination not found")
-    return db_insemination
+async def read_insemination(insemination_id: int, db: AsyncSession = Depends(get_read_db)):
+    return await insemination.get_insemination(db, insemination_id=insemination_id)
 
 @router.put("/inseminations/{insemination_id}", response_model=InseminationOut)
-def update_insemination(insemination_id: int, insemination: InseminationCreate, db: Session = Depends(get_db)):
-    db_insemination = db.query(Insemination).filter(Insemination.insemination_id == insemination_id).first()
-    if db_insemination is None:
-        raise HTTPException(status_code=404, detail="Insemination not found")
-    for key, value in insemination.dict().items():
-        setattr(db_insemination, key, value)
-    db.commit()
-    db.refresh(db_insemination)
-    return db_insemination
+async def update_insemination(insemination_id: int, insemination_update: InseminationCreate, db: AsyncSession = Depends(get_db)):
+    return await insemination.update_insemination(db, insemination_id=insemination_id, obj_in=insemination_update.model_dump(exclude_unset=True))
 
 @router.delete("/inseminations/{insemination_id}", response_model=InseminationOut)
-def delete_insemination(insemination_id: int, db: Session = Depends(get_db)):
-    db_insemination = db.query(Insemination).filter(Insemination.insemination_id == insemination_id).first()
-    if db_insemination is None:
-        raise HTTPException(status_code=404, detail="Insemination not found")
-    db.delete(db_insemination)
-    db.commit()
-    return db_insemination
+async def delete_insemination(insemination_id: int, db: AsyncSession = Depends(get_db)):
+    return await insemination.delete_insemination(db, insemination_id=insemination_id)
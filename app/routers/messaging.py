@@ -1,18 +1,67 @@
-from fastapi import APIRouter, Request, Depends
-from sqlalchemy.orm import Session
-from .. import crud
-from ..models import database
+from typing import Any, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..auth.auth import get_read_db
+from ..crud import message as message_crud
 from ..schema import schemas
+from ..utills.inbound import inbound_writer, InboundBufferFull
 
 router = APIRouter()
 
-@router.post("/webhook")
-async def handle_incoming_message(request: Request, db: Session = Depends(database.get_db)):
-    data = await request.json()
-    message = schemas.MessageCreate(
-        sender_id=data.get('sender'),
-        receiver_id=data.get('receiver'),
-        message_content=data.get('message')
-    )
-    result = await crud.create_message(db, message)
-    return {"status": "success", "message_id": result["db_message"].message_id}
+MAX_WEBHOOK_BATCH = 1000
+
+@router.post("/webhook", response_model=schemas.WebhookAck, status_code=202)
+async def handle_incoming_message(payload: Any = Body(...)):
+    """Accept one message, a list, or ``{"messages": [...]}``; messages are stored shortly after the ack.
+
+    Deliveries carrying an id already received are acknowledged but not stored
+    again. Messages without an id cannot be recognised as retries, so every
+    delivery of one is stored. A sender or receiver id that matches no user is
+    stored as empty. A batch the database keeps rejecting goes to the writer's
+    dead-letter file rather than being lost.
+    """
+    if isinstance(payload, dict) and isinstance(payload.get("messages"), list):
+        items = payload["messages"]
+    elif isinstance(payload, list):
+        items = payload
+    else:
+        items = [payload]
+    if len(items) > MAX_WEBHOOK_BATCH:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_WEBHOOK_BATCH} messages")
+
+    messages, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            messages.append(schemas.InboundMessage.model_validate(item).model_dump())
+        except ValidationError as e:
+            errors.append({"index": index, "detail": e.errors(include_url=False)})
+    try:
+        accepted = inbound_writer.submit(messages)
+    except InboundBufferFull as e:
+        # The provider retries on 503, and the receipts table keeps the retry idempotent
+        raise HTTPException(status_code=503, detail=str(e))
+    return {"status": "accepted", "received": len(items), "accepted": accepted, "errors": errors}
+
+@router.get("/outbound/{outbound_id}", response_model=schemas.OutboundMessageOut)
+async def read_outbound_message(outbound_id: int, db: AsyncSession = Depends(get_read_db)):
+    return await message_crud.get_outbound_message(db, outbound_id)
+
+@router.get("/conversations/{user_id}", response_model=schemas.Page[schemas.ConversationOut])
+async def read_conversations(
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await message_crud.get_conversations(db, user_id, cursor=cursor, limit=limit)
+
+@router.get("/threads/{user_id}/{other_user_id}", response_model=schemas.Page[schemas.MessageOut])
+async def read_thread(
+    user_id: int,
+    other_user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await message_crud.get_thread(db, user_id, other_user_id, cursor=cursor, limit=limit)
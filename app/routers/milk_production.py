@@ -1,43 +1,72 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from typing import List
-from app.models.milk_production import MilkProduction
-from app.schema.schemas import MilkProductionCreate, MilkProductionOut
-from app.models.database import get_db
+from datetime import date
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import milk_production, milk_rollup, lactation
+from app.models import MilkDailyCattle, MilkDailyFarmer
+from app.schema.schemas import (
+    MilkProductionCreate, MilkProductionOut, BatchResult, MilkGranularity, MilkAggregateOut,
+    LactationCurveOut
+)
+from app.auth.auth import get_db, get_read_db, get_current_admin_user
 
 router = APIRouter()
 
+MAX_BATCH_SIZE = 10000
+
 @router.post("/milk_productions/", response_model=MilkProductionOut)
-def create_milk_production(milk_production: MilkProductionCreate, db: Session = Depends(get_db)):
-    db_milk_production = MilkProduction(**milk_production.dict())
-    db.add(db_milk_production)
-    db.commit()
-    db.refresh(db_milk_production)
-    return db_milk_production
+async def create_milk_production(milk_production_new: MilkProductionCreate, db: AsyncSession = Depends(get_db)):
+    return await milk_production.create_milk_production(db, milk_production_new.model_dump(exclude_unset=True))
+
+@router.post("/milk_productions/batch", response_model=BatchResult)
+async def create_milk_productions_batch(
+    rows: List[Dict[str, Any]] = Body(...),
+    db: AsyncSession = Depends(get_db)
+):
+    if len(rows) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_SIZE} records")
+    return await milk_production.bulk_create_milk_productions(db, rows)
 
 @router.get("/milk_productions/{production_id}", response_model=MilkProductionOut)
-def read_milk_production(production_id: int, db: Session = Depends(get_db)):
-    db_milk_production = db.query(MilkProduction).filter(MilkProduction.production_id == production_id).first()
-    if db_milk_production is None:
-        raise HTTPException(status_code=404, detail="Milk production not found")
-    return db_milk_production
+async def read_milk_production(production_id: int, db: AsyncSession = Depends(get_read_db)):
+    return await milk_production.get_milk_production(db, production_id=production_id)
 
 @router.put("/milk_productions/{production_id}", response_model=MilkProductionOut)
-def update_milk_production(production_id: int, milk_production: MilkProductionCreate, db: Session = Depends(get_db)):
-    db_milk_production = db.query(MilkProduction).filter(MilkProduction.production_id == production_id).first()
-    if db_milk_production is None:
-        raise HTTPException(status_code=404, detail="Milk production not found")
-    for key, value in milk_production.dict().items():
-        setattr(db_milk_production, key, value)
-    db.commit()
-    db.refresh(db_milk_production)
-    return db_milk_production
+async def update_milk_production(production_id: int, milk_production_update: MilkProductionCreate, db: AsyncSession = Depends(get_db)):
+    return await milk_production.update_milk_production(db, production_id=production_id, obj_in=milk_production_update.model_dump(exclude_unset=True))
 
 @router.delete("/milk_productions/{production_id}", response_model=MilkProductionOut)
-def delete_milk_production(production_id: int, db: Session = Depends(get_db)):
-    db_milk_production = db.query(MilkProduction).filter(MilkProduction.production_id == production_id).first()
-    if db_milk_production is None:
-        raise HTTPException(status_code=404, detail="Milk production not found")
-    db.delete(db_milk_production)
-    db.commit()
-    return db_milk_production
+async def delete_milk_production(production_id: int, db: AsyncSession = Depends(get_db)):
+    return await milk_production.delete_milk_production(db, production_id=production_id)
+
+@router.get("/aggregates/cattle/{cattle_id}", response_model=List[MilkAggregateOut])
+async def read_cattle_milk_aggregates(
+    cattle_id: int,
+    granularity: MilkGranularity = MilkGranularity.day,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await milk_rollup.get_milk_aggregates(
+        db, MilkDailyCattle, "cattle_id", cattle_id, granularity=granularity, start=start, end=end
+    )
+
+@router.get("/aggregates/farmer/{farmer_id}", response_model=List[MilkAggregateOut])
+async def read_farmer_milk_aggregates(
+    farmer_id: int,
+    granularity: MilkGranularity = MilkGranularity.day,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await milk_rollup.get_milk_aggregates(
+        db, MilkDailyFarmer, "farmer_id", farmer_id, granularity=granularity, start=start, end=end
+    )
+
+@router.post("/aggregates/rebuild", status_code=204, dependencies=[Depends(get_current_admin_user)])
+async def rebuild_milk_aggregates(db: AsyncSession = Depends(get_db)):
+    await milk_rollup.rebuild_milk_rollups(db)
+
+@router.get("/lactation/farmer/{farmer_id}", response_model=List[LactationCurveOut])
+async def read_farmer_lactation_curves(farmer_id: int, db: AsyncSession = Depends(get_read_db)):
+    return await lactation.get_lactation_curves(db, farmer_id)
@@ -1,43 +1,84 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from typing import List
-from app.models.notification import Notification
-from app.schema.schemas import NotificationCreate, NotificationOut
-from app.models.database import get_db
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import notification
+from app.schema.schemas import (
+    NotificationCreate, NotificationOut, UnreadCountOut, Page, MarkReadRequest, MarkReadOut
+)
+from app.auth.auth import get_db, get_read_db
 
 router = APIRouter()
 
+KEEPALIVE_SECONDS = 15
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 @router.post("/notifications/", response_model=NotificationOut)
-def create_notification(notification: NotificationCreate, db: Session = Depends(get_db)):
-    db_notification = Notification(**notification.dict())
-    db.add(db_notification)
-    db.commit()
-    db.refresh(db_notification)
-    return db_notification
+async def create_notification(notification_new: NotificationCreate, db: AsyncSession = Depends(get_db)):
+    return await notification.create_notification(db, notification_new.model_dump(exclude_unset=True))
 
 @router.get("/notifications/{notification_id}", response_model=NotificationOut)
-def read_notification(notification_id: int, db: Session = Depends(get_db)):
-    db_notification = db.query(Notification).filter(Notification.notification_id == notification_id).first()
-    if db_notification is None:
-        raise HTTPException(status_code=404, detail="Notification not found")
-    return db_notification
+async def read_notification(notification_id: int, db: AsyncSession = Depends(get_read_db)):
+    return await notification.get_notification(db, notification_id=notification_id)
 
 @router.put("/notifications/{notification_id}", response_model=NotificationOut)
-def update_notification(notification_id: int, notification: NotificationCreate, db: Session = Depends(get_db)):
-    db_notification = db.query(Notification).filter(Notification.notification_id == notification_id).first()
-    if db_notification is None:
-        raise HTTPException(status_code=404, detail="Notification not found")
-    for key, value in notification.dict().items():
-        setattr(db_notification, key, value)
-    db.commit()
-    db.refresh(db_notification)
-    return db_notification
+async def update_notification(notification_id: int, notification_update: NotificationCreate, db: AsyncSession = Depends(get_db)):
+    return await notification.update_notification(db, notification_id=notification_id, obj_in=notification_update.model_dump(exclude_unset=True))
 
 @router.delete("/notifications/{notification_id}", response_model=NotificationOut)
-def delete_notification(notification_id: int, db: Session = Depends(get_db)):
-    db_notification = db.query(Notification).filter(Notification.notification_id == notification_id).first()
-    if db_notification is None:
-        raise HTTPException(status_code=404, detail="Notification not found")
-    db.delete(db_notification)
-    db.commit()
-    return db_notification
+async def delete_notification(notification_id: int, db: AsyncSession = Depends(get_db)):
+    return await notification.delete_notification(db, notification_id=notification_id)
+
+@router.get("/inbox/{user_id}", response_model=Page[NotificationOut])
+async def read_inbox(
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    unread_only: bool = False,
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await notification.get_inbox(db, user_id, cursor=cursor, limit=limit, unread_only=unread_only)
+
+@router.post("/inbox/{user_id}/read", response_model=MarkReadOut)
+async def mark_read(user_id: int, mark_read_request: MarkReadRequest, db: AsyncSession = Depends(get_db)):
+    updated = await notification.mark_notifications_read(db, user_id, mark_read_request.notification_ids)
+    return {"updated": updated}
+
+@router.get("/unread_count/{user_id}", response_model=UnreadCountOut)
+async def read_unread_count(user_id: int):
+    return {"user_id": user_id, "unread": await notification.get_unread_count(user_id)}
+
+@router.get("/stream/{user_id}")
+async def stream_notifications(user_id: int, request: Request):
+    """Server-sent events: the unread count on connect, then each new notification as it is created."""
+    # Subscribe before counting so a notification created in between is at
+    # worst both counted and streamed, never missed
+    queue = notification.notification_broker.subscribe(user_id)
+    try:
+        unread = await notification.get_unread_count(user_id)
+    except BaseException:
+        notification.notification_broker.unsubscribe(user_id, queue)
+        raise
+
+    async def events():
+        try:
+            yield _sse("unread", {"user_id": user_id, "unread": unread})
+            while not await request.is_disconnected():
+                try:
+                    payload = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse("notification", payload)
+        finally:
+            notification.notification_broker.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
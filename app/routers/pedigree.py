@@ -1,42 +1,50 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from app.models.pedigree import Pedigree
-from app.schema.schemas import PedigreeCreate, PedigreeOut
-from app.models.database import get_db
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import pedigree
+from app.schema.schemas import (
+    PedigreeCreate, PedigreeOut, AncestorNode, DescendantNode, KinshipRequest, KinshipOut, InbreedingOut
+)
+from app.auth.auth import get_db, get_read_db
 
 router = APIRouter()
 
 @router.post("/pedigrees/", response_model=PedigreeOut)
-def create_pedigree(pedigree: PedigreeCreate, db: Session = Depends(get_db)):
-    db_pedigree = Pedigree(**pedigree.dict())
-    db.add(db_pedigree)
-    db.commit()
-    db.refresh(db_pedigree)
-    return db_pedigree
+async def create_pedigree(pedigree_new: PedigreeCreate, db: AsyncSession = Depends(get_db)):
+    return await pedigree.create_pedigree(db, pedigree_new.model_dump(exclude_unset=True))
 
 @router.get("/pedigrees/{id}", response_model=PedigreeOut)
-def read_pedigree(id: int, db: Session = Depends(get_db)):
-    db_pedigree = db.query(Pedigree).filter(Pedigree.id == id).first()
-    if db_pedigree is None:
-        raise HTTPException(status_code=404, detail="Pedigree not found")
-    return db_pedigree
+async def read_pedigree(id: int, db: AsyncSession = Depends(get_read_db)):
+    return await pedigree.get_pedigree(db, pedigree_id=id)
 
 @router.put("/pedigrees/{id}", response_model=PedigreeOut)
-def update_pedigree(id: int, pedigree: PedigreeCreate, db: Session = Depends(get_db)):
-    db_pedigree = db.query(Pedigree).filter(Pedigree.id == id).first()
-    if db_pedigree is None:
-        raise HTTPException(status_code=404, detail="Pedigree not found")
-    for key, value in pedigree.dict().items():
-        setattr(db_pedigree, key, value)
-    db.commit()
-    db.refresh(db_pedigree)
-    return db_pedigree
+async def update_pedigree(id: int, pedigree_update: PedigreeCreate, db: AsyncSession = Depends(get_db)):
+    return await pedigree.update_pedigree(db, pedigree_id=id, obj_in=pedigree_update.model_dump(exclude_unset=True))
 
 @router.delete("/pedigrees/{id}", response_model=PedigreeOut)
-def delete_pedigree(id: int, db: Session = Depends(get_db)):
-    db_pedigree = db.query(Pedigree).filter(Pedigree.id == id).first()
-    if db_pedigree is None:
-        raise HTTPException(status_code=404, detail="Pedigree not found")
-    db.delete(db_pedigree)
-    db.commit()
-    return db_pedigree
+async def delete_pedigree(id: int, db: AsyncSession = Depends(get_db)):
+    return await pedigree.delete_pedigree(db, pedigree_id=id)
+
+@router.get("/ancestors/{cattle_id}", response_model=AncestorNode, response_model_exclude_none=True)
+async def read_ancestors(
+    cattle_id: int,
+    generations: int = Query(3, ge=1, le=pedigree.MAX_GENERATIONS),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await pedigree.get_ancestor_tree(db, cattle_id, generations=generations)
+
+@router.get("/descendants/{cattle_id}", response_model=DescendantNode, response_model_exclude_none=True)
+async def read_descendants(
+    cattle_id: int,
+    generations: int = Query(3, ge=1, le=pedigree.MAX_GENERATIONS),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await pedigree.get_descendant_tree(db, cattle_id, generations=generations)
+
+@router.get("/inbreeding/{cattle_id}", response_model=InbreedingOut)
+async def read_inbreeding(cattle_id: int, db: AsyncSession = Depends(get_read_db)):
+    return await pedigree.get_inbreeding(db, cattle_id)
+
+# POST only to carry the candidate list; nothing is written
+@router.post("/kinship", response_model=KinshipOut)
+async def score_kinship(kinship_request: KinshipRequest, db: AsyncSession = Depends(get_read_db)):
+    return await pedigree.score_candidate_sires(db, kinship_request.cattle_id, kinship_request.candidate_ids)
@@ -0,0 +1,32 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import trade, price_index
+from app.schema.schemas import TradeOut, SaleCreate, SaleOut, PriceIndexOut
+from app.auth.auth import get_db, get_read_db, get_current_admin_user
+
+router = APIRouter()
+
+@router.post("/sales/", response_model=SaleOut)
+async def create_sale(sale_new: SaleCreate, db: AsyncSession = Depends(get_db)):
+    return await trade.sell_cattle(db, sale_new.cattle_id, sale_new.buyer_id, sale_new.price)
+
+@router.get("/trades/{trade_id}", response_model=TradeOut)
+async def read_trade(trade_id: int, db: AsyncSession = Depends(get_read_db)):
+    return await trade.get_trade(db, trade_id=trade_id)
+
+@router.get("/price_index/", response_model=List[PriceIndexOut])
+async def read_price_index(
+    breed: str,
+    climate_zone: Optional[str] = None,
+    age_band: Optional[str] = None,
+    window_days: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await price_index.get_price_index(
+        db, breed, climate_zone=climate_zone, age_band=age_band, window_days=window_days
+    )
+
+@router.post("/price_index/rebuild", status_code=204, dependencies=[Depends(get_current_admin_user)])
+async def rebuild_price_index(db: AsyncSession = Depends(get_db)):
+    await price_index.rebuild_price_index(db)
@@ -1,11 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud import user, create_user
+from app.crud.search import refresh_cattle_documents
 from app.schema import schemas
-from app.auth.auth import get_db, create_access_token, authenticate_user
+from app.auth.auth import get_db, get_read_db, create_access_token, authenticate_user
 from app.models import User
 from passlib.context import CryptContext
 from datetime import timedelta
@@ -60,15 +61,19 @@ async def create_user_endpoint(new_user: schemas.UserCreate, db: AsyncSession =
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 @router.get("/users/{user_id}", response_model=schemas.User)
-async def read_user(user_id: int, db: AsyncSession = Depends(get_db)):
+async def read_user(user_id: int, db: AsyncSession = Depends(get_read_db)):
     db_user = await user.get_user_by_id(db, user_id=user_id)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return db_user
 
-@router.get("/users/", response_model=List[schemas.User])
-async def read_all_users(db: AsyncSession = Depends(get_db)):
-    return await user.get_all_users(db=db)
+@router.get("/users/", response_model=schemas.Page[schemas.User])
+async def read_all_users(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await user.get_all_users(db=db, cursor=cursor, limit=limit)
 
 @router.put("/users/{user_id}", response_model=schemas.User)
 async def update_user(
@@ -96,6 +101,8 @@ async def update_user(
 
     try:
         await db.execute(update(User).where(User.user_id == user_id).values(update_data))
+        if 'username' in update_data or 'address' in update_data:
+            await refresh_cattle_documents(db, user_id=user_id)
         await db.commit()
     except IntegrityError as e:
         await db.rollback()
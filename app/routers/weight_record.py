@@ -0,0 +1,32 @@
+from typing import List
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import weight_record, growth
+from app.schema.schemas import WeightRecordCreate, WeightRecordOut, GrowthAnalyticsOut
+from app.auth.auth import get_db, get_read_db
+
+router = APIRouter()
+
+@router.post("/weight_records/", response_model=WeightRecordOut)
+async def create_weight_record(weight_record_new: WeightRecordCreate, db: AsyncSession = Depends(get_db)):
+    return await weight_record.create_weight_record(db, weight_record_new.model_dump(exclude_unset=True))
+
+@router.get("/weight_records/{weight_id}", response_model=WeightRecordOut)
+async def read_weight_record(weight_id: int, db: AsyncSession = Depends(get_read_db)):
+    return await weight_record.get_weight_record(db, weight_id=weight_id)
+
+@router.put("/weight_records/{weight_id}", response_model=WeightRecordOut)
+async def update_weight_record(weight_id: int, weight_record_update: WeightRecordCreate, db: AsyncSession = Depends(get_db)):
+    return await weight_record.update_weight_record(db, weight_id=weight_id, obj_in=weight_record_update.model_dump(exclude_unset=True))
+
+@router.delete("/weight_records/{weight_id}", response_model=WeightRecordOut)
+async def delete_weight_record(weight_id: int, db: AsyncSession = Depends(get_db)):
+    return await weight_record.delete_weight_record(db, weight_id=weight_id)
+
+@router.get("/growth/farmer/{farmer_id}", response_model=List[GrowthAnalyticsOut])
+async def read_farmer_growth(
+    farmer_id: int,
+    target_weight: float = Query(growth.DEFAULT_MARKET_WEIGHT, gt=0),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await growth.get_growth_analytics(db, farmer_id, target_weight=target_weight)
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, Field, ValidationError
-from typing import Optional, Annotated
+from pydantic import AliasChoices, BaseModel, EmailStr, Field, ValidationError
+from typing import Any, Generic, List, Optional, TypeVar, Annotated
 from datetime import date, datetime
 import enum
 
@@ -23,6 +23,13 @@ class CattleStatusEnum(str, enum.Enum):
     Sold = "Sold"
     NotAvailable = "Not Available"
 
+ItemT = TypeVar("ItemT")
+
+# Keyset pagination envelope; pass next_cursor back as ?cursor= for the following page
+class Page(BaseModel, Generic[ItemT]):
+    items: List[ItemT]
+    next_cursor: Optional[str] = None
+
 # Token schemas
 class Token(BaseModel):
     access_token: str
@@ -99,6 +106,10 @@ class LocationOut(LocationBase):
     class Config:
         from_attributes = True
 
+class NearbyLocationOut(BaseModel):
+    location: LocationOut
+    distance_km: float
+
 # Farmer schemas
 class FarmerBase(BaseModel):
     name: str
@@ -138,10 +149,34 @@ class CattleUpdate(BaseModel):
 
 class CattleOut(CattleBase):
     cattle_id: int
+    favorite_count: int = 0
 
     class Config:
         from_attributes = True
 
+class CattleFilter(BaseModel):
+    breed: Optional[str] = None
+    gender: Optional[GenderEnum] = None
+    status: Optional[CattleStatusEnum] = None
+    min_age_months: Optional[int] = Field(None, ge=0)
+    max_age_months: Optional[int] = Field(None, ge=0)
+    min_quality_score: Optional[float] = None
+    max_quality_score: Optional[float] = None
+
+class NearbyCattleOut(BaseModel):
+    cattle: CattleOut
+    distance_km: float
+
+class CattleSearchResult(BaseModel):
+    cattle: CattleOut
+    rank: float
+
+class CattleSortKey(str, enum.Enum):
+    cattle_id = "cattle_id"
+    name = "name"
+    birth_date = "birth_date"
+    quality_score = "quality_score"
+
 # Cattle Image schemas
 class CattleImageBase(BaseModel):
     cattle_id: int
@@ -174,6 +209,51 @@ class MessageCreate(BaseModel):
     class Config:
         from_attributes = True
 
+class MessageOut(BaseModel):
+    message_id: int
+    sender_id: Optional[int] = None
+    receiver_id: Optional[int] = None
+    message_content: str
+    sent_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class ConversationOut(BaseModel):
+    counterpart_id: Optional[int] = None
+    last_message: MessageOut
+
+# One message in a provider webhook delivery; accepts the provider's field names
+class InboundMessage(BaseModel):
+    provider_message_id: Optional[str] = Field(
+        None, max_length=64, validation_alias=AliasChoices("provider_message_id", "message_id", "id")
+    )
+    sender_id: Optional[int] = Field(None, validation_alias=AliasChoices("sender_id", "sender"))
+    receiver_id: Optional[int] = Field(None, validation_alias=AliasChoices("receiver_id", "receiver"))
+    message_content: str = Field(..., max_length=1000, validation_alias=AliasChoices("message_content", "message"))
+
+class OutboundStatusEnum(str, enum.Enum):
+    Queued = "Queued"
+    Sending = "Sending"
+    Sent = "Sent"
+    Failed = "Failed"
+
+class OutboundMessageOut(BaseModel):
+    outbound_id: int
+    message_id: Optional[int] = None
+    to_phone: str
+    status: OutboundStatusEnum
+    attempts: int
+    next_attempt_at: Optional[datetime] = None
+    provider_sid: Optional[str] = None
+    provider_status: Optional[str] = None
+    last_error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    sent_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
 # Calving schemas
 class CalvingBase(BaseModel):
     cattle_id: Optional[int] = None
@@ -206,6 +286,29 @@ class InseminationOut(InseminationBase):
     class Config:
         from_attributes = True
 
+# Breeding calendar schemas
+class BreedingScheduleOut(BaseModel):
+    cattle_id: int
+    last_insemination_date: Optional[date] = None
+    last_calving_date: Optional[date] = None
+    next_heat_date: Optional[date] = None
+    pregnancy_check_date: Optional[date] = None
+    expected_calving_date: Optional[date] = None
+
+    class Config:
+        from_attributes = True
+
+class BreedingEvent(str, enum.Enum):
+    heat = "heat"
+    pregnancy_check = "pregnancy_check"
+    calving = "calving"
+
+class BreedingEventOut(BaseModel):
+    cattle_id: int
+    name: Optional[str] = None
+    event: BreedingEvent
+    due_date: date
+
 # Milk Production schemas
 class MilkProductionBase(BaseModel):
     cattle_id: int
@@ -221,6 +324,70 @@ class MilkProductionOut(MilkProductionBase):
     class Config:
         from_attributes = True
 
+class MilkGranularity(str, enum.Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+
+class MilkAggregateOut(BaseModel):
+    period_start: date
+    total_volume: float
+    record_count: int
+
+# Wood's model y = a t^b e^(-ct) over the lactation since the last calving
+class LactationCurveOut(BaseModel):
+    cattle_id: int
+    calving_date: date
+    days_in_milk: int
+    record_count: int
+    wood_a: Optional[float] = None
+    wood_b: Optional[float] = None
+    wood_c: Optional[float] = None
+    peak_day: Optional[float] = None
+    peak_yield: Optional[float] = None
+    persistency: Optional[float] = None
+
+# Batch ingestion schemas
+class BatchRowError(BaseModel):
+    index: int
+    detail: Any
+
+class BatchResult(BaseModel):
+    received: int
+    inserted: int
+    errors: List[BatchRowError] = []
+
+class WebhookAck(BaseModel):
+    status: str
+    received: int
+    accepted: int
+    errors: List[BatchRowError] = []
+
+# Herd import schemas
+class ImportEntity(str, enum.Enum):
+    cattle = "cattle"
+    weight_records = "weight_records"
+    milk_productions = "milk_productions"
+
+class RecordFormat(str, enum.Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+class ExportEntity(str, enum.Enum):
+    cattle = "cattle"
+    milk_productions = "milk_productions"
+    trades = "trades"
+    users = "users"
+
+class ImportProgressOut(BaseModel):
+    import_id: str
+    entity: ImportEntity
+    processed: int
+    inserted: int
+    failed: int
+    done: bool
+    errors: List[BatchRowError] = []
+
 # Pedigree schemas
 class PedigreeBase(BaseModel):
     cattle_id: int
@@ -236,6 +403,36 @@ class PedigreeOut(PedigreeBase):
     class Config:
         from_attributes = True
 
+class PedigreeAnimal(BaseModel):
+    cattle_id: int
+    name: Optional[str] = None
+    breed: Optional[str] = None
+    gender: Optional[GenderEnum] = None
+
+class AncestorNode(PedigreeAnimal):
+    dam: Optional["AncestorNode"] = None
+    sire: Optional["AncestorNode"] = None
+
+class DescendantNode(PedigreeAnimal):
+    children: List["DescendantNode"] = []
+
+class KinshipRequest(BaseModel):
+    cattle_id: int
+    candidate_ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+class KinshipScore(BaseModel):
+    cattle_id: int
+    kinship: float
+
+class KinshipOut(BaseModel):
+    cattle_id: int
+    inbreeding: float
+    candidates: List[KinshipScore]
+
+class InbreedingOut(BaseModel):
+    cattle_id: int
+    inbreeding: float
+
 # Cattle Ownership History schemas
 class CattleOwnershipHistoryBase(BaseModel):
     cattle_id: Optional[int] = None
@@ -275,6 +472,10 @@ class FavoriteOut(FavoriteBase):
     class Config:
         from_attributes = True
 
+class LeaderboardEntry(BaseModel):
+    cattle: CattleOut
+    favorites_this_week: int
+
 # Notification schemas
 class NotificationBase(BaseModel):
     user_id: int
@@ -291,6 +492,17 @@ class NotificationOut(NotificationBase):
     class Config:
         from_attributes = True
 
+class MarkReadRequest(BaseModel):
+    # Omit to mark every unread notification of the user
+    notification_ids: Optional[List[int]] = Field(None, max_length=1000)
+
+class MarkReadOut(BaseModel):
+    updated: int
+
+class UnreadCountOut(BaseModel):
+    user_id: int
+    unread: int
+
 # Trade schemas
 class TradeBase(BaseModel):
     seller_id: int
@@ -310,6 +522,30 @@ class TradeOut(TradeBase):
     class Config:
         from_attributes = True
 
+class SaleCreate(BaseModel):
+    cattle_id: int
+    buyer_id: int
+    price: float = Field(..., gt=0)
+
+class SaleOut(BaseModel):
+    trade: TradeOut
+    ownership: CattleOwnershipHistoryOut
+
+class PriceIndexOut(BaseModel):
+    breed: str
+    age_band: str
+    climate_zone: str
+    window_days: int
+    trade_count: int
+    p25_price: float
+    median_price: float
+    p75_price: float
+    mean_price: float
+    refreshed_at: datetime
+
+    class Config:
+        from_attributes = True
+
 # Weight Record schemas
 class WeightRecordBase(BaseModel):
     cattle_id: int
@@ -323,4 +559,15 @@ class WeightRecordOut(WeightRecordBase):
     weight_id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class GrowthAnalyticsOut(BaseModel):
+    cattle_id: int
+    record_count: int
+    first_weight_date: date
+    latest_weight_date: date
+    latest_weight: float
+    average_daily_gain: Optional[float] = None
+    deviation_kg: Optional[float] = None
+    residual_sd_kg: Optional[float] = None
+    projected_market_date: Optional[date] = None
@@ -0,0 +1,16 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def upsert_insert(db: AsyncSession, model):
+    """An INSERT construct supporting ``on_conflict_do_update``/``on_conflict_do_nothing``.
+
+    PostgreSQL and SQLite share the ON CONFLICT syntax; other backends are not supported.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Upserts are not supported on {dialect}")
+    return insert(model)
@@ -0,0 +1,58 @@
+import csv
+import io
+import json
+from typing import AsyncIterator
+
+from sqlalchemy.future import select
+from sqlalchemy.orm import lazyload
+
+from app.models import Cattle, MilkProduction, Trade, User
+from app.models.database import ReadSessionLocal
+from app.schema import schemas
+
+# entity -> (query in a stable order, schema used to serialise each row)
+EXPORT_SPECS = {
+    schemas.ExportEntity.cattle: (select(Cattle).order_by(Cattle.cattle_id), schemas.CattleOut),
+    schemas.ExportEntity.milk_productions: (
+        select(MilkProduction).order_by(MilkProduction.production_id), schemas.MilkProductionOut
+    ),
+    schemas.ExportEntity.trades: (select(Trade).order_by(Trade.trade_id), schemas.TradeOut),
+    # User eagerly joins its trades; streaming needs plain rows
+    schemas.ExportEntity.users: (
+        select(User).options(lazyload("*")).order_by(User.user_id), schemas.User
+    ),
+}
+
+DEFAULT_YIELD_PER = 1000
+
+
+async def stream_export(
+    entity: schemas.ExportEntity,
+    fmt: schemas.RecordFormat,
+    yield_per: int = DEFAULT_YIELD_PER,
+) -> AsyncIterator[str]:
+    """Yield an export one ``yield_per`` batch at a time from a server-side cursor.
+
+    The session is opened here rather than taken from a dependency because the
+    response body is produced after the endpoint has returned.
+    """
+    statement, schema = EXPORT_SPECS[entity]
+    fields = list(schema.model_fields)
+    async with ReadSessionLocal() as session:
+        result = await session.stream_scalars(statement.execution_options(yield_per=yield_per))
+        if fmt == schemas.RecordFormat.csv:
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=fields)
+            writer.writeheader()
+            yield buffer.getvalue()
+        async for partition in result.partitions():
+            buffer = io.StringIO()
+            if fmt == schemas.RecordFormat.csv:
+                writer = csv.DictWriter(buffer, fieldnames=fields)
+                for obj in partition:
+                    writer.writerow(schema.model_validate(obj).model_dump(mode="json"))
+            else:
+                for obj in partition:
+                    buffer.write(json.dumps(schema.model_validate(obj).model_dump(mode="json")))
+                    buffer.write("\n")
+            yield buffer.getvalue()
@@ -0,0 +1,79 @@
+import math
+from typing import List, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+GEOHASH_PRECISION = 9  # ~5 m cells; stored on each location
+MAX_COVERING_CELLS = 32
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        target, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        value <<= 1
+        if target >= mid:
+            value |= 1
+            bounds[0] = mid
+        else:
+            bounds[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def _cell_size(precision: int) -> Tuple[float, float]:
+    """(lat_degrees, lon_degrees) covered by one geohash cell of this precision."""
+    total_bits = 5 * precision
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lon, max_lon) enclosing the circle, clamped to valid coordinates."""
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(latitude))
+    d_lon = 180.0 if cos_lat < 1e-6 else min(180.0, math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)))
+    return (
+        max(-90.0, latitude - d_lat), min(90.0, latitude + d_lat),
+        max(-180.0, longitude - d_lon), min(180.0, longitude + d_lon),
+    )
+
+
+def covering_prefixes(latitude: float, longitude: float, radius_km: float) -> List[str]:
+    """Geohash prefixes whose cells together cover the search circle's bounding box.
+
+    Uses the finest precision that needs at most ``MAX_COVERING_CELLS`` cells, so
+    each prefix becomes one short index range scan.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_step, lon_step = _cell_size(precision)
+        lat_cells = range(int((min_lat + 90) // lat_step), int((max_lat + 90) // lat_step) + 1)
+        lon_cells = range(int((min_lon + 180) // lon_step), int((max_lon + 180) // lon_step) + 1)
+        if len(lat_cells) * len(lon_cells) <= MAX_COVERING_CELLS or precision == 1:
+            prefixes = {
+                encode_geohash(
+                    min(89.999999, -90 + (i + 0.5) * lat_step),
+                    min(179.999999, -180 + (j + 0.5) * lon_step),
+                    precision,
+                )
+                for i in lat_cells for j in lon_cells
+            }
+            return sorted(prefixes)
+    return []
@@ -0,0 +1,207 @@
+import codecs
+import csv
+import json
+import logging
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field, asdict
+from typing import Any, AsyncIterator, Deque, List, Optional, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.batch import validate_and_insert
+from app.crud.cattle import cattle_repository
+from app.crud.milk_production import milk_production_repository, after_milk_inserted
+from app.crud.search import refresh_cattle_documents
+from app.crud.weight_record import weight_record_repository
+from app.models import Cattle, User
+from app.schema import schemas
+
+logger = logging.getLogger(__name__)
+
+
+async def _index_cattle(db: AsyncSession, created: List[Cattle]) -> None:
+    await refresh_cattle_documents(db, [obj.cattle_id for obj in created])
+
+
+# entity -> (repository, schema, foreign keys checked per chunk, hook run on inserted rows)
+IMPORT_SPECS = {
+    schemas.ImportEntity.cattle: (cattle_repository, schemas.CattleCreate, {"user_id": User.user_id}, _index_cattle),
+    schemas.ImportEntity.weight_records: (weight_record_repository, schemas.WeightRecordCreate, {"cattle_id": Cattle.cattle_id}, None),
+    schemas.ImportEntity.milk_productions: (milk_production_repository, schemas.MilkProductionCreate, {"cattle_id": Cattle.cattle_id}, after_milk_inserted),
+}
+
+DEFAULT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+MAX_TRACKED_IMPORTS = 100
+
+
+@dataclass
+class ImportProgress:
+    import_id: str
+    entity: str
+    processed: int = 0
+    inserted: int = 0
+    failed: int = 0
+    done: bool = False
+    errors: List[dict] = field(default_factory=list)
+
+    def record(self, result: dict) -> None:
+        self.processed += result["received"]
+        self.inserted += result["inserted"]
+        self.failed += len(result["errors"])
+        room = MAX_REPORTED_ERRORS - len(self.errors)
+        if room > 0:
+            self.errors.extend(result["errors"][:room])
+
+
+# Most recent imports in this process, so a client can poll while its upload runs
+_imports: "OrderedDict[str, ImportProgress]" = OrderedDict()
+
+
+def get_import_progress(import_id: str) -> Optional[dict]:
+    progress = _imports.get(import_id)
+    return asdict(progress) if progress else None
+
+
+def _track(progress: ImportProgress) -> None:
+    _imports[progress.import_id] = progress
+    while len(_imports) > MAX_TRACKED_IMPORTS:
+        _imports.popitem(last=False)
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode a byte stream into lines without holding more than one partial line."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+class _LineFeed:
+    """The iterator csv.reader pulls lines from, refilled as lines arrive from the upload."""
+
+    def __init__(self):
+        self.lines: Deque[str] = deque()
+        self.ran_dry = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            self.ran_dry = True
+            raise StopIteration
+        return self.lines.popleft()
+
+
+async def iter_csv_records(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, Any]]:
+    """Yield ``(record_number, row_dict)``; empty cells are left out so schema defaults apply."""
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    header = None
+    record: List[str] = []
+    number = 0
+    async for line in lines:
+        # csv.reader expects the line ending iter_lines split off
+        record.append(f"{line}\n")
+        feed.lines.extend(record)
+        feed.ran_dry = False
+        try:
+            values = next(reader)
+        except csv.Error as e:
+            values = e
+        feed.lines.clear()
+        # The reader only asks for another line while a quoted field is open
+        if feed.ran_dry:
+            continue
+        record = []
+        if isinstance(values, Exception):
+            yield number, values
+            number += 1
+            continue
+        if not values or (len(values) == 1 and not values[0].strip()):
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) > len(header):
+            yield number, ValueError(f"{len(values)} values for {len(header)} columns")
+        else:
+            yield number, {name: value for name, value in zip(header, values) if value != ""}
+        number += 1
+    if record:
+        yield number, ValueError("Unterminated quoted field")
+
+
+async def iter_ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, Any]]:
+    number = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError as e:
+            yield number, e
+        number += 1
+
+
+async def _import_chunk(db: AsyncSession, spec: tuple, chunk: List[Tuple[int, Any]]) -> dict:
+    repository, schema, references, on_inserted = spec
+    parse_errors = [
+        {"index": index, "detail": f"Could not parse record: {raw}"}
+        for index, raw in chunk if isinstance(raw, Exception)
+    ]
+    rows = [(index, raw) for index, raw in chunk if not isinstance(raw, Exception)]
+    try:
+        result = await validate_and_insert(
+            db, repository, schema, rows, references=references, on_inserted=on_inserted
+        )
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.error("Import chunk starting at record %s failed: %s", chunk[0][0], e)
+        result = {
+            "received": len(rows),
+            "inserted": 0,
+            "errors": [{"index": index, "detail": "Chunk rejected by the database"} for index, _ in rows],
+        }
+    result["received"] += len(parse_errors)
+    result["errors"] = sorted(parse_errors + result["errors"], key=lambda error: error["index"])
+    return result
+
+
+async def run_import(
+    db: AsyncSession,
+    entity: schemas.ImportEntity,
+    fmt: schemas.RecordFormat,
+    chunks: AsyncIterator[bytes],
+    import_id: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict:
+    """Parse an upload stream and commit it ``chunk_size`` records at a time."""
+    spec = IMPORT_SPECS[entity]
+    progress = ImportProgress(import_id=import_id or uuid.uuid4().hex, entity=entity.value)
+    _track(progress)
+
+    lines = iter_lines(chunks)
+    records = iter_csv_records(lines) if fmt == schemas.RecordFormat.csv else iter_ndjson_records(lines)
+    chunk: List[Tuple[int, Any]] = []
+    async for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            progress.record(await _import_chunk(db, spec, chunk))
+            logger.info("Import %s: %s processed, %s inserted", progress.import_id, progress.processed, progress.inserted)
+            chunk = []
+    if chunk:
+        progress.record(await _import_chunk(db, spec, chunk))
+
+    progress.done = True
+    logger.info("Import %s finished: %s inserted, %s failed", progress.import_id, progress.inserted, progress.failed)
+    return asdict(progress)
@@ -0,0 +1,31 @@
+from typing import Tuple
+
+import numpy as np
+
+
+def grouped_least_squares(groups: np.ndarray, X: np.ndarray, y: np.ndarray, n_groups: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Fit one ordinary least-squares model per group in a single vectorised pass.
+
+    ``groups`` holds each row's group index, ``X`` is the (rows, k) design matrix
+    and ``y`` the targets. The per-group normal equations are accumulated with
+    ``np.bincount`` and solved as one batched ``np.linalg.solve``. Returns the
+    (n_groups, k) coefficients (NaN where a group cannot be fitted) and a mask of
+    fitted groups.
+    """
+    k = X.shape[1]
+    XtX = np.empty((n_groups, k, k))
+    Xty = np.empty((n_groups, k))
+    for i in range(k):
+        Xty[:, i] = np.bincount(groups, weights=X[:, i] * y, minlength=n_groups)
+        for j in range(i, k):
+            XtX[:, i, j] = XtX[:, j, i] = np.bincount(groups, weights=X[:, i] * X[:, j], minlength=n_groups)
+
+    counts = np.bincount(groups, minlength=n_groups)
+    fitted = counts >= k
+    if fitted.any():
+        # Near-singular systems (e.g. all records on the same day) are not fitted
+        fitted[fitted] = np.linalg.cond(XtX[fitted]) < 1e12
+    coef = np.full((n_groups, k), np.nan)
+    if fitted.any():
+        coef[fitted] = np.linalg.solve(XtX[fitted], Xty[fitted][..., None])[..., 0]
+    return coef, fitted
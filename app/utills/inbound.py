@@ -0,0 +1,182 @@
+import asyncio
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert, select
+
+from app.config.appsettings import settings
+from app.crud.message import conversation_participants
+from app.models import InboundReceipt, Message, User
+from app.models.database import SessionLocal
+from app.utills.dialect import upsert_insert
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_SIZE = 500
+FLUSH_SECONDS = 0.5
+MAX_PENDING = 10000
+FLUSH_ATTEMPTS = 3
+RECENT_IDS = 10000
+DEAD_LETTER_FILE = "inbound_dead_letter.ndjson"
+
+
+class InboundBufferFull(Exception):
+    """The writer is too far behind; the caller should ask the provider to retry."""
+
+
+class InboundWriter:
+    """Buffers webhook messages and persists them in multi-row inserts.
+
+    Each flush records the provider ids in inbound_receipts with INSERT ... ON
+    CONFLICT DO NOTHING RETURNING and only stores messages whose id was new, so
+    a delivery retried by the provider is written once. Ids seen recently by
+    this process are also dropped before they reach the buffer. Messages
+    without a provider id cannot be deduplicated and are stored every time.
+
+    Messages are acknowledged before they are written, so a batch that still
+    fails after ``FLUSH_ATTEMPTS`` is appended to an NDJSON dead-letter file
+    instead of being dropped. Each line is a webhook message and can be
+    replayed by posting it back to the webhook.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        max_batch: int = MAX_BATCH_SIZE,
+        flush_seconds: float = FLUSH_SECONDS,
+        dead_letter_path: Optional[str] = None,
+    ):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.flush_seconds = flush_seconds
+        self.dead_letter_path = dead_letter_path or os.path.join(settings.file_storage_path, DEAD_LETTER_FILE)
+        self._queue: Optional[asyncio.Queue] = None
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=MAX_PENDING)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background loop and flush whatever is still buffered."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if batch:
+            await self._flush(batch)
+
+    def _seen(self, provider_message_id: Optional[str]) -> bool:
+        if provider_message_id is None:
+            return False
+        if provider_message_id in self._recent:
+            return True
+        self._recent[provider_message_id] = None
+        if len(self._recent) > RECENT_IDS:
+            self._recent.popitem(last=False)
+        return False
+
+    def submit(self, messages: List[Dict]) -> int:
+        """Buffer messages for the next flush; returns how many were accepted (duplicates are skipped)."""
+        if self._queue is None:
+            raise InboundBufferFull("Inbound writer is not running")
+        if self._queue.qsize() + len(messages) > self._queue.maxsize:
+            raise InboundBufferFull("Inbound buffer is full")
+        accepted = 0
+        for message in messages:
+            if not self._seen(message.get("provider_message_id")):
+                self._queue.put_nowait(message)
+                accepted += 1
+        return accepted
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            deadline = asyncio.get_running_loop().time() + self.flush_seconds
+            while len(batch) < self.max_batch:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Dict]) -> None:
+        for attempt in range(1, FLUSH_ATTEMPTS + 1):
+            try:
+                await self._write(batch)
+                return
+            except Exception:
+                logger.exception("Inbound flush of %s messages failed (attempt %s)", len(batch), attempt)
+                await asyncio.sleep(0.5 * attempt)
+        # Acknowledged to the provider already; forget the ids so a replay is accepted
+        for message in batch:
+            self._recent.pop(message.get("provider_message_id"), None)
+        await asyncio.to_thread(self._dead_letter, batch)
+        logger.error(
+            "Inbound flush of %s messages failed %s times; written to %s for replay",
+            len(batch), FLUSH_ATTEMPTS, self.dead_letter_path,
+        )
+
+    def _dead_letter(self, batch: List[Dict]) -> None:
+        os.makedirs(os.path.dirname(self.dead_letter_path) or ".", exist_ok=True)
+        with open(self.dead_letter_path, "a", encoding="utf-8") as dead_letters:
+            for message in batch:
+                dead_letters.write(json.dumps(message) + "\n")
+
+    @staticmethod
+    async def _known_users(session, batch: List[Dict]) -> set:
+        user_ids = {m.get(key) for m in batch for key in ("sender_id", "receiver_id")} - {None}
+        if not user_ids:
+            return set()
+        result = await session.execute(select(User.user_id).where(User.user_id.in_(user_ids)))
+        return set(result.scalars().all())
+
+    async def _write(self, batch: List[Dict]) -> None:
+        async with self.session_factory() as session:
+            ids = list(dict.fromkeys(m["provider_message_id"] for m in batch if m.get("provider_message_id")))
+            new_ids = set()
+            if ids:
+                statement = (
+                    upsert_insert(session, InboundReceipt)
+                    .values([{"provider_message_id": provider_message_id} for provider_message_id in ids])
+                    .on_conflict_do_nothing(index_elements=["provider_message_id"])
+                    .returning(InboundReceipt.provider_message_id)
+                )
+                new_ids = set((await session.execute(statement)).scalars().all())
+            known_users = await self._known_users(session, batch)
+            rows = []
+            for message in batch:
+                provider_message_id = message.get("provider_message_id")
+                if provider_message_id is not None:
+                    if provider_message_id not in new_ids:
+                        continue
+                    new_ids.discard(provider_message_id)
+                # An id that matches no user would fail the whole multi-row insert on its
+                # foreign key; store it as the SET NULL a deleted user would leave instead
+                sender_id = message.get("sender_id") if message.get("sender_id") in known_users else None
+                receiver_id = message.get("receiver_id") if message.get("receiver_id") in known_users else None
+                rows.append({
+                    "sender_id": sender_id,
+                    "receiver_id": receiver_id,
+                    "message_content": message["message_content"],
+                    **conversation_participants(sender_id, receiver_id),
+                })
+            if rows:
+                await session.execute(insert(Message), rows)
+            await session.commit()
+            logger.debug("Inbound flush stored %s of %s messages", len(rows), len(batch))
+
+
+inbound_writer = InboundWriter()
@@ -0,0 +1,87 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+Parents = Tuple[Optional[int], Optional[int]]
+
+
+class PedigreeCycleError(ValueError):
+    """The pedigree makes an animal its own ancestor."""
+
+    def __init__(self, animal: int):
+        super().__init__(f"Pedigree of cattle {animal} loops back onto itself")
+        self.animal = animal
+
+
+class KinshipCalculator:
+    """Coefficients of kinship and inbreeding over an in-memory pedigree, by the tabular method.
+
+    ``parents`` maps each animal to its ``(dam_id, sire_id)``; animals missing
+    from it are founders. Results are memoised per pair, so scoring one cow
+    against many candidate sires reuses the shared part of their pedigrees.
+    A pedigree that loops back onto an animal raises ``PedigreeCycleError``.
+    """
+
+    def __init__(self, parents: Dict[int, Parents]):
+        self.parents = parents
+        self._generation: Dict[int, int] = {}
+        self._kinship: Dict[Tuple[int, int], float] = {}
+
+    def generation(self, animal: int) -> int:
+        """Founders are generation 0; everyone else is one more than their older parent."""
+        if animal in self._generation:
+            return self._generation[animal]
+        # Iterative post-order walk; an edge back onto the current path means
+        # the records make an animal its own ancestor.
+        on_path = set()
+        stack = [animal]
+        while stack:
+            node = stack[-1]
+            if node in self._generation:
+                stack.pop()
+                continue
+            on_path.add(node)
+            pending = [
+                parent for parent in self.parents.get(node, (None, None))
+                if parent is not None and parent not in self._generation
+            ]
+            for parent in pending:
+                if parent in on_path:
+                    raise PedigreeCycleError(parent)
+            if pending:
+                stack.extend(pending)
+                continue
+            self._generation[node] = 1 + max(
+                (self._generation.get(parent, -1) for parent in self.parents.get(node, (None, None)) if parent is not None),
+                default=-1,
+            )
+            on_path.discard(node)
+            stack.pop()
+        return self._generation[animal]
+
+    def kinship(self, a: Optional[int], b: Optional[int]) -> float:
+        if a is None or b is None:
+            return 0.0
+        key = (a, b) if a <= b else (b, a)
+        if key in self._kinship:
+            return self._kinship[key]
+        # Walking the generations first turns a cyclic pedigree into an error instead of endless recursion
+        generation_a, generation_b = self.generation(a), self.generation(b)
+        if a == b:
+            dam, sire = self.parents.get(a, (None, None))
+            value = 0.5 * (1.0 + self.kinship(dam, sire))
+        else:
+            # Expand the younger animal, which cannot be an ancestor of the other
+            if generation_a < generation_b:
+                a, b = b, a
+            dam, sire = self.parents.get(a, (None, None))
+            value = 0.5 * (self.kinship(dam, b) + self.kinship(sire, b))
+        self._kinship[key] = value
+        return value
+
+    def inbreeding(self, animal: int) -> float:
+        """Wright's F: the kinship between the animal's parents."""
+        self.generation(animal)
+        dam, sire = self.parents.get(animal, (None, None))
+        return self.kinship(dam, sire)
+
+    def score(self, animal: int, candidates: Iterable[int]) -> Dict[int, float]:
+        return {candidate: self.kinship(animal, candidate) for candidate in candidates}
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import update, or_, and_
+from sqlalchemy.future import select
+
+from app.config.appsettings import settings
+from app.models import OutboundMessage, OutboundStatus
+from app.models.database import SessionLocal
+from app.utills.rate_limit import TokenBucketLimiter
+from app.utills.whatsapp.transport import TransportError, get_transport
+
+logger = logging.getLogger(__name__)
+
+CLAIM_BATCH_SIZE = 100
+LEASE_SECONDS = 120
+
+
+class OutboundDispatcher:
+    """Drains the outbound_messages table with a pool of async workers.
+
+    A poller claims due rows in one UPDATE ... RETURNING (``FOR UPDATE SKIP
+    LOCKED`` on PostgreSQL, so several processes can share the queue) and
+    leases them for ``LEASE_SECONDS``; rows whose lease lapses, e.g. after a
+    crash, are claimed again. A worker renews its lease right before sending
+    and only writes the outcome while that lease is still the row's, so a row
+    re-claimed from a stalled worker is neither sent twice by it nor has its
+    new owner's result overwritten. Senders over their token bucket are not
+    waited on: the row goes back to the queue for when a token is due, and
+    the worker moves on. Failed sends are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        transport=None,
+        session_factory=SessionLocal,
+        workers: int = settings.outbound_workers,
+        max_attempts: int = settings.outbound_max_attempts,
+        backoff_seconds: float = settings.outbound_backoff_seconds,
+        poll_seconds: float = settings.outbound_poll_seconds,
+        limiter: Optional[TokenBucketLimiter] = None,
+    ):
+        self.transport = transport
+        self.session_factory = session_factory
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.poll_seconds = poll_seconds
+        self.limiter = limiter or TokenBucketLimiter(
+            settings.outbound_rate_per_sender, settings.outbound_burst_per_sender
+        )
+        self._queue: Optional[asyncio.Queue] = None
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    def notify(self) -> None:
+        """Wake the poller early, e.g. right after a message is enqueued."""
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        if self.transport is None:
+            self.transport = get_transport()
+        self._queue = asyncio.Queue(maxsize=self.workers * 2)
+        self._tasks = [asyncio.create_task(self._poll())]
+        self._tasks += [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        logger.info("Outbound dispatcher started with %s workers", self.workers)
+
+    async def stop(self) -> None:
+        # Rows claimed but not sent keep their lease and are retried once it lapses
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _claim(self) -> List[OutboundMessage]:
+        now = datetime.now()
+        due = (
+            select(OutboundMessage.outbound_id)
+            .where(or_(
+                and_(OutboundMessage.status == OutboundStatus.Queued, OutboundMessage.next_attempt_at <= now),
+                and_(OutboundMessage.status == OutboundStatus.Sending, OutboundMessage.locked_until < now),
+            ))
+            .order_by(OutboundMessage.next_attempt_at)
+            .limit(CLAIM_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        async with self.session_factory() as session:
+            result = await session.scalars(
+                update(OutboundMessage)
+                .where(OutboundMessage.outbound_id.in_(due.scalar_subquery()))
+                .values(status=OutboundStatus.Sending, locked_until=now + timedelta(seconds=LEASE_SECONDS))
+                .returning(OutboundMessage)
+            )
+            claimed = result.all()
+            await session.commit()
+            return claimed
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                claimed = await self._claim()
+            except Exception:
+                logger.exception("Claiming outbound messages failed")
+                claimed = []
+            for message in claimed:
+                await self._queue.put(message)
+            if len(claimed) < CLAIM_BATCH_SIZE:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    async def _work(self) -> None:
+        while True:
+            message = await self._queue.get()
+            try:
+                await self._deliver(message)
+            except Exception:
+                logger.exception("Outbound message %s could not be processed", message.outbound_id)
+            finally:
+                self._queue.task_done()
+
+    async def _update_leased(self, message: OutboundMessage, lease: datetime, values: dict) -> bool:
+        """Apply ``values`` only while the row is still Sending under ``lease``; returns whether it was."""
+        async with self.session_factory() as session:
+            result = await session.execute(
+                update(OutboundMessage)
+                .where(
+                    OutboundMessage.outbound_id == message.outbound_id,
+                    OutboundMessage.status == OutboundStatus.Sending,
+                    OutboundMessage.locked_until == lease,
+                )
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        return result.rowcount == 1
+
+    async def _deliver(self, message: OutboundMessage) -> None:
+        lease = message.locked_until
+        now = datetime.now()
+        wait = self.limiter.try_acquire(message.sender_id)
+        if wait > 0:
+            # Throttled: requeue for when the sender has a token rather than holding a worker
+            await self._update_leased(message, lease, {
+                "status": OutboundStatus.Queued,
+                "next_attempt_at": now + timedelta(seconds=wait),
+                "locked_until": None,
+            })
+            return
+
+        # The row may have waited in the local queue; make sure it is still ours before sending
+        renewed = now + timedelta(seconds=LEASE_SECONDS)
+        if not await self._update_leased(message, lease, {"locked_until": renewed}):
+            logger.info("Outbound message %s was re-claimed elsewhere; skipping", message.outbound_id)
+            return
+        lease = renewed
+
+        attempts = message.attempts + 1
+        try:
+            response = await self.transport.send(message.to_phone, message.body)
+        except TransportError as e:
+            values = {"attempts": attempts, "last_error": str(e)[:500], "locked_until": None}
+            if attempts >= self.max_attempts:
+                values["status"] = OutboundStatus.Failed
+                logger.warning("Outbound message %s failed after %s attempts: %s", message.outbound_id, attempts, e)
+            else:
+                # Exponential backoff with jitter so retries from one outage spread out
+                delay = self.backoff_seconds * 2 ** (attempts - 1) * random.uniform(0.8, 1.2)
+                values["status"] = OutboundStatus.Queued
+                values["next_attempt_at"] = datetime.now() + timedelta(seconds=delay)
+        else:
+            values = {
+                "attempts": attempts,
+                "status": OutboundStatus.Sent,
+                "provider_sid": response.get("sid"),
+                "provider_status": response.get("status"),
+                "sent_at": datetime.now(),
+                "locked_until": None,
+                "last_error": None,
+            }
+        if not await self._update_leased(message, lease, values):
+            logger.warning("Outbound message %s lost its lease while sending; outcome not recorded", message.outbound_id)
+
+
+outbound_dispatcher = OutboundDispatcher()
@@ -0,0 +1,128 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime, String, and_, literal, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.types import TypeDecorator
+
+
+class _CursorDateTime(TypeDecorator):
+    """Binds a cursor's datetime the way SQLite stored the row it came from.
+
+    SQLite keeps datetimes as text and compares them as text. CURRENT_TIMESTAMP
+    (``func.now()`` server defaults) writes ``YYYY-MM-DD HH:MM:SS`` while the
+    DateTime type always binds ``.ffffff``, so the cursor row would sort before
+    itself; ``isoformat(" ")`` only adds the fraction when there is one. Values
+    bound from Python keep their ``.ffffff``, so the two formats only collide for
+    a Python datetime landing exactly on a second.
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(DateTime())
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and dialect.name == "sqlite":
+            return value.isoformat(" ")
+        return value
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _from_json(value: Any, column) -> Any:
+    """Turn a decoded cursor value back into the column's Python type for binding."""
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is Decimal:
+        return Decimal(value)
+    return python_type(value)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_to_json(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor shape mismatch")
+        return [_from_json(value, column) for value, column in zip(values, columns)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def apply_keyset(statement, sort_column, pk_column, cursor: Optional[str], descending: bool = False):
+    """Order by ``(sort_column, pk_column)`` and resume strictly after ``cursor``.
+
+    NULL sort values come last in both directions, so a cursor that lands on a
+    NULL only continues through the remaining NULL rows. NOT NULL sort columns
+    get a plain ORDER BY, which a composite index can serve in either direction.
+    """
+    nullable = getattr(sort_column, "nullable", True)
+    if descending:
+        ordering = (sort_column.desc().nulls_last() if nullable else sort_column.desc(), pk_column.desc())
+    else:
+        ordering = (sort_column.asc().nulls_last() if nullable else sort_column.asc(), pk_column.asc())
+    statement = statement.order_by(*ordering)
+    if cursor is None:
+        return statement
+
+    sort_value, pk_value = decode_cursor(cursor, (sort_column, pk_column))
+    if isinstance(sort_value, datetime):
+        sort_value = literal(sort_value, _CursorDateTime())
+    pk_after = pk_column < pk_value if descending else pk_column > pk_value
+    if sort_value is None:
+        return statement.where(and_(sort_column.is_(None), pk_after))
+    sort_after = sort_column < sort_value if descending else sort_column > sort_value
+    if sort_column is pk_column:
+        return statement.where(sort_after)
+    if not nullable:
+        return statement.where(or_(sort_after, and_(sort_column == sort_value, pk_after)))
+    return statement.where(or_(
+        sort_after,
+        and_(sort_column == sort_value, pk_after),
+        sort_column.is_(None),
+    ))
+
+
+async def paginate(
+    db: AsyncSession,
+    statement,
+    sort_column,
+    pk_column,
+    cursor: Optional[str] = None,
+    limit: int = 10,
+    descending: bool = False,
+) -> dict:
+    """Run a keyset-paginated select and return ``{"items", "next_cursor"}``."""
+    statement = apply_keyset(statement, sort_column, pk_column, cursor, descending).limit(limit + 1)
+    result = await db.execute(statement)
+    items = result.unique().scalars().all()
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, sort_column.key), getattr(last, pk_column.key)])
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,44 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Hashable, Set
+
+logger = logging.getLogger(__name__)
+
+
+class Broker:
+    """In-process publish/subscribe keyed by topic (e.g. a user id).
+
+    Each subscriber gets its own bounded queue; a subscriber that falls behind
+    loses messages rather than slowing publishers. Only subscribers in the
+    same process are reached, so with several workers a client sees events
+    published by the worker it is connected to.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: Dict[Hashable, Set[asyncio.Queue]] = defaultdict(set)
+
+    def subscribe(self, topic: Hashable) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[topic].add(queue)
+        return queue
+
+    def unsubscribe(self, topic: Hashable, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(topic)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[topic]
+
+    def publish(self, topic: Hashable, message: Any) -> int:
+        """Hand ``message`` to every subscriber of ``topic``; returns how many received it."""
+        delivered = 0
+        for queue in self._subscribers.get(topic, ()):
+            try:
+                queue.put_nowait(message)
+                delivered += 1
+            except asyncio.QueueFull:
+                logger.warning("Dropping message for slow subscriber on %s", topic)
+        return delivered
@@ -0,0 +1,30 @@
+import time
+from typing import Dict, Hashable, Tuple
+
+
+class TokenBucketLimiter:
+    """Per-key token bucket: ``rate`` tokens per second, up to ``burst`` saved up.
+
+    State is per process, so with several workers the effective limit is
+    multiplied by the number of processes running a dispatcher.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[Hashable, Tuple[float, float]] = {}
+
+    def try_acquire(self, key: Hashable) -> float:
+        """Take a token if one is available without waiting.
+
+        Returns 0 when a token was taken, otherwise the seconds until one will
+        be; nothing is reserved in that case, so the caller can come back later.
+        """
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+        if tokens >= 1.0:
+            self._buckets[key] = (tokens - 1.0, now)
+            return 0.0
+        self._buckets[key] = (tokens, now)
+        return (1.0 - tokens) / self.rate
@@ -0,0 +1,17 @@
+"""Recount favorite_count on every cattle row from the favorites table.
+
+Usage: python -m app.utills.rebuild_favorite_counts
+"""
+import asyncio
+
+from app.crud.favorite import recount_favorite_counts
+from app.models.database import SessionLocal
+
+
+async def main() -> None:
+    async with SessionLocal() as session:
+        await recount_favorite_counts(session)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
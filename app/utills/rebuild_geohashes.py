@@ -0,0 +1,17 @@
+"""Recompute the geohash of every location, e.g. after loading locations outside the API.
+
+Usage: python -m app.utills.rebuild_geohashes
+"""
+import asyncio
+
+from app.crud.location import rebuild_location_geohashes
+from app.models.database import SessionLocal
+
+
+async def main() -> None:
+    async with SessionLocal() as session:
+        await rebuild_location_geohashes(session)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,17 @@
+"""Rebuild the daily milk rollups from milk_production.
+
+Usage: python -m app.utills.rebuild_milk_rollups
+"""
+import asyncio
+
+from app.crud.milk_rollup import rebuild_milk_rollups
+from app.models.database import SessionLocal
+
+
+async def main() -> None:
+    async with SessionLocal() as session:
+        await rebuild_milk_rollups(session)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
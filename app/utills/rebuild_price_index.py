@@ -0,0 +1,19 @@
+"""Recompute the market price index so trailing windows roll forward.
+
+Sales refresh their own bucket; run this daily (e.g. from cron) for the rest.
+
+Usage: python -m app.utills.rebuild_price_index
+"""
+import asyncio
+
+from app.crud.price_index import rebuild_price_index
+from app.models.database import SessionLocal
+
+
+async def main() -> None:
+    async with SessionLocal() as session:
+        await rebuild_price_index(session)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,51 @@
+import asyncio
+import itertools
+import random
+from typing import List, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config.appsettings import settings
+
+
+class TransportError(Exception):
+    """A send failed in a way worth retrying."""
+
+
+class TwilioTransport:
+    """Sends through Twilio; the client is blocking, so each call runs in the thread pool."""
+
+    def __init__(self):
+        from app.utills.whatsapp.whatsapp import WhatsAppAPI
+        self.api = WhatsAppAPI()
+
+    async def send(self, to: str, body: str) -> dict:
+        try:
+            return await run_in_threadpool(self.api.send_message, to=to, message=body)
+        except Exception as e:
+            raise TransportError(str(e)) from e
+
+
+class FakeTransport:
+    """Accepts every message after a short delay, for local runs and offline load tests."""
+
+    def __init__(self, latency_seconds: float = 0.05, failure_rate: float = 0.0):
+        self.latency_seconds = latency_seconds
+        self.failure_rate = failure_rate
+        self.sent: List[Tuple[str, str]] = []
+        self._ids = itertools.count(1)
+
+    async def send(self, to: str, body: str) -> dict:
+        await asyncio.sleep(self.latency_seconds)
+        if random.random() < self.failure_rate:
+            raise TransportError("Simulated provider failure")
+        self.sent.append((to, body))
+        return {"sid": f"FAKE{next(self._ids):08d}", "status": "sent"}
+
+
+def get_transport():
+    if settings.whatsapp_transport == "fake":
+        return FakeTransport()
+    if settings.whatsapp_transport == "twilio":
+        return TwilioTransport()
+    raise ValueError(f"Unknown whatsapp_transport: {settings.whatsapp_transport}")
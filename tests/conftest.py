@@ -0,0 +1,124 @@
+import os
+import tempfile
+
+# The application reads its settings at import time; point it at a throwaway
+# SQLite database and keep the outbound dispatcher off unless a test starts it.
+_DB_DIR = tempfile.mkdtemp(prefix="nikonangombe-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ.pop("DATABASE_REPLICA_URL", None)
+os.environ["WHATSAPP_TRANSPORT"] = "fake"
+os.environ["OUTBOUND_WORKERS"] = "0"
+for _name, _value in {
+    "SECRET_KEY": "test-secret",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "APP_ENV": "test",
+    "DEBUG": "true",
+    "API_URL": "http://test",
+    "API_KEY": "test",
+    "FILE_STORAGE_PATH": os.path.join(_DB_DIR, "files"),
+    "TWILIO_ACCOUNT_SID": "AC00000000000000000000000000000000",
+    "TWILIO_AUTH_TOKEN": "test",
+    "WHATSAPP_NUMBER": "whatsapp:+10000000000",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+import httpx
+import pytest
+from sqlalchemy import BigInteger
+from sqlalchemy.ext.compiler import compiles
+
+
+# SQLite only auto-increments a primary key declared exactly as INTEGER
+@compiles(BigInteger, "sqlite")
+def _compile_big_integer(type_, compiler, **kw):
+    return "INTEGER"
+
+
+from app.main import app  # noqa: E402
+from app.crud import favorite, lactation, notification  # noqa: E402
+from app.models.database import SessionLocal, engine  # noqa: E402
+
+
+def _clear_caches() -> None:
+    # In-process caches are keyed by ids that every test's fresh schema reuses
+    lactation.clear_lactation_curves()
+    favorite._leaderboard.clear()
+    notification._unread_counts.clear()
+
+
+@pytest.fixture
+async def client():
+    """An HTTP client on a freshly created schema; tables are dropped afterwards."""
+    _clear_caches()
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+            yield c
+    # Pooled aiosqlite connections belong to this test's event loop
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db(client):
+    async with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def make_user(client):
+    count = 0
+
+    async def _make_user(role: str = "Farmer", **fields) -> dict:
+        nonlocal count
+        count += 1
+        payload = {
+            "username": f"user{count}",
+            "password": "secret",
+            "email": f"user{count}@example.com",
+            "role": role,
+            "phone": f"+2547{count:08d}",
+        }
+        payload.update(fields)
+        response = await client.post("/users/", json=payload)
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    return _make_user
+
+
+@pytest.fixture
+def make_cattle(client):
+    async def _make_cattle(user_id: int, **fields) -> dict:
+        payload = {
+            "name": "Daisy",
+            "breed": "Friesian",
+            "birth_date": "2021-01-01",
+            "gender": "Female",
+            "quality_score": 50,
+            "status": "Available",
+            "user_id": user_id,
+        }
+        payload.update(fields)
+        response = await client.post("/cattle/cattles/", json=payload)
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    return _make_cattle
+
+
+async def _token_headers(client, username: str) -> dict:
+    response = await client.post("/users/token", data={"username": username, "password": "secret"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+async def admin_headers(client, make_user):
+    admin = await make_user(role="Admin", username="admin", email="admin@example.com")
+    return await _token_headers(client, admin["username"])
+
+
+@pytest.fixture
+async def farmer_headers(client, make_user):
+    farmer = await make_user(role="Farmer", username="farmer", email="farmer@example.com")
+    return await _token_headers(client, farmer["username"])
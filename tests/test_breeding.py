@@ -0,0 +1,78 @@
+from datetime import date
+
+from sqlalchemy import delete
+
+from app.crud.breeding import compute_schedule
+from app.models import BreedingSchedule
+
+
+def test_schedule_after_calving_waits_for_postpartum_heat():
+    schedule = compute_schedule(None, date(2024, 1, 1))
+    assert schedule["next_heat_date"] == date(2024, 2, 12)
+    assert schedule["pregnancy_check_date"] is None
+    assert schedule["expected_calving_date"] is None
+
+
+def test_schedule_after_insemination_tracks_pending_pregnancy():
+    schedule = compute_schedule(date(2024, 3, 1), date(2024, 1, 1))
+    assert schedule["next_heat_date"] == date(2024, 3, 22)
+    assert schedule["pregnancy_check_date"] == date(2024, 4, 5)
+    assert schedule["expected_calving_date"] == date(2024, 12, 9)
+
+
+def test_insemination_before_last_calving_is_ignored():
+    schedule = compute_schedule(date(2023, 3, 1), date(2024, 1, 1))
+    assert schedule["next_heat_date"] == date(2024, 2, 12)
+    assert schedule["expected_calving_date"] is None
+
+
+async def test_schedule_follows_event_writes(client, make_user, make_cattle):
+    farmer = await make_user()
+    cow = await make_cattle(farmer["user_id"])
+    url = f"/breeding/schedule/{cow['cattle_id']}"
+    assert (await client.get(url)).status_code == 404
+
+    await client.post("/calving/calvings/", json={"cattle_id": cow["cattle_id"], "calving_date": "2024-01-01"})
+    assert (await client.get(url)).json()["next_heat_date"] == "2024-02-12"
+
+    insemination = (await client.post("/insemination/inseminations/", json={
+        "cattle_id": cow["cattle_id"], "insemination_date": "2024-03-01",
+    })).json()
+    assert (await client.get(url)).json()["expected_calving_date"] == "2024-12-09"
+
+    await client.delete(f"/insemination/inseminations/{insemination['insemination_id']}")
+    schedule = (await client.get(url)).json()
+    assert schedule["last_insemination_date"] is None
+    assert schedule["next_heat_date"] == "2024-02-12"
+
+
+async def test_due_events_in_window(client, make_user, make_cattle):
+    farmer = await make_user()
+    neighbour = await make_user()
+    bred = await make_cattle(farmer["user_id"], name="Bred")
+    fresh = await make_cattle(farmer["user_id"], name="Fresh")
+    other = await make_cattle(neighbour["user_id"], name="Other")
+    await client.post("/insemination/inseminations/", json={"cattle_id": bred["cattle_id"], "insemination_date": "2024-03-01"})
+    await client.post("/calving/calvings/", json={"cattle_id": fresh["cattle_id"], "calving_date": "2024-02-08"})
+    await client.post("/insemination/inseminations/", json={"cattle_id": other["cattle_id"], "insemination_date": "2024-03-01"})
+
+    response = await client.get(f"/breeding/due/farmer/{farmer['user_id']}?start=2024-03-20&days=17")
+    assert response.status_code == 200
+    assert response.json() == [
+        {"cattle_id": fresh["cattle_id"], "name": "Fresh", "event": "heat", "due_date": "2024-03-21"},
+        {"cattle_id": bred["cattle_id"], "name": "Bred", "event": "heat", "due_date": "2024-03-22"},
+        {"cattle_id": bred["cattle_id"], "name": "Bred", "event": "pregnancy_check", "due_date": "2024-04-05"},
+    ]
+
+
+async def test_rebuild_is_admin_only_and_restores_schedules(client, db, make_user, make_cattle, admin_headers, farmer_headers):
+    farmer = await make_user()
+    cow = await make_cattle(farmer["user_id"])
+    await client.post("/insemination/inseminations/", json={"cattle_id": cow["cattle_id"], "insemination_date": "2024-03-01"})
+    await db.execute(delete(BreedingSchedule))
+    await db.commit()
+
+    assert (await client.post("/breeding/schedule/rebuild")).status_code == 401
+    assert (await client.post("/breeding/schedule/rebuild", headers=farmer_headers)).status_code == 403
+    assert (await client.post("/breeding/schedule/rebuild", headers=admin_headers)).status_code == 204
+    assert (await client.get(f"/breeding/schedule/{cow['cattle_id']}")).json()["pregnancy_check_date"] == "2024-04-05"
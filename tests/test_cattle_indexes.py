@@ -0,0 +1,48 @@
+from sqlalchemy import text
+from sqlalchemy.future import select
+
+from app.crud.cattle import filter_cattle
+from app.models import Cattle
+from app.schema import schemas
+from app.utills.pagination import apply_keyset
+
+
+async def _query_plan(db, statement) -> str:
+    compiled = statement.compile(bind=db.get_bind(), compile_kwargs={"literal_binds": True})
+    result = await db.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))
+    return "\n".join(row[-1] for row in result.all())
+
+
+async def test_available_breed_listing_by_quality_uses_composite_index(client, db, make_user, make_cattle):
+    farmer = await make_user()
+    for i in range(30):
+        await make_cattle(
+            farmer["user_id"], breed=["Friesian", "Jersey", "Ayrshire"][i % 3],
+            status=["Available", "Sold"][i % 2], quality_score=40 + i,
+        )
+    await db.execute(text("ANALYZE"))
+
+    filters = schemas.CattleFilter(status=schemas.CattleStatusEnum.Available, breed="Friesian")
+    statement = apply_keyset(
+        filter_cattle(select(Cattle), filters), Cattle.quality_score, Cattle.cattle_id, None, descending=True,
+    ).limit(21)
+
+    plan = await _query_plan(db, statement)
+    assert "USING INDEX ix_cattle_status_breed_quality (status=? AND breed=?)" in plan, plan
+    # The index also supplies the ORDER BY, so no sort step is needed
+    assert "TEMP B-TREE" not in plan, plan
+
+
+async def test_available_listing_by_quality_uses_status_index(client, db, make_user, make_cattle):
+    farmer = await make_user()
+    for i in range(10):
+        await make_cattle(farmer["user_id"], quality_score=40 + i)
+
+    filters = schemas.CattleFilter(status=schemas.CattleStatusEnum.Available)
+    statement = apply_keyset(
+        filter_cattle(select(Cattle), filters), Cattle.quality_score, Cattle.cattle_id, None, descending=True,
+    ).limit(21)
+
+    plan = await _query_plan(db, statement)
+    assert "USING INDEX ix_cattle_status_quality (status=?)" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
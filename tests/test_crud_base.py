@@ -0,0 +1,62 @@
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+
+from app.crud.cattle import cattle_repository
+
+
+async def _herd(make_user, make_cattle, count: int) -> list:
+    farmer = await make_user()
+    return [(await make_cattle(farmer["user_id"], name=f"cow{i}"))["cattle_id"] for i in range(count)]
+
+
+async def test_get_many_keeps_the_requested_order_and_skips_missing_ids(client, db, make_user, make_cattle):
+    ids = await _herd(make_user, make_cattle, 3)
+
+    cows = await cattle_repository.get_many(db, [ids[2], 999999, ids[0], ids[2]])
+    assert [cow.cattle_id for cow in cows] == [ids[2], ids[0], ids[2]]
+    assert await cattle_repository.get_many(db, []) == []
+
+
+async def test_bulk_update_returns_the_matched_row_count(client, db, make_user, make_cattle):
+    ids = await _herd(make_user, make_cattle, 3)
+
+    updated = await cattle_repository.bulk_update(db, [
+        {"cattle_id": ids[0], "name": "Daisy"},
+        {"cattle_id": ids[2], "name": "Rosie"},
+        {"cattle_id": 999999, "name": "Nobody"},
+    ])
+    assert updated == 2
+    assert [cow.name for cow in await cattle_repository.get_many(db, ids)] == ["Daisy", "cow1", "Rosie"]
+    assert await cattle_repository.bulk_update(db, []) == 0
+
+
+async def test_update_many(client, db, make_user, make_cattle):
+    ids = await _herd(make_user, make_cattle, 3)
+
+    assert await cattle_repository.update_many(db, [ids[0], ids[1], 999999], {"quality_score": 90}) == 2
+    assert await cattle_repository.update_many(db, [], {"quality_score": 10}) == 0
+    assert await cattle_repository.update_many(db, ids, {}) == 0
+    db.expire_all()
+    assert [cow.quality_score for cow in await cattle_repository.get_many(db, ids)] == [90, 90, 50]
+
+
+async def test_uncommitted_writes_roll_back_with_the_caller(client, db, make_user, make_cattle):
+    ids = await _herd(make_user, make_cattle, 2)
+
+    await cattle_repository.update(db, ids[0], {"name": "Renamed"}, commit=False)
+    await cattle_repository.bulk_update(db, [{"cattle_id": ids[1], "name": "Renamed"}], commit=False)
+    await cattle_repository.update_many(db, ids, {"quality_score": 1}, commit=False)
+    created = await cattle_repository.create(db, {
+        "name": "Calf", "birth_date": date(2024, 1, 1), "gender": "Female", "status": "Available", "user_id": None,
+    }, commit=False)
+    created_id = created.cattle_id
+    await cattle_repository.delete(db, ids[1], commit=False)
+    await db.rollback()
+
+    cows = await cattle_repository.get_many(db, ids)
+    assert [(cow.name, cow.quality_score) for cow in cows] == [("cow0", 50), ("cow1", 50)]
+    with pytest.raises(HTTPException) as missing:
+        await cattle_repository.get(db, created_id)
+    assert missing.value.status_code == 404
@@ -0,0 +1,21 @@
+async def test_users_export_requires_admin(client, make_user, farmer_headers, admin_headers):
+    await make_user(address="Nakuru county")
+
+    assert (await client.get("/export/users")).status_code == 401
+    assert (await client.get("/export/users", headers=farmer_headers)).status_code == 403
+
+    response = await client.get("/export/users?format=csv", headers=admin_headers)
+    assert response.status_code == 200
+    lines = response.text.strip().splitlines()
+    assert lines[0].startswith("username,")
+    assert len(lines) == 4  # header plus the farmer, admin and extra user
+
+
+async def test_cattle_export_streams_for_signed_in_users(client, make_cattle, farmer_headers):
+    for i in range(3):
+        await make_cattle(None, name=f"Cow{i}")
+
+    assert (await client.get("/export/cattle")).status_code == 401
+    response = await client.get("/export/cattle", headers=farmer_headers)
+    assert response.status_code == 200
+    assert [line for line in response.text.splitlines() if line][-1].startswith('{"name": "Cow2"')
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.models import Favorite
+
+
+async def _favorite_count(client, cattle_id: int) -> int:
+    return (await client.get(f"/cattle/cattles/{cattle_id}")).json()["favorite_count"]
+
+
+async def test_favorite_writes_maintain_counts(client, make_user, make_cattle):
+    farmer = await make_user()
+    buyer = await make_user(role="Client")
+    cow = await make_cattle(farmer["user_id"])
+    heifer = await make_cattle(farmer["user_id"], name="Heifer")
+
+    first = (await client.post("/favorite/favorites/", json={"client_id": buyer["user_id"], "cattle_id": cow["cattle_id"]})).json()
+    await client.post("/favorite/favorites/", json={"client_id": farmer["user_id"], "cattle_id": cow["cattle_id"]})
+    assert await _favorite_count(client, cow["cattle_id"]) == 2
+
+    await client.put(f"/favorite/favorites/{first['favorite_id']}", json={"client_id": buyer["user_id"], "cattle_id": heifer["cattle_id"]})
+    assert (await _favorite_count(client, cow["cattle_id"]), await _favorite_count(client, heifer["cattle_id"])) == (1, 1)
+
+    await client.delete(f"/favorite/favorites/{first['favorite_id']}")
+    assert await _favorite_count(client, heifer["cattle_id"]) == 0
+
+
+async def test_recount_backfills_existing_favorites(client, db, make_user, make_cattle, admin_headers, farmer_headers):
+    farmer = await make_user()
+    buyer = await make_user(role="Client")
+    cow = await make_cattle(farmer["user_id"])
+    heifer = await make_cattle(farmer["user_id"], name="Heifer")
+    # Rows written before favorite_count was maintained
+    await db.execute(insert(Favorite), [
+        {"client_id": buyer["user_id"], "cattle_id": cow["cattle_id"]},
+        {"client_id": farmer["user_id"], "cattle_id": cow["cattle_id"]},
+        {"client_id": buyer["user_id"], "cattle_id": heifer["cattle_id"]},
+    ])
+    await db.commit()
+    assert await _favorite_count(client, cow["cattle_id"]) == 0
+
+    assert (await client.post("/favorite/counts/rebuild")).status_code == 401
+    assert (await client.post("/favorite/counts/rebuild", headers=farmer_headers)).status_code == 403
+    assert (await client.post("/favorite/counts/rebuild", headers=admin_headers)).status_code == 204
+    assert (await _favorite_count(client, cow["cattle_id"]), await _favorite_count(client, heifer["cattle_id"])) == (2, 1)
+
+
+async def test_leaderboard_ranks_weekly_favorites_of_available_cattle(client, db, make_user, make_cattle, admin_headers):
+    farmer = await make_user()
+    buyer = await make_user(role="Client")
+    popular = await make_cattle(farmer["user_id"], name="Popular")
+    quiet = await make_cattle(farmer["user_id"], name="Quiet")
+    sold = await make_cattle(farmer["user_id"], name="Sold", status="Sold")
+    old = datetime.now() - timedelta(days=30)
+    await db.execute(insert(Favorite), [
+        {"client_id": buyer["user_id"], "cattle_id": popular["cattle_id"]},
+        {"client_id": farmer["user_id"], "cattle_id": popular["cattle_id"]},
+        {"client_id": buyer["user_id"], "cattle_id": quiet["cattle_id"]},
+        {"client_id": buyer["user_id"], "cattle_id": quiet["cattle_id"], "created_at": old},
+        {"client_id": farmer["user_id"], "cattle_id": quiet["cattle_id"], "created_at": old},
+        {"client_id": buyer["user_id"], "cattle_id": sold["cattle_id"]},
+    ])
+    await db.commit()
+    # Clears the cached ranking along with the counts
+    await client.post("/favorite/counts/rebuild", headers=admin_headers)
+
+    board = (await client.get("/favorite/leaderboard/")).json()
+    assert [(entry["cattle"]["name"], entry["favorites_this_week"]) for entry in board] == [("Popular", 2), ("Quiet", 1)]
+    assert board[1]["cattle"]["favorite_count"] == 3
@@ -0,0 +1,56 @@
+from datetime import date, timedelta
+
+import pytest
+
+
+async def _weigh(client, cattle_id: int, day: date, weight: float) -> None:
+    response = await client.post("/weight/weight_records/", json={
+        "cattle_id": cattle_id, "weight_date": day.isoformat(), "weight": weight,
+    })
+    assert response.status_code == 200, response.text
+
+
+async def test_growth_fit_and_market_projection(client, make_user, make_cattle):
+    farmer = await make_user()
+    steer = await make_cattle(farmer["user_id"], name="Steer", gender="Male")
+    thin = await make_cattle(farmer["user_id"], name="Thin")
+    single = await make_cattle(farmer["user_id"], name="Single")
+    start = date(2024, 1, 1)
+    for day in (0, 10, 20, 30):
+        await _weigh(client, steer["cattle_id"], start + timedelta(days=day), 200 + 2 * day)
+        await _weigh(client, thin["cattle_id"], start + timedelta(days=day), 300 - day)
+    await _weigh(client, single["cattle_id"], start, 150)
+
+    response = await client.get(f"/weight/growth/farmer/{farmer['user_id']}")
+    assert response.status_code == 200
+    by_id = {row["cattle_id"]: row for row in response.json()}
+
+    gaining = by_id[steer["cattle_id"]]
+    assert gaining["record_count"] == 4
+    assert gaining["latest_weight"] == 260
+    assert gaining["average_daily_gain"] == pytest.approx(2.0)
+    assert gaining["deviation_kg"] == pytest.approx(0.0, abs=1e-6)
+    assert gaining["residual_sd_kg"] == pytest.approx(0.0, abs=1e-6)
+    # 140 kg short of 400 kg at 2 kg/day
+    assert gaining["projected_market_date"] == (start + timedelta(days=30 + 70)).isoformat()
+
+    losing = by_id[thin["cattle_id"]]
+    assert losing["average_daily_gain"] == pytest.approx(-1.0)
+    assert losing["projected_market_date"] is None
+
+    unfitted = by_id[single["cattle_id"]]
+    assert unfitted["average_daily_gain"] is None
+    assert unfitted["projected_market_date"] is None
+
+
+async def test_growth_projection_uses_target_weight(client, make_user, make_cattle):
+    farmer = await make_user()
+    steer = await make_cattle(farmer["user_id"])
+    start = date(2024, 1, 1)
+    for day in (0, 10):
+        await _weigh(client, steer["cattle_id"], start + timedelta(days=day), 200 + day)
+
+    [row] = (await client.get(f"/weight/growth/farmer/{farmer['user_id']}?target_weight=205")).json()
+    assert row["projected_market_date"] is None  # already past the target
+    [row] = (await client.get(f"/weight/growth/farmer/{farmer['user_id']}?target_weight=215")).json()
+    assert row["projected_market_date"] == (start + timedelta(days=15)).isoformat()
@@ -0,0 +1,9 @@
+async def test_pool_stats_are_admin_only(client, admin_headers, farmer_headers):
+    assert (await client.get("/health/pool")).status_code == 401
+    assert (await client.get("/health/pool", headers=farmer_headers)).status_code == 403
+
+    response = await client.get("/health/pool", headers=admin_headers)
+    assert response.status_code == 200
+    primary = response.json()["primary"]
+    assert primary["pool_class"] == "InstrumentedQueuePool"
+    assert primary["timeouts"] == 0
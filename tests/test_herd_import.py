@@ -0,0 +1,61 @@
+from sqlalchemy import select
+
+from app.models import Cattle
+from app.schema import schemas
+from app.utills.herd_import import iter_csv_records, iter_lines, run_import
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _records(*chunks: bytes) -> list:
+    return [record async for record in iter_csv_records(iter_lines(_chunks(*chunks)))]
+
+
+async def test_quoted_fields_may_span_lines_and_chunks():
+    records = await _records(b'name,notes\r\nDaisy,"calved\r\nin ', b'May, twice"\r\nRosie,\r\n')
+    assert records == [(0, {"name": "Daisy", "notes": "calved\r\nin May, twice"}), (1, {"name": "Rosie"})]
+
+
+async def test_embedded_quotes():
+    records = await _records(b'name,notes\nBessie 5" horn,ok\n"Say ""moo""",x\nDaisy,y\n')
+    assert records == [
+        (0, {"name": 'Bessie 5" horn', "notes": "ok"}),
+        (1, {"name": 'Say "moo"', "notes": "x"}),
+        (2, {"name": "Daisy", "notes": "y"}),
+    ]
+
+
+async def test_bad_rows_are_reported_without_losing_the_rest():
+    records = await _records(b'name,breed\n\nDaisy,Jersey,extra\nRosie,Friesian\n"open,Ayrshire\nLast,Jersey')
+    assert [number for number, _ in records] == [0, 1, 2]
+    assert isinstance(records[0][1], ValueError)
+    assert records[1] == (1, {"name": "Rosie", "breed": "Friesian"})
+    # The open quote swallows the rest of the file, which is reported rather than dropped
+    assert str(records[2][1]) == "Unterminated quoted field"
+
+
+async def test_run_import_reports_bad_rows_and_stores_the_rest(client, db, make_user):
+    farmer = await make_user()
+    user_id = farmer["user_id"]
+    body = (
+        "name,breed,birth_date,gender,status,user_id\n"
+        f'Bessie 5" horn,Friesian,2021-01-01,Female,Available,{user_id}\n'
+        f'"Daisy\nthe second",Jersey,2021-02-01,Female,Available,{user_id}\n'
+        f"Rosie,Jersey,not a date,Female,Available,{user_id}\n"
+        f"Stray,Jersey,2021-03-01,Female,Available,{user_id},extra\n"
+        f"Molly,,2021-04-01,Female,Available,{user_id}\n"
+    ).encode()
+
+    result = await run_import(db, schemas.ImportEntity.cattle, schemas.RecordFormat.csv, _chunks(body[:50], body[50:]), chunk_size=2)
+    assert (result["processed"], result["inserted"], result["failed"], result["done"]) == (5, 3, 2, True)
+    assert [error["index"] for error in result["errors"]] == [2, 3]
+
+    response = await client.post("/import/cattle?chunk_size=2", content=body)
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 3
+
+    names = (await db.scalars(select(Cattle.name).where(Cattle.user_id == user_id))).all()
+    assert sorted(names) == sorted(['Bessie 5" horn', "Daisy\nthe second", "Molly"] * 2)
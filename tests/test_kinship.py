@@ -0,0 +1,136 @@
+import pytest
+
+from app.models.pedigree import Pedigree
+from app.utills.kinship import KinshipCalculator, PedigreeCycleError
+
+# 1, 2 founders; 3 and 4 full sibs; 5 a founder; 6 half sib of 3 through dam 1
+PEDIGREE = {
+    3: (1, 2),
+    4: (1, 2),
+    6: (1, 5),
+    7: (3, 4),  # full-sib mating
+    8: (3, 6),  # half-sib mating
+    9: (3, 2),  # sire back onto his daughter
+    10: (7, 4),  # the inbred 7 mated back to her parent 4
+}
+
+
+@pytest.fixture
+def calculator():
+    return KinshipCalculator(PEDIGREE)
+
+
+def test_founders_are_not_inbred(calculator):
+    assert calculator.inbreeding(1) == 0.0
+    assert calculator.inbreeding(3) == 0.0
+    assert calculator.kinship(1, 2) == 0.0
+
+
+def test_self_and_parent_offspring_kinship(calculator):
+    assert calculator.kinship(1, 1) == 0.5
+    assert calculator.kinship(1, 3) == 0.25
+
+
+def test_full_sib_mating(calculator):
+    assert calculator.kinship(3, 4) == 0.25
+    assert calculator.inbreeding(7) == 0.25
+
+
+def test_half_sib_mating(calculator):
+    assert calculator.kinship(3, 6) == 0.125
+    assert calculator.inbreeding(8) == 0.125
+
+
+def test_parent_offspring_mating(calculator):
+    assert calculator.inbreeding(9) == 0.25
+
+
+def test_inbred_parent_raises_kinship(calculator):
+    # f(7, 7) = (1 + F7) / 2, and f(7, 4) averages f(3, 4) and f(4, 4)
+    assert calculator.kinship(7, 7) == 0.625
+    assert calculator.inbreeding(10) == pytest.approx(0.5 * (0.25 + 0.5))
+
+
+def test_score_ranks_candidates(calculator):
+    assert calculator.score(3, [4, 5, 6]) == {4: 0.25, 5: 0.0, 6: 0.125}
+
+
+async def _herd(client, make_user, make_cattle) -> dict:
+    farmer = await make_user()
+    ids = {}
+    for name, gender in [("dam", "Female"), ("sire", "Male"), ("daughter", "Female"),
+                         ("son", "Male"), ("outsider", "Male"), ("calf", "Female")]:
+        ids[name] = (await make_cattle(farmer["user_id"], name=name, gender=gender))["cattle_id"]
+    for child, dam, sire in [("daughter", "dam", "sire"), ("son", "dam", "sire"), ("calf", "daughter", "son")]:
+        await client.post("/pedigree/pedigrees/", json={"cattle_id": ids[child], "dam_id": ids[dam], "sire_id": ids[sire]})
+    return ids
+
+
+async def test_inbreeding_endpoint_for_full_sib_mating(client, make_user, make_cattle):
+    ids = await _herd(client, make_user, make_cattle)
+
+    response = await client.get(f"/pedigree/inbreeding/{ids['calf']}")
+    assert response.json() == {"cattle_id": ids["calf"], "inbreeding": 0.25}
+    assert (await client.get("/pedigree/inbreeding/999")).status_code == 404
+
+
+async def test_kinship_endpoint_ranks_candidate_sires(client, make_user, make_cattle):
+    ids = await _herd(client, make_user, make_cattle)
+
+    response = await client.post("/pedigree/kinship", json={
+        "cattle_id": ids["daughter"], "candidate_ids": [ids["son"], ids["sire"], ids["outsider"]],
+    })
+    assert response.status_code == 200
+    assert response.json() == {
+        "cattle_id": ids["daughter"],
+        "inbreeding": 0.0,
+        "candidates": [
+            {"cattle_id": ids["outsider"], "kinship": 0.0},
+            {"cattle_id": ids["sire"], "kinship": 0.25},
+            {"cattle_id": ids["son"], "kinship": 0.25},
+        ],
+    }
+
+
+def test_cyclic_records_raise():
+    calculator = KinshipCalculator({1: (2, None), 2: (1, None)})
+    with pytest.raises(PedigreeCycleError):
+        calculator.kinship(1, 3)
+    with pytest.raises(PedigreeCycleError):
+        KinshipCalculator({1: (1, None)}).inbreeding(1)
+
+
+async def test_self_parent_and_cyclic_pedigrees_are_rejected(client, make_user, make_cattle):
+    ids = await _herd(client, make_user, make_cattle)
+
+    response = await client.post("/pedigree/pedigrees/", json={"cattle_id": ids["outsider"], "dam_id": ids["outsider"]})
+    assert response.status_code == 409
+    # dam is the calf's granddam, so the calf cannot be her dam
+    response = await client.post("/pedigree/pedigrees/", json={"cattle_id": ids["dam"], "dam_id": ids["calf"]})
+    assert response.status_code == 409
+
+    # Two cows as each other's dam: the second record closes the loop
+    response = await client.post("/pedigree/pedigrees/", json={"cattle_id": ids["outsider"], "sire_id": ids["calf"]})
+    assert response.status_code == 200
+    pedigree_id = response.json()["id"]
+    response = await client.put(f"/pedigree/pedigrees/{pedigree_id}", json={"cattle_id": ids["outsider"], "sire_id": ids["outsider"]})
+    assert response.status_code == 409
+    response = await client.post("/pedigree/pedigrees/", json={"cattle_id": ids["calf"], "dam_id": ids["outsider"]})
+    assert response.status_code == 409
+
+    response = await client.post("/pedigree/kinship", json={"cattle_id": ids["calf"], "candidate_ids": [ids["outsider"]]})
+    assert response.status_code == 200
+
+
+async def test_cycles_already_stored_are_a_conflict_not_a_crash(client, db, make_user, make_cattle):
+    ids = await _herd(client, make_user, make_cattle)
+    # Written directly, as records from before the check could be
+    db.add_all([
+        Pedigree(cattle_id=ids["outsider"], dam_id=ids["outsider"]),
+        Pedigree(cattle_id=ids["dam"], dam_id=ids["calf"]),
+    ])
+    await db.commit()
+
+    response = await client.post("/pedigree/kinship", json={"cattle_id": ids["outsider"], "candidate_ids": [ids["son"]]})
+    assert response.status_code == 409
+    assert (await client.get(f"/pedigree/inbreeding/{ids['calf']}")).status_code == 409
@@ -0,0 +1,73 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.crud.lactation import fit_wood_curves
+
+
+def _wood(a: float, b: float, c: float, days: np.ndarray) -> np.ndarray:
+    return a * days ** b * np.exp(-c * days)
+
+
+def test_fit_recovers_wood_parameters_per_group():
+    days = np.arange(5, 305, 5, dtype=float)
+    params = [(15.0, 0.25, 0.004), (20.0, 0.15, 0.003)]
+    groups = np.repeat([0, 1], len(days))
+    yields = np.concatenate([_wood(a, b, c, days) for a, b, c in params])
+
+    curves = fit_wood_curves(groups, np.tile(days, 2), yields, 2)
+
+    for i, (a, b, c) in enumerate(params):
+        assert curves["fitted"][i]
+        assert curves["a"][i] == pytest.approx(a, rel=1e-6)
+        assert curves["b"][i] == pytest.approx(b, rel=1e-6)
+        assert curves["c"][i] == pytest.approx(c, rel=1e-6)
+        assert curves["peak_day"][i] == pytest.approx(b / c)
+        assert curves["peak_yield"][i] == pytest.approx(_wood(a, b, c, np.array(b / c)))
+        assert curves["persistency"][i] == pytest.approx(-(b + 1) * np.log(c))
+
+
+def test_fit_leaves_unidentifiable_groups_unfitted():
+    # Group 1 has two records only; group 2 has three on the same day
+    groups = np.array([0, 0, 0, 0, 1, 1, 2, 2, 2])
+    days = np.array([10.0, 40.0, 80.0, 160.0, 10.0, 20.0, 30.0, 30.0, 30.0])
+    yields = _wood(15.0, 0.25, 0.004, days)
+
+    curves = fit_wood_curves(groups, days, yields, 3)
+
+    assert curves["fitted"].tolist() == [True, False, False]
+    assert np.isnan(curves["peak_day"][1:]).all()
+
+
+def test_declining_only_lactation_has_no_peak():
+    days = np.arange(1, 200, 7, dtype=float)
+    curves = fit_wood_curves(np.zeros(len(days), dtype=int), days, _wood(30.0, -0.1, 0.01, days), 1)
+
+    assert curves["fitted"][0]
+    assert np.isnan(curves["peak_day"][0])
+
+
+async def test_lactation_endpoint_fits_since_last_calving(client, make_user, make_cattle):
+    farmer = await make_user()
+    cow = await make_cattle(farmer["user_id"])
+    await client.post("/calving/calvings/", json={"cattle_id": cow["cattle_id"], "calving_date": "2022-01-01"})
+    calving_date = date(2023, 1, 1)
+    await client.post("/calving/calvings/", json={"cattle_id": cow["cattle_id"], "calving_date": calving_date.isoformat()})
+
+    rows = [{"cattle_id": cow["cattle_id"], "production_date": "2022-06-01", "volume": 99}]
+    for day in range(10, 200, 10):
+        rows.append({
+            "cattle_id": cow["cattle_id"],
+            "production_date": (calving_date + timedelta(days=day)).isoformat(),
+            "volume": round(float(_wood(15.0, 0.25, 0.004, np.array(float(day)))), 3),
+        })
+    assert (await client.post("/milk/milk_productions/batch", json=rows)).json()["inserted"] == len(rows)
+
+    response = await client.get(f"/milk/lactation/farmer/{farmer['user_id']}")
+    assert response.status_code == 200
+    [curve] = response.json()
+    assert curve["calving_date"] == calving_date.isoformat()
+    assert curve["record_count"] == len(rows) - 1
+    assert curve["days_in_milk"] == 190
+    assert curve["peak_day"] == pytest.approx(62.5, rel=0.01)
@@ -0,0 +1,32 @@
+from sqlalchemy import insert
+
+from app.crud import location
+from app.models import Location
+
+
+async def test_cattle_reported_once_at_nearest_seller_location(client, db, make_user, make_cattle):
+    farmer = await make_user()
+    cow = await make_cattle(farmer["user_id"])
+    await make_cattle(farmer["user_id"], name="Sold", status="Sold")
+    await location.create_location(db, {"farmer_id": farmer["user_id"], "latitude": -0.40, "longitude": 36.0})
+    await location.create_location(db, {"farmer_id": farmer["user_id"], "latitude": -0.30, "longitude": 36.0})
+
+    response = await client.get("/cattle/nearby/?latitude=-0.5&longitude=36.0&radius_km=50")
+    assert response.status_code == 200
+    hits = response.json()
+    assert [hit["cattle"]["cattle_id"] for hit in hits] == [cow["cattle_id"]]
+    assert round(hits[0]["distance_km"]) == 11
+
+
+async def test_reindex_backfills_missing_geohashes(client, db, make_user, admin_headers, farmer_headers):
+    farmer = await make_user()
+    # Written directly, as rows loaded before the geohash column was populated would be
+    await db.execute(insert(Location), [{"farmer_id": farmer["user_id"], "latitude": -0.30, "longitude": 36.08}])
+    await db.commit()
+    url = "/cattle/sellers/nearby/?latitude=-0.3&longitude=36.08&radius_km=5"
+    assert (await client.get(url)).json() == []
+
+    assert (await client.post("/cattle/nearby/reindex")).status_code == 401
+    assert (await client.post("/cattle/nearby/reindex", headers=farmer_headers)).status_code == 403
+    assert (await client.post("/cattle/nearby/reindex", headers=admin_headers)).status_code == 204
+    assert len((await client.get(url)).json()) == 1
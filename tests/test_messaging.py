@@ -0,0 +1,60 @@
+from app.crud import message as message_crud
+from app.schema.schemas import MessageCreate
+from app.utills.inbound import inbound_writer
+
+
+async def _pages(client, url: str, key) -> list:
+    """Follow next_cursor to the end, returning each page's keys."""
+    pages, cursor = [], None
+    while True:
+        params = {"cursor": cursor} if cursor else {}
+        response = await client.get(url, params=params)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        pages.append([key(item) for item in body["items"]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+        assert len(pages) < 20, "pagination did not terminate"
+
+
+async def _receive(client, messages: list) -> None:
+    response = await client.post("/messaging/webhook", json={"messages": messages})
+    assert response.status_code == 202
+    await inbound_writer.stop()
+    await inbound_writer.start()
+
+
+async def test_thread_pages_newest_first_to_the_end(client, db, make_user):
+    farmer = await make_user()
+    buyer = await make_user()
+    other = await make_user()
+    # Both directions belong to one thread; the unrelated message does not
+    await _receive(client, [
+        {"sender": farmer["user_id"] if i % 2 else buyer["user_id"], "receiver": buyer["user_id"] if i % 2 else farmer["user_id"], "message": f"m{i}"}
+        for i in range(4)
+    ] + [{"sender": other["user_id"], "receiver": farmer["user_id"], "message": "elsewhere"}])
+    await message_crud.create_message(db, MessageCreate(sender_id=farmer["user_id"], receiver_id=buyer["user_id"], message_content="m4"))
+
+    pages = await _pages(client, f"/messaging/threads/{buyer['user_id']}/{farmer['user_id']}?limit=2", lambda item: item["message_content"])
+    assert pages == [["m4", "m3"], ["m2", "m1"], ["m0"]]
+
+
+async def test_conversations_page_by_latest_message(client, make_user):
+    farmer = await make_user()
+    buyers = [await make_user() for _ in range(3)]
+    for i, buyer in enumerate(buyers):
+        await _receive(client, [{"sender": buyer["user_id"], "receiver": farmer["user_id"], "message": f"from {i}"}])
+    # Replying moves the first buyer's conversation to the top
+    await _receive(client, [{"sender": farmer["user_id"], "receiver": buyers[0]["user_id"], "message": "reply"}])
+
+    pages = await _pages(
+        client,
+        f"/messaging/conversations/{farmer['user_id']}?limit=1",
+        lambda item: (item["counterpart_id"], item["last_message"]["message_content"]),
+    )
+    assert pages == [
+        [(buyers[0]["user_id"], "reply")],
+        [(buyers[2]["user_id"], "from 2")],
+        [(buyers[1]["user_id"], "from 1")],
+    ]
@@ -0,0 +1,95 @@
+async def _daily(client, scope: str, key: int) -> dict:
+    response = await client.get(f"/milk/aggregates/{scope}/{key}")
+    assert response.status_code == 200
+    return {row["period_start"]: (float(row["total_volume"]), row["record_count"]) for row in response.json()}
+
+
+async def test_rollups_follow_insert_update_and_delete(client, make_user, make_cattle):
+    farmer = await make_user()
+    cow = await make_cattle(farmer["user_id"])
+    other = await make_cattle(farmer["user_id"], name="Other")
+
+    first = (await client.post("/milk/milk_productions/", json={
+        "cattle_id": cow["cattle_id"], "production_date": "2024-01-02", "volume": 10.5,
+    })).json()
+    await client.post("/milk/milk_productions/", json={
+        "cattle_id": cow["cattle_id"], "production_date": "2024-01-02", "volume": 4,
+    })
+    await client.post("/milk/milk_productions/", json={
+        "cattle_id": other["cattle_id"], "production_date": "2024-01-02", "volume": 6,
+    })
+    assert await _daily(client, "cattle", cow["cattle_id"]) == {"2024-01-02": (14.5, 2)}
+    assert await _daily(client, "farmer", farmer["user_id"]) == {"2024-01-02": (20.5, 3)}
+
+    # Moving a record to another day shifts its volume between the two days
+    response = await client.put(f"/milk/milk_productions/{first['production_id']}", json={
+        "cattle_id": cow["cattle_id"], "production_date": "2024-01-03", "volume": 12,
+    })
+    assert response.status_code == 200
+    assert await _daily(client, "cattle", cow["cattle_id"]) == {"2024-01-02": (4.0, 1), "2024-01-03": (12.0, 1)}
+    assert await _daily(client, "farmer", farmer["user_id"]) == {"2024-01-02": (10.0, 2), "2024-01-03": (12.0, 1)}
+
+    # Deleting the day's only record removes the day
+    await client.delete(f"/milk/milk_productions/{first['production_id']}")
+    assert await _daily(client, "cattle", cow["cattle_id"]) == {"2024-01-02": (4.0, 1)}
+    assert await _daily(client, "farmer", farmer["user_id"]) == {"2024-01-02": (10.0, 2)}
+
+
+async def test_batch_insert_updates_rollups(client, make_user, make_cattle):
+    farmer = await make_user()
+    cow = await make_cattle(farmer["user_id"])
+    response = await client.post("/milk/milk_productions/batch", json=[
+        {"cattle_id": cow["cattle_id"], "production_date": "2024-01-02", "volume": 5},
+        {"cattle_id": cow["cattle_id"], "production_date": "2024-01-02", "volume": 7},
+        {"cattle_id": 999, "production_date": "2024-01-02", "volume": 9},
+    ])
+    assert response.json()["inserted"] == 2
+    assert await _daily(client, "cattle", cow["cattle_id"]) == {"2024-01-02": (12.0, 2)}
+
+
+async def test_rebuild_is_admin_only_and_matches_incremental_totals(client, make_user, make_cattle, admin_headers, farmer_headers):
+    farmer = await make_user()
+    cow = await make_cattle(farmer["user_id"])
+    for day, volume in [("2024-01-02", 3), ("2024-01-02", 4), ("2024-01-09", 5)]:
+        await client.post("/milk/milk_productions/", json={
+            "cattle_id": cow["cattle_id"], "production_date": day, "volume": volume,
+        })
+    incremental = await _daily(client, "farmer", farmer["user_id"])
+
+    assert (await client.post("/milk/aggregates/rebuild")).status_code == 401
+    assert (await client.post("/milk/aggregates/rebuild", headers=farmer_headers)).status_code == 403
+    assert (await client.post("/milk/aggregates/rebuild", headers=admin_headers)).status_code == 204
+    assert await _daily(client, "farmer", farmer["user_id"]) == incremental
+
+
+async def test_sale_moves_milk_history_to_the_buyer(client, make_user, make_cattle, admin_headers):
+    seller = await make_user()
+    buyer = await make_user()
+    cow = await make_cattle(seller["user_id"])
+    kept = await make_cattle(seller["user_id"], name="Kept")
+    records = [
+        (await client.post("/milk/milk_productions/", json={
+            "cattle_id": cattle_id, "production_date": day, "volume": volume,
+        })).json()
+        for cattle_id, day, volume in [(cow["cattle_id"], "2024-01-02", 5), (cow["cattle_id"], "2024-01-03", 6),
+                                       (kept["cattle_id"], "2024-01-02", 2)]
+    ]
+
+    response = await client.post("/trade/sales/", json={"cattle_id": cow["cattle_id"], "buyer_id": buyer["user_id"], "price": 900})
+    assert response.status_code == 200
+    assert await _daily(client, "farmer", seller["user_id"]) == {"2024-01-02": (2.0, 1)}
+    assert await _daily(client, "farmer", buyer["user_id"]) == {"2024-01-02": (5.0, 1), "2024-01-03": (6.0, 1)}
+
+    # Editing and deleting pre-sale records adjusts the buyer's days only
+    await client.put(f"/milk/milk_productions/{records[0]['production_id']}", json={
+        "cattle_id": cow["cattle_id"], "production_date": "2024-01-02", "volume": 8,
+    })
+    await client.delete(f"/milk/milk_productions/{records[1]['production_id']}")
+    incremental = {
+        farmer_id: await _daily(client, "farmer", farmer_id) for farmer_id in (seller["user_id"], buyer["user_id"])
+    }
+    assert incremental == {seller["user_id"]: {"2024-01-02": (2.0, 1)}, buyer["user_id"]: {"2024-01-02": (8.0, 1)}}
+
+    assert (await client.post("/milk/aggregates/rebuild", headers=admin_headers)).status_code == 204
+    for farmer_id, daily in incremental.items():
+        assert await _daily(client, "farmer", farmer_id) == daily
@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+from sqlalchemy import select
+
+from app.models.notification import Notification
+
+
+async def _pages(client, url: str) -> list:
+    """Follow next_cursor to the end, returning each page's ids."""
+    pages, cursor = [], None
+    while True:
+        params = {"cursor": cursor} if cursor else {}
+        response = await client.get(url, params=params)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        pages.append([item["notification_id"] for item in body["items"]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+        assert len(pages) < 20, "pagination did not terminate"
+
+
+async def _notify(client, user_id: int, count: int) -> list:
+    return [
+        (await client.post("/notification/notifications/", json={"user_id": user_id, "message": f"n{i}"})).json()["notification_id"]
+        for i in range(count)
+    ]
+
+
+async def test_inbox_pages_newest_first_to_the_end(client, make_user):
+    farmer = await make_user()
+    other = await make_user()
+    ids = await _notify(client, farmer["user_id"], 5)
+    await _notify(client, other["user_id"], 2)
+
+    pages = await _pages(client, f"/notification/inbox/{farmer['user_id']}?limit=2")
+    assert pages == [ids[4:2:-1], ids[2:0:-1], ids[:1]]
+
+
+async def test_unread_inbox_and_bulk_mark_read(client, make_user):
+    farmer = await make_user()
+    other = await make_user()
+    ids = await _notify(client, farmer["user_id"], 5)
+    [foreign] = await _notify(client, other["user_id"], 1)
+
+    # Ids belonging to someone else are ignored
+    response = await client.post(f"/notification/inbox/{farmer['user_id']}/read", json={"notification_ids": [ids[1], ids[3], foreign]})
+    assert response.json() == {"updated": 2}
+    assert await _pages(client, f"/notification/inbox/{farmer['user_id']}?limit=2&unread_only=true") == [[ids[4], ids[2]], [ids[0]]]
+
+    response = await client.post(f"/notification/inbox/{farmer['user_id']}/read", json={})
+    assert response.json() == {"updated": 3}
+    assert await _pages(client, f"/notification/inbox/{farmer['user_id']}?unread_only=true") == [[]]
+    assert (await client.get(f"/notification/notifications/{foreign}")).json()["read_at"] is None
+
+
+async def test_inbox_rejects_a_malformed_cursor(client, make_user):
+    farmer = await make_user()
+    assert (await client.get(f"/notification/inbox/{farmer['user_id']}?cursor=nope")).status_code == 400
+
+
+async def test_inbox_pages_across_server_default_and_fractional_timestamps(client, db, make_user):
+    farmer = await make_user()
+    await _notify(client, farmer["user_id"], 3)
+    # Server-default rows are stored to the second; rows written from Python carry a fraction
+    stored = (await db.scalars(select(Notification).where(Notification.user_id == farmer["user_id"]))).all()
+    second = stored[0].created_at
+    db.add_all([
+        Notification(user_id=farmer["user_id"], message=f"f{i}", created_at=second + timedelta(milliseconds=offset))
+        for i, offset in enumerate((-750, 250, 500))
+    ])
+    await db.commit()
+
+    rows = (await db.execute(
+        select(Notification.created_at, Notification.notification_id).where(Notification.user_id == farmer["user_id"])
+    )).all()
+    expected = [notification_id for _, notification_id in sorted(rows, reverse=True)]
+    pages = await _pages(client, f"/notification/inbox/{farmer['user_id']}?limit=2")
+    assert [notification_id for page in pages for notification_id in page] == expected
@@ -0,0 +1,146 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.auth.auth import get_read_db
+from app.crud import notification
+from app.crud.notification import notification_broker
+from app.main import app
+from app.models.database import Base, SessionLocal
+
+
+class SSEConnection:
+    """Drives the app directly over ASGI; httpx's test transport buffers the whole body."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.chunks: asyncio.Queue = asyncio.Queue()
+        self.status = None
+        self._disconnect = asyncio.Event()
+        self._requested = False
+
+    async def _receive(self):
+        if not self._requested:
+            self._requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self._disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def _send(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+        elif message["type"] == "http.response.body" and message.get("body"):
+            await self.chunks.put(message["body"].decode())
+
+    async def __aenter__(self):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": self.path, "raw_path": self.path.encode(), "query_string": b"",
+            "root_path": "", "headers": [(b"host", b"test")], "client": ("test", 1), "server": ("test", 80),
+        }
+        self.task = asyncio.create_task(app(scope, self._receive, self._send))
+        return self
+
+    async def next_event(self) -> str:
+        return await asyncio.wait_for(self.chunks.get(), timeout=5)
+
+    async def __aexit__(self, *exc):
+        self._disconnect.set()
+        await asyncio.wait_for(self.task, timeout=5)
+
+
+async def test_stream_sends_unread_count_then_new_notifications(client, make_user):
+    farmer = await make_user()
+    user_id = farmer["user_id"]
+    for message in ("one", "two"):
+        await client.post("/notification/notifications/", json={"user_id": user_id, "message": message})
+
+    async with SSEConnection(f"/notification/stream/{user_id}") as stream:
+        first = await stream.next_event()
+        assert stream.status == 200
+        assert first == f'event: unread\ndata: {{"user_id": {user_id}, "unread": 2}}\n\n'
+
+        created = (await client.post("/notification/notifications/", json={"user_id": user_id, "message": "three"})).json()
+        event = await stream.next_event()
+        assert event.startswith("event: notification\n")
+        assert f'"notification_id": {created["notification_id"]}' in event
+        assert '"message": "three"' in event
+
+    # Disconnecting unsubscribes the stream
+    assert notification_broker.publish(user_id, {}) == 0
+
+
+async def test_stream_only_receives_its_users_notifications(client, make_user):
+    farmer = await make_user()
+    other = await make_user()
+
+    async with SSEConnection(f"/notification/stream/{farmer['user_id']}") as stream:
+        await stream.next_event()
+        await client.post("/notification/notifications/", json={"user_id": other["user_id"], "message": "not yours"})
+        await client.post("/notification/notifications/", json={"user_id": farmer["user_id"], "message": "yours"})
+        assert '"message": "yours"' in await stream.next_event()
+
+
+async def test_unread_count_cache_follows_writes(client, make_user):
+    farmer = await make_user()
+    user_id = farmer["user_id"]
+
+    async def unread() -> int:
+        return (await client.get(f"/notification/unread_count/{user_id}")).json()["unread"]
+
+    assert await unread() == 0
+    ids = [
+        (await client.post("/notification/notifications/", json={"user_id": user_id, "message": str(i)})).json()["notification_id"]
+        for i in range(4)
+    ]
+    assert await unread() == 4
+
+    assert (await client.post(f"/notification/inbox/{user_id}/read", json={"notification_ids": ids[:1]})).json() == {"updated": 1}
+    assert await unread() == 3
+    await client.delete(f"/notification/notifications/{ids[1]}")
+    assert await unread() == 2
+    await client.put(f"/notification/notifications/{ids[2]}", json={"user_id": user_id, "message": "x", "read_at": "2024-01-01T00:00:00"})
+    assert await unread() == 1
+    await client.post(f"/notification/inbox/{user_id}/read", json={})
+    assert await unread() == 0
+
+
+async def test_notification_created_while_connecting_is_streamed(client, make_user, monkeypatch):
+    farmer = await make_user()
+    user_id = farmer["user_id"]
+    count_unread = notification.get_unread_count
+
+    async def count_after_a_notification_lands(user_id):
+        # Created after the stream subscribed but before its count is read
+        async with SessionLocal() as db:
+            await notification.create_notification(db, {"user_id": user_id, "message": "in between"})
+        return await count_unread(user_id)
+
+    monkeypatch.setattr(notification, "get_unread_count", count_after_a_notification_lands)
+    async with SSEConnection(f"/notification/stream/{user_id}") as stream:
+        assert '"unread": 1' in await stream.next_event()
+        assert '"message": "in between"' in await stream.next_event()
+
+
+async def test_unread_count_is_cached_from_the_primary(client, make_user, tmp_path):
+    farmer = await make_user()
+    user_id = farmer["user_id"]
+    for message in ("one", "two"):
+        await client.post("/notification/notifications/", json={"user_id": user_id, "message": message})
+    notification.invalidate_unread_counts([user_id])
+
+    # A replica that has not caught up with either notification
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    async with replica.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    async def lagging_read_db():
+        async with AsyncSession(replica) as session:
+            yield session
+
+    app.dependency_overrides[get_read_db] = lagging_read_db
+    try:
+        assert (await client.get(f"/notification/unread_count/{user_id}")).json()["unread"] == 2
+    finally:
+        app.dependency_overrides.pop(get_read_db)
+        await replica.dispose()
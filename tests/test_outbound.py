@@ -0,0 +1,203 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert, update
+
+from app.crud.message import create_message
+from app.models import OutboundMessage, OutboundStatus
+from app.models.database import SessionLocal
+from app.schema.schemas import MessageCreate
+from app.utills.outbound import LEASE_SECONDS, OutboundDispatcher
+from app.utills.rate_limit import TokenBucketLimiter
+from app.utills.whatsapp.transport import FakeTransport, TransportError
+
+
+class ScriptedTransport:
+    """Fails the first ``failures`` sends; ``during_send`` runs inside each send."""
+
+    def __init__(self, failures: int = 0, during_send=None):
+        self.failures = failures
+        self.during_send = during_send
+        self.sent = []
+
+    async def send(self, to: str, body: str) -> dict:
+        if self.during_send is not None:
+            await self.during_send()
+        if self.failures > 0:
+            self.failures -= 1
+            raise TransportError("provider unavailable")
+        self.sent.append((to, body))
+        return {"sid": f"SID{len(self.sent)}", "status": "queued"}
+
+
+def _dispatcher(transport, **options) -> OutboundDispatcher:
+    options.setdefault("limiter", TokenBucketLimiter(rate=1000, burst=1000))
+    return OutboundDispatcher(transport=transport, workers=1, max_attempts=3, backoff_seconds=2, poll_seconds=0.05, **options)
+
+
+async def _enqueue(db, count: int = 1, sender_id: int = 1) -> list:
+    result = await db.scalars(
+        insert(OutboundMessage).returning(OutboundMessage.outbound_id),
+        [{"sender_id": sender_id, "to_phone": "+254700000000", "body": f"message {i}"} for i in range(count)],
+    )
+    ids = result.all()
+    await db.commit()
+    return ids
+
+
+async def _row(outbound_id: int) -> OutboundMessage:
+    async with SessionLocal() as session:
+        return await session.get(OutboundMessage, outbound_id)
+
+
+async def _make_due(outbound_id: int) -> None:
+    async with SessionLocal() as session:
+        await session.execute(
+            update(OutboundMessage)
+            .where(OutboundMessage.outbound_id == outbound_id)
+            .values(next_attempt_at=datetime.now() - timedelta(seconds=1))
+        )
+        await session.commit()
+
+
+async def test_failed_sends_back_off_then_succeed(db):
+    [outbound_id] = await _enqueue(db)
+    transport = ScriptedTransport(failures=2)
+    dispatcher = _dispatcher(transport)
+
+    for attempt, base_delay in ((1, 2), (2, 4)):
+        [message] = await dispatcher._claim()
+        before = datetime.now()
+        await dispatcher._deliver(message)
+        row = await _row(outbound_id)
+        assert (row.status, row.attempts, row.last_error) == (OutboundStatus.Queued, attempt, "provider unavailable")
+        delay = (row.next_attempt_at - before).total_seconds()
+        assert base_delay * 0.8 - 0.1 <= delay <= base_delay * 1.2 + 0.1
+        # Not due again until the backoff has passed
+        assert await dispatcher._claim() == []
+        await _make_due(outbound_id)
+
+    [message] = await dispatcher._claim()
+    await dispatcher._deliver(message)
+    row = await _row(outbound_id)
+    assert (row.status, row.attempts, row.provider_sid, row.last_error, row.locked_until) == (
+        OutboundStatus.Sent, 3, "SID1", None, None,
+    )
+    assert transport.sent == [("+254700000000", "message 0")]
+
+
+async def test_gives_up_after_max_attempts(db):
+    [outbound_id] = await _enqueue(db)
+    dispatcher = _dispatcher(ScriptedTransport(failures=10))
+
+    for _ in range(3):
+        await _make_due(outbound_id)
+        [message] = await dispatcher._claim()
+        await dispatcher._deliver(message)
+
+    row = await _row(outbound_id)
+    assert (row.status, row.attempts) == (OutboundStatus.Failed, 3)
+    await _make_due(outbound_id)
+    assert await dispatcher._claim() == []
+
+
+async def test_throttled_sender_is_requeued_without_blocking_others(db):
+    busy = await _enqueue(db, count=4, sender_id=1)
+    [quiet] = await _enqueue(db, count=1, sender_id=2)
+    transport = ScriptedTransport()
+    dispatcher = _dispatcher(transport, limiter=TokenBucketLimiter(rate=0.5, burst=2))
+
+    claimed = await dispatcher._claim()
+    started = datetime.now()
+    for message in claimed:
+        await dispatcher._deliver(message)
+    # No worker slept waiting for a token
+    assert (datetime.now() - started).total_seconds() < 1
+
+    statuses = {outbound_id: (await _row(outbound_id)) for outbound_id in busy + [quiet]}
+    assert [statuses[outbound_id].status for outbound_id in busy] == [
+        OutboundStatus.Sent, OutboundStatus.Sent, OutboundStatus.Queued, OutboundStatus.Queued,
+    ]
+    assert statuses[quiet].status == OutboundStatus.Sent
+    for outbound_id in busy[2:]:
+        row = statuses[outbound_id]
+        # Requeued for when the next token is due, without spending an attempt
+        assert row.attempts == 0
+        assert row.locked_until is None
+        assert 1.5 <= (row.next_attempt_at - started).total_seconds() <= 2.5
+    assert len(transport.sent) == 3
+
+
+async def test_stale_worker_does_not_resend_a_reclaimed_row(db):
+    [outbound_id] = await _enqueue(db)
+    transport = ScriptedTransport()
+    dispatcher = _dispatcher(transport)
+    [stale] = await dispatcher._claim()
+
+    # The stale worker's lease lapses while it waits, and the poller claims the row again
+    lapsed = datetime.now() - timedelta(seconds=1)
+    async with SessionLocal() as session:
+        await session.execute(
+            update(OutboundMessage).where(OutboundMessage.outbound_id == outbound_id).values(locked_until=lapsed)
+        )
+        await session.commit()
+    stale.locked_until = lapsed
+    [fresh] = await dispatcher._claim()
+    assert fresh.locked_until > datetime.now() + timedelta(seconds=LEASE_SECONDS - 5)
+
+    await dispatcher._deliver(stale)
+    assert transport.sent == []
+    assert (await _row(outbound_id)).status == OutboundStatus.Sending
+
+    await dispatcher._deliver(fresh)
+    assert len(transport.sent) == 1
+    assert (await _row(outbound_id)).status == OutboundStatus.Sent
+
+
+async def test_outcome_is_not_written_after_the_lease_is_lost(db):
+    [outbound_id] = await _enqueue(db)
+    new_lease = datetime.now() + timedelta(seconds=LEASE_SECONDS * 2)
+
+    async def taken_over():
+        # Another dispatcher re-claims the row while this send is in flight
+        async with SessionLocal() as session:
+            await session.execute(
+                update(OutboundMessage).where(OutboundMessage.outbound_id == outbound_id).values(locked_until=new_lease)
+            )
+            await session.commit()
+
+    dispatcher = _dispatcher(ScriptedTransport(failures=1, during_send=taken_over))
+    [message] = await dispatcher._claim()
+    await dispatcher._deliver(message)
+
+    row = await _row(outbound_id)
+    assert (row.status, row.attempts, row.locked_until) == (OutboundStatus.Sending, 0, new_lease)
+
+
+async def test_running_dispatcher_delivers_enqueued_messages(db, make_user):
+    sender = await make_user()
+    receiver = await make_user(phone="+254711111111")
+    transport = FakeTransport(latency_seconds=0)
+    dispatcher = OutboundDispatcher(
+        transport=transport, workers=2, poll_seconds=0.05, limiter=TokenBucketLimiter(rate=1000, burst=1000),
+    )
+    await dispatcher.start()
+    try:
+        outbound_ids = []
+        for i in range(3):
+            created = await create_message(db, MessageCreate(
+                sender_id=sender["user_id"], receiver_id=receiver["user_id"], message_content=f"hello {i}",
+            ))
+            outbound_ids.append(created["whatsapp_response"]["outbound_id"])
+
+        for _ in range(100):
+            rows = [await _row(outbound_id) for outbound_id in outbound_ids]
+            if all(row.status == OutboundStatus.Sent for row in rows):
+                break
+            await asyncio.sleep(0.05)
+        else:
+            pytest.fail(f"not delivered: {[row.status for row in rows]}")
+    finally:
+        await dispatcher.stop()
+    assert sorted(transport.sent) == [("+254711111111", f"hello {i}") for i in range(3)]
@@ -0,0 +1,46 @@
+async def _family(client, make_user, make_cattle) -> dict:
+    """Three generations: granddam, grandsire -> dam (with sire) -> calf -> grandcalf."""
+    farmer = await make_user()
+    ids = {}
+    for name, gender in [("granddam", "Female"), ("grandsire", "Male"), ("dam", "Female"),
+                         ("sire", "Male"), ("calf", "Female"), ("grandcalf", "Male")]:
+        ids[name] = (await make_cattle(farmer["user_id"], name=name, gender=gender))["cattle_id"]
+    for child, dam, sire in [("dam", "granddam", "grandsire"), ("calf", "dam", "sire"), ("grandcalf", "calf", None)]:
+        response = await client.post("/pedigree/pedigrees/", json={
+            "cattle_id": ids[child], "dam_id": ids[dam], "sire_id": ids[sire] if sire else None,
+        })
+        assert response.status_code == 200, response.text
+    return ids
+
+
+async def test_ancestor_tree_is_limited_to_requested_generations(client, make_user, make_cattle):
+    ids = await _family(client, make_user, make_cattle)
+
+    tree = (await client.get(f"/pedigree/ancestors/{ids['grandcalf']}?generations=3")).json()
+    assert tree["name"] == "grandcalf"
+    assert "sire" not in tree
+    assert tree["dam"]["name"] == "calf"
+    assert tree["dam"]["sire"]["name"] == "sire"
+    assert tree["dam"]["dam"]["dam"] == {"cattle_id": ids["granddam"], "name": "granddam", "breed": "Friesian", "gender": "Female"}
+
+    shallow = (await client.get(f"/pedigree/ancestors/{ids['grandcalf']}?generations=1")).json()
+    assert shallow["dam"]["name"] == "calf"
+    assert "dam" not in shallow["dam"]
+
+
+async def test_descendant_tree(client, make_user, make_cattle):
+    ids = await _family(client, make_user, make_cattle)
+
+    tree = (await client.get(f"/pedigree/descendants/{ids['granddam']}")).json()
+    assert [child["name"] for child in tree["children"]] == ["dam"]
+    assert [child["name"] for child in tree["children"][0]["children"]] == ["calf"]
+    assert [child["name"] for child in tree["children"][0]["children"][0]["children"]] == ["grandcalf"]
+
+    shallow = (await client.get(f"/pedigree/descendants/{ids['granddam']}?generations=2")).json()
+    assert shallow["children"][0]["children"][0]["children"] == []
+
+
+async def test_trees_for_unknown_cattle_are_404(client):
+    assert (await client.get("/pedigree/ancestors/999")).status_code == 404
+    assert (await client.get("/pedigree/descendants/999")).status_code == 404
+    assert (await client.get("/pedigree/ancestors/1?generations=11")).status_code == 422
@@ -0,0 +1,86 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.crud import location, trade
+from app.crud.price_index import age_band_for
+
+
+def test_age_bands():
+    on = date(2024, 6, 15)
+    assert age_band_for(None, on) == "unknown"
+    assert age_band_for(date(2024, 1, 1), on) == "0-12m"
+    assert age_band_for(date(2023, 6, 16), on) == "0-12m"
+    assert age_band_for(date(2023, 6, 15), on) == "12-24m"
+    assert age_band_for(date(2021, 1, 1), on) == "24-48m"
+    assert age_band_for(date(2019, 1, 1), on) == "48m+"
+
+
+async def _index(client, **params) -> dict:
+    response = await client.get("/trade/price_index/", params={"breed": "Friesian", **params})
+    assert response.status_code == 200
+    return {row["window_days"]: row for row in response.json()}
+
+
+async def _market(db, make_user, make_cattle, count: int):
+    seller = await make_user()
+    buyer = await make_user(role="Client")
+    await location.create_location(db, {"farmer_id": seller["user_id"], "latitude": -0.3, "longitude": 36.0, "climate_zone": "Highland"})
+    # Old enough to stay in the 12-24m band for every trade date used below
+    born = (date.today() - timedelta(days=600)).isoformat()
+    herd = [await make_cattle(seller["user_id"], birth_date=born) for _ in range(count)]
+    return seller, buyer, herd
+
+
+async def test_sales_refresh_their_bucket(client, db, make_user, make_cattle):
+    seller, buyer, herd = await _market(db, make_user, make_cattle, 3)
+    for cow, price in zip(herd, (100, 200, 600)):
+        response = await client.post("/trade/sales/", json={"cattle_id": cow["cattle_id"], "buyer_id": buyer["user_id"], "price": price})
+        assert response.status_code == 200
+
+    index = await _index(client, climate_zone="Highland")
+    assert sorted(index) == [30, 90, 365]
+    row = index[30]
+    assert (row["age_band"], row["trade_count"]) == ("12-24m", 3)
+    assert (row["p25_price"], row["median_price"], row["p75_price"], row["mean_price"]) == (150, 200, 400, 300)
+
+
+async def test_trade_crud_writes_refresh_old_and_new_buckets(client, db, make_user, make_cattle):
+    seller, buyer, (cow, heifer) = await _market(db, make_user, make_cattle, 2)
+    base = {"seller_id": seller["user_id"], "buyer_id": buyer["user_id"]}
+
+    old = await trade.create_trade(db, {**base, "cattle_id": cow["cattle_id"], "price": 300,
+                                        "trade_date": datetime.now() - timedelta(days=200)})
+    assert sorted(await _index(client)) == [365]
+
+    recent = await trade.create_trade(db, {**base, "cattle_id": heifer["cattle_id"], "price": 500})
+    index = await _index(client)
+    assert (index[30]["trade_count"], index[365]["trade_count"], index[365]["median_price"]) == (1, 2, 400)
+
+    # Moving the old trade into the 90-day window and repricing it
+    await trade.update_trade(db, old.trade_id, {"trade_date": datetime.now() - timedelta(days=60), "price": 700})
+    index = await _index(client)
+    assert (index[30]["trade_count"], index[90]["trade_count"], index[365]["mean_price"]) == (1, 2, 600)
+
+    await trade.delete_trade(db, recent.trade_id)
+    index = await _index(client)
+    assert sorted(index) == [90, 365]
+    assert index[90]["median_price"] == 700
+
+    await trade.delete_trade(db, old.trade_id)
+    assert await _index(client) == {}
+
+
+async def test_rebuild_is_admin_only_and_matches_incremental_index(client, db, make_user, make_cattle, admin_headers, farmer_headers):
+    seller, buyer, herd = await _market(db, make_user, make_cattle, 2)
+    for cow, price in zip(herd, (100, 300)):
+        await client.post("/trade/sales/", json={"cattle_id": cow["cattle_id"], "buyer_id": buyer["user_id"], "price": price})
+    incremental = await _index(client)
+
+    assert (await client.post("/trade/price_index/rebuild")).status_code == 401
+    assert (await client.post("/trade/price_index/rebuild", headers=farmer_headers)).status_code == 403
+    assert (await client.post("/trade/price_index/rebuild", headers=admin_headers)).status_code == 204
+    rebuilt = await _index(client)
+    for window, row in rebuilt.items():
+        assert row["trade_count"] == incremental[window]["trade_count"]
+        assert row["median_price"] == pytest.approx(incremental[window]["median_price"])
@@ -0,0 +1,30 @@
+from sqlalchemy import delete
+
+from app.models import CattleSearchDocument
+
+
+async def test_search_matches_prefixes_of_listing_and_seller(client, make_user, make_cattle):
+    farmer = await make_user(address="Nakuru county")
+    await make_cattle(farmer["user_id"], name="Daisy", breed="Friesian")
+    await make_cattle(farmer["user_id"], name="Bella", breed="Jersey")
+
+    response = await client.get("/cattle/search/?q=fries nak")
+    assert response.status_code == 200
+    assert [hit["cattle"]["name"] for hit in response.json()] == ["Daisy"]
+
+
+async def test_reindex_is_admin_only(client, farmer_headers, admin_headers):
+    assert (await client.post("/cattle/search/reindex")).status_code == 401
+    assert (await client.post("/cattle/search/reindex", headers=farmer_headers)).status_code == 403
+    assert (await client.post("/cattle/search/reindex", headers=admin_headers)).status_code == 204
+
+
+async def test_reindex_restores_documents(client, db, make_user, make_cattle, admin_headers):
+    farmer = await make_user()
+    await make_cattle(farmer["user_id"], name="Daisy", breed="Ayrshire")
+    await db.execute(delete(CattleSearchDocument))
+    await db.commit()
+    assert (await client.get("/cattle/search/?q=ayrshire")).json() == []
+
+    await client.post("/cattle/search/reindex", headers=admin_headers)
+    assert [hit["cattle"]["name"] for hit in (await client.get("/cattle/search/?q=ayrshire")).json()] == ["Daisy"]
@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+from sqlalchemy import func, insert
+from sqlalchemy.future import select
+
+from app.models import Cattle, CattleOwnershipHistory, Trade, User
+from app.models.cattle import CattleStatusEnum
+
+CONCURRENT_BUYERS = 100
+SERIAL_BASELINE = 20
+
+
+async def _buyers(db, count: int) -> list:
+    # Inserted directly; hashing a password per buyer through the API would dominate the test
+    await db.execute(insert(User), [
+        {"username": f"buyer{i}", "password_hash": "x", "email": f"buyer{i}@example.com"} for i in range(count)
+    ])
+    await db.commit()
+    result = await db.execute(select(User.user_id).where(User.username.like("buyer%")).order_by(User.user_id))
+    return result.scalars().all()
+
+
+async def test_sale_moves_ownership_in_one_transaction(client, db, make_user, make_cattle):
+    seller = await make_user()
+    cow = await make_cattle(seller["user_id"])
+    [buyer_id] = await _buyers(db, 1)
+
+    response = await client.post("/trade/sales/", json={"cattle_id": cow["cattle_id"], "buyer_id": buyer_id, "price": 950})
+    assert response.status_code == 200, response.text
+    sale = response.json()
+    assert sale["trade"]["seller_id"] == seller["user_id"]
+    assert sale["trade"]["buyer_id"] == buyer_id
+    assert sale["ownership"]["previous_owner_id"] == seller["user_id"]
+    assert sale["ownership"]["new_owner_id"] == buyer_id
+
+    listing = (await client.get(f"/cattle/cattles/{cow['cattle_id']}")).json()
+    assert listing["status"] == "Sold"
+    assert (await client.get(f"/trade/trades/{sale['trade']['trade_id']}")).status_code == 200
+
+
+async def test_sale_rejections(client, db, make_user, make_cattle):
+    seller = await make_user()
+    cow = await make_cattle(seller["user_id"])
+    sold = await make_cattle(seller["user_id"], status="Sold")
+
+    async def sell(cattle_id, buyer_id):
+        return await client.post("/trade/sales/", json={"cattle_id": cattle_id, "buyer_id": buyer_id, "price": 100})
+
+    assert (await sell(999, seller["user_id"])).status_code == 404
+    assert (await sell(cow["cattle_id"], seller["user_id"])).status_code == 400
+    assert (await sell(cow["cattle_id"], 999)).status_code == 404
+    assert (await sell(sold["cattle_id"], seller["user_id"])).status_code == 409
+    assert (await db.execute(select(func.count()).select_from(Trade))).scalar_one() == 0
+
+
+async def _timed_sale(client, cattle_id: int, buyer_id: int, price: float):
+    started = time.perf_counter()
+    response = await client.post("/trade/sales/", json={"cattle_id": cattle_id, "buyer_id": buyer_id, "price": price})
+    return response, time.perf_counter() - started
+
+
+def _p95(latencies: list) -> float:
+    return sorted(latencies)[int(0.95 * (len(latencies) - 1))]
+
+
+async def test_one_of_many_concurrent_buyers_wins(client, db, make_user, make_cattle):
+    seller = await make_user()
+    cow = await make_cattle(seller["user_id"])
+    sold = await make_cattle(seller["user_id"], status="Sold")
+    buyer_ids = await _buyers(db, CONCURRENT_BUYERS)
+
+    # Baseline: the same rejected sale, one request at a time with no contention
+    serial_started = time.perf_counter()
+    for buyer_id in buyer_ids[:SERIAL_BASELINE]:
+        response, _ = await _timed_sale(client, sold["cattle_id"], buyer_id, 1000)
+        assert response.status_code == 409
+    serial_rate = SERIAL_BASELINE / (time.perf_counter() - serial_started)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        _timed_sale(client, cow["cattle_id"], buyer_id, 1000 + i) for i, buyer_id in enumerate(buyer_ids)
+    ))
+    elapsed = time.perf_counter() - started
+    responses = [response for response, _ in results]
+
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [200] + [409] * (CONCURRENT_BUYERS - 1)
+    [winner] = [response.json() for response in responses if response.status_code == 200]
+
+    trades = (await db.execute(select(Trade))).scalars().all()
+    assert [(trade.cattle_id, trade.buyer_id) for trade in trades] == [(cow["cattle_id"], winner["trade"]["buyer_id"])]
+    history = (await db.execute(select(CattleOwnershipHistory))).scalars().all()
+    assert [(row.previous_owner_id, row.new_owner_id) for row in history] == [(seller["user_id"], winner["trade"]["buyer_id"])]
+    owner, status = (await db.execute(
+        select(Cattle.user_id, Cattle.status).where(Cattle.cattle_id == cow["cattle_id"])
+    )).one()
+    assert (owner, status) == (winner["trade"]["buyer_id"], CattleStatusEnum.Sold)
+
+    contended_rate = CONCURRENT_BUYERS / elapsed
+    contended_p95 = _p95([latency for response, latency in results if response.status_code == 409])
+
+    # Once the animal is sold a rejection takes no write lock, so a burst of late
+    # buyers is served at least at half the uncontended serial rate
+    started = time.perf_counter()
+    late = await asyncio.gather(*(
+        _timed_sale(client, cow["cattle_id"], buyer_id, 1000) for buyer_id in buyer_ids if buyer_id != winner["trade"]["buyer_id"]
+    ))
+    late_rate = len(late) / (time.perf_counter() - started)
+    assert {response.status_code for response, _ in late} == {409}
+    # Recorded, not asserted: SQLite has no row locks, so the contended burst's
+    # conditional UPDATEs queue on the database write lock
+    print(
+        f"sales: serial {serial_rate:.0f} req/s; contended {contended_rate:.0f} req/s, p95 {contended_p95 * 1000:.0f} ms; "
+        f"after the sale {late_rate:.0f} req/s, p95 {_p95([latency for _, latency in late]) * 1000:.0f} ms"
+    )
+    assert late_rate >= serial_rate / 2, (late_rate, serial_rate)
@@ -0,0 +1,121 @@
+import json
+import os
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.utills import inbound
+from app.utills.inbound import InboundWriter, inbound_writer
+
+
+async def _flush():
+    """Drain the shared writer's buffer into the database."""
+    await inbound_writer.stop()
+    await inbound_writer.start()
+
+
+async def _thread(client, sender_id: int, receiver_id: int) -> list:
+    response = await client.get(f"/messaging/threads/{sender_id}/{receiver_id}")
+    assert response.status_code == 200, response.text
+    return [item["message_content"] for item in response.json()["items"]]
+
+
+async def test_repeated_ids_are_stored_once(client, make_user):
+    sender = await make_user()
+    receiver = await make_user()
+    message = {"id": "wamid.dup-1", "sender": sender["user_id"], "receiver": receiver["user_id"], "message": "hello"}
+
+    # Twice in one delivery, then again in a retried delivery
+    response = await client.post("/messaging/webhook", json={"messages": [message, message]})
+    assert response.status_code == 202
+    assert response.json()["accepted"] == 1
+    response = await client.post("/messaging/webhook", json=message)
+    assert response.status_code == 202
+    assert response.json()["accepted"] == 0
+    await _flush()
+
+    # A retry arriving after the in-process ids are forgotten is caught by the receipts table
+    inbound_writer._recent.clear()
+    response = await client.post("/messaging/webhook", json=[message])
+    assert response.json()["accepted"] == 1
+    await _flush()
+
+    assert await _thread(client, sender["user_id"], receiver["user_id"]) == ["hello"]
+
+
+async def test_messages_without_an_id_are_stored_every_time(client, make_user):
+    sender = await make_user()
+    receiver = await make_user()
+    message = {"sender": sender["user_id"], "receiver": receiver["user_id"], "message": "no id"}
+
+    await client.post("/messaging/webhook", json=message)
+    await client.post("/messaging/webhook", json=message)
+    await _flush()
+
+    assert await _thread(client, sender["user_id"], receiver["user_id"]) == ["no id", "no id"]
+
+
+class _FailingSession:
+    async def __aenter__(self):
+        raise RuntimeError("database unavailable")
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+async def test_failed_batch_is_dead_lettered_and_replayable(client, make_user, tmp_path, monkeypatch):
+    monkeypatch.setattr(inbound, "FLUSH_ATTEMPTS", 1)
+    sender = await make_user()
+    receiver = await make_user()
+    path = tmp_path / "dead" / "inbound.ndjson"
+    writer = InboundWriter(session_factory=_FailingSession, dead_letter_path=str(path))
+    messages = [
+        {"provider_message_id": f"wamid.dead-{i}", "sender_id": sender["user_id"], "receiver_id": receiver["user_id"], "message_content": f"m{i}"}
+        for i in range(3)
+    ]
+
+    await writer.start()
+    assert writer.submit(messages) == 3
+    await writer.stop()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert lines == messages
+    # The ids are forgotten, so the same writer would accept the replay
+    assert writer._recent == {}
+
+    response = await client.post("/messaging/webhook", json={"messages": lines})
+    assert response.json()["accepted"] == 3
+    await _flush()
+    assert sorted(await _thread(client, sender["user_id"], receiver["user_id"])) == ["m0", "m1", "m2"]
+
+
+async def test_unknown_users_do_not_poison_the_batch(client, make_user, tmp_path):
+    sender = await make_user()
+    receiver = await make_user()
+    # The shared test engine leaves SQLite's foreign keys off; this one enforces them
+    fk_engine = create_async_engine(os.environ["DATABASE_URL"])
+
+    @event.listens_for(fk_engine.sync_engine, "connect")
+    def _enforce_foreign_keys(connection, _):
+        connection.execute("PRAGMA foreign_keys=ON")
+
+    path = tmp_path / "inbound.ndjson"
+    writer = InboundWriter(session_factory=async_sessionmaker(fk_engine, expire_on_commit=False), dead_letter_path=str(path))
+    messages = [
+        {"provider_message_id": f"wamid.fk-{i}", "sender_id": sender["user_id"], "receiver_id": receiver["user_id"], "message_content": f"m{i}"}
+        for i in range(5)
+    ] + [{"provider_message_id": "wamid.fk-stranger", "sender_id": 999999, "receiver_id": receiver["user_id"], "message_content": "stranger"}]
+    try:
+        await writer.start()
+        writer.submit(messages)
+        await writer.stop()
+    finally:
+        await fk_engine.dispose()
+
+    assert not path.exists()
+    assert sorted(await _thread(client, sender["user_id"], receiver["user_id"])) == ["m0", "m1", "m2", "m3", "m4"]
+    # Stored with the unknown sender cleared, in the receiver's one-sided conversation
+    response = await client.get(f"/messaging/conversations/{receiver['user_id']}")
+    conversations = {item["counterpart_id"]: item["last_message"] for item in response.json()["items"]}
+    assert conversations[None]["message_content"] == "stranger"
+    assert conversations[None]["sender_id"] is None